@@ -0,0 +1,80 @@
+"""Benchmark one htmx-style edit against large settings documents.
+
+Compares the previous pipeline (reload, two deep copies, clear/merge/store,
+re-read for rendering) with the current path-copying _mutate_and_persist.
+
+    uv run python benchmarks/mutation.py [--sizes 1000 10000 100000] [--runs 20]
+"""
+
+import argparse
+import copy
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import ovos_skill_config.main as core
+from ovos_skill_config import web
+
+
+def make_document(size: int) -> dict:
+    """A settings document with `size` list entries spread over a few keys."""
+    return {
+        "lang": "en-us",
+        "stations": [
+            {"name": f"Station {i}", "url": f"http://radio.example/{i}", "tags": ["a"]}
+            for i in range(size)
+        ],
+        "vocab": {f"word{i}": i for i in range(size // 10)},
+        "options": {"volume": 5, "muted": False},
+    }
+
+
+def legacy_edit(skill_id: str, path: list, value) -> dict:
+    skill = core.SkillSettings(skill_id)
+    current = skill.settings
+    working = copy.deepcopy(current)
+    web._walk(working, path[:-1])[path[-1]] = value
+    web.UNDO_SNAPSHOTS[skill_id] = copy.deepcopy(current)
+    skill.db.clear()
+    skill.db.merge(working, skip_empty=False)
+    skill.db.store()
+    return core.SkillSettings(skill_id).settings
+
+
+def current_edit(skill_id: str, path: list, value) -> dict:
+    return web._mutate_and_persist(
+        skill_id, lambda doc: web._set_at_path(doc, path, value)
+    )
+
+
+def measure(edit, skill_id: str, runs: int) -> float:
+    timings = []
+    for i in range(runs):
+        started = time.perf_counter()
+        edit(skill_id, ["options", "volume"], i)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with patch.object(core, "get_config_dir", return_value=Path(tmp)):
+            print(f"{'entries':>8} {'KiB':>8} {'legacy ms':>10} {'current ms':>11}")
+            for size in args.sizes:
+                skill = core.SkillSettings("bench-skill")
+                skill.replace_settings(make_document(size))
+                kib = skill.settings_path.stat().st_size / 1024
+                legacy = measure(legacy_edit, "bench-skill", args.runs)
+                current = measure(current_edit, "bench-skill", args.runs)
+                print(f"{size:>8} {kib:>8.0f} {legacy:>10.2f} {current:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
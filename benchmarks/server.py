@@ -0,0 +1,140 @@
+"""Requests/sec of the server under each launcher configuration.
+
+Starts ovos-skill-config-tool once per configuration (event loop, HTTP parser,
+TCP or Unix socket) against a throwaway config dir and drives it with a
+fixed number of keep-alive connections for a fixed time. Needs the [fast]
+extra (uvloop, httptools).
+
+    uv run python benchmarks/server.py [--duration 5] [--connections 16]
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+CONFIGS = [
+    ("asyncio + h11", ["--loop", "asyncio", "--http", "h11"], False),
+    ("asyncio + httptools", ["--loop", "asyncio", "--http", "httptools"], False),
+    ("uvloop + h11", ["--loop", "uvloop", "--http", "h11"], False),
+    ("uvloop + httptools", ["--loop", "uvloop", "--http", "httptools"], False),
+    ("uvloop + httptools, UDS", ["--loop", "uvloop", "--http", "httptools"], True),
+]
+
+SKILL_ID = "ovos-skill-weather.openvoiceos"
+AUTH = ("ovos", "ovos")
+
+
+def seed(config_home: Path) -> None:
+    skill_dir = config_home / "mycroft" / "skills" / SKILL_ID
+    skill_dir.mkdir(parents=True)
+    (skill_dir / "settings.json").write_text(
+        json.dumps({"lang": "en-us", "units": "metric", "api_key": "x" * 32})
+    )
+
+
+def _request(path: str) -> bytes:
+    token = base64.b64encode(":".join(AUTH).encode()).decode()
+    return (
+        f"GET {path} HTTP/1.1\r\nHost: bench\r\nAuthorization: Basic {token}\r\n\r\n"
+    ).encode()
+
+
+async def _read_response(reader: asyncio.StreamReader) -> None:
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = head.split(b" ", 2)[1]
+    if status != b"200":
+        raise RuntimeError(f"HTTP {status.decode()}")
+    for line in head.split(b"\r\n"):
+        if line.lower().startswith(b"content-length:"):
+            await reader.readexactly(int(line.split(b":")[1]))
+
+
+async def drive(connect, path: str, duration: float, connections: int) -> float:
+    """Requests/sec over keep-alive connections, one request in flight each.
+
+    A bare asyncio HTTP/1.1 client keeps the load generator's own CPU cost
+    small, so on a single machine the server stays the bottleneck.
+    """
+    request = _request(path)
+    done = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal done
+        reader, writer = await connect()
+        try:
+            while time.perf_counter() < deadline:
+                writer.write(request)
+                await _read_response(reader)
+                done += 1
+        finally:
+            writer.close()
+
+    await asyncio.gather(*(worker() for _ in range(connections)))
+    return done / duration
+
+
+async def bench(connect, duration: float, connections: int) -> dict:
+    for _ in range(100):
+        try:
+            _, writer = await connect()
+            writer.close()
+            break
+        except OSError:
+            await asyncio.sleep(0.1)
+    await drive(connect, "/status", 1, connections)  # warm up
+    return {
+        path: await drive(connect, path, duration, connections)
+        for path in ("/status", f"/api/v1/skills/{SKILL_ID}")
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    print(f"{'configuration':<26} {'/status':>10} {'GET skill':>10}  (req/s)")
+    with tempfile.TemporaryDirectory() as tmp:
+        seed(Path(tmp))
+        env = dict(os.environ, XDG_CONFIG_HOME=tmp)
+        for name, options, uds in CONFIGS:
+            socket_path = os.path.join(tmp, "server.sock")
+            bind = ["--uds", socket_path] if uds else ["--port", str(args.port)]
+            server = subprocess.Popen(
+                [sys.executable, "-m", "ovos_skill_config.cli", "--no-access-log"]
+                + ["--log-level", "warning"]
+                + bind
+                + options,
+                env=env,
+            )
+            if uds:
+
+                def connect():
+                    return asyncio.open_unix_connection(socket_path)
+
+            else:
+
+                def connect():
+                    return asyncio.open_connection("127.0.0.1", args.port)
+
+            try:
+                rates = asyncio.run(bench(connect, args.duration, args.connections))
+            finally:
+                server.terminate()
+                server.wait()
+            status, skill = rates.values()
+            print(f"{name:<26} {status:>10.0f} {skill:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
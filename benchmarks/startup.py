@@ -0,0 +1,62 @@
+"""Startup time and peak RSS of the app, full UI vs API-only mode.
+
+Each run is a fresh interpreter that imports ovos_skill_config.main (what a
+server worker does before accepting connections). "full + first page" also
+renders the index page once, which is when the Jinja environment is built.
+
+    uv run python benchmarks/startup.py [--runs 10]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+IMPORT_APP = "import ovos_skill_config.main"
+RENDER_INDEX = (
+    "from fastapi.testclient import TestClient;"
+    "from ovos_skill_config.main import app, DEFAULT_USERNAME, DEFAULT_PASSWORD;"
+    "r = TestClient(app).get('/', auth=(DEFAULT_USERNAME, DEFAULT_PASSWORD));"
+    "assert r.status_code == 200, r.status_code"
+)
+
+MODES = [
+    ("full UI (import)", IMPORT_APP, {}),
+    ("full UI + first page", RENDER_INDEX, {}),
+    ("API-only (import)", IMPORT_APP, {"OVOS_CONFIG_API_ONLY": "1"}),
+]
+
+
+def run_once(code: str, env: dict):
+    """Wall seconds and peak RSS (MiB) of one interpreter running `code`."""
+    start = os.times().elapsed
+    proc = subprocess.Popen([sys.executable, "-W", "ignore", "-c", code], env=env)
+    _, status, usage = os.wait4(proc.pid, 0)
+    elapsed = os.times().elapsed - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    if proc.returncode:
+        raise RuntimeError(f"{code!r} exited with {proc.returncode}")
+    return elapsed, usage.ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'mode':<24} {'startup ms':>11} {'peak RSS MiB':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        base = dict(os.environ, XDG_CONFIG_HOME=tmp)
+        for name, code, extra in MODES:
+            env = dict(base, **extra)
+            run_once(code, env)  # warm the page cache / .pyc files
+            results = [run_once(code, env) for _ in range(args.runs)]
+            wall = statistics.median(r[0] for r in results) * 1000
+            rss = statistics.median(r[1] for r in results)
+            print(f"{name:<24} {wall:>11.0f} {rss:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""Settings-changed notifications to the OVOS messagebus.
+
+When OVOS_CONFIG_BUS_URL (read at write time) names the messagebus, e.g.
+``ws://127.0.0.1:8181/core``, every settings.json this tool writes is
+announced with a ``mycroft.skills.settings.changed`` message carrying
+``{skill_id: settings}``, the message OVOS skills already handle by applying
+the new settings (the type can be changed with OVOS_CONFIG_BUS_MESSAGE).
+Running skills thus pick up edits without waiting for a file watcher.
+
+Notifications never block a write: they are queued, and a background thread
+sends them over one persistent websocket connection. Changes to the same
+settings file within OVOS_CONFIG_BUS_COALESCE_MS (default 250) are sent as one
+message. While the bus is unreachable the thread reconnects with
+exponential backoff and keeps only the latest change per file.
+
+Requires websocket-client (``pip install ovos-skill-config-tool[bus]``); it is
+imported lazily, and without it notifications are off with a warning.
+"""
+
+import json
+import logging
+import os
+import random
+import socket
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_MESSAGE_TYPE = "mycroft.skills.settings.changed"
+DEFAULT_COALESCE_MS = 250.0
+MESSAGE_SOURCE = "ovos-skill-config-tool"
+
+
+def _require_websocket():
+    try:
+        import websocket
+    except ImportError as exc:
+        raise RuntimeError(
+            "Messagebus notifications require websocket-client: "
+            "pip install ovos-skill-config-tool[bus]"
+        ) from exc
+    return websocket
+
+
+class BusNotifier:
+    """Coalesces settings changes and sends them from a background thread."""
+
+    # Delay before reconnecting after a failure, doubling up to the maximum
+    RECONNECT_MIN = 0.5
+    RECONNECT_MAX = 30.0
+    CONNECT_TIMEOUT = 5.0
+    # Files with an unsent change; beyond this, the oldest change is dropped
+    MAX_PENDING = 4096
+
+    def __init__(
+        self,
+        url: str,
+        message_type: str = DEFAULT_MESSAGE_TYPE,
+        coalesce: float = DEFAULT_COALESCE_MS / 1000,
+    ):
+        self.url = url
+        self.message_type = message_type
+        self.coalesce = coalesce
+        self.sent = 0
+        self.dropped = 0
+        self.connections = 0
+        self._websocket = _require_websocket()
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._ws = None
+        self._thread: Optional[threading.Thread] = None
+
+    def notify(self, key: str, data: Dict[str, Any]) -> None:
+        """Queue a message; a newer one with the same key replaces it."""
+        with self._lock:
+            self._pending.pop(key, None)
+            self._pending[key] = data
+            while len(self._pending) > self.MAX_PENDING:
+                del self._pending[next(iter(self._pending))]
+                self.dropped += 1
+            if self._thread is None and not self._stopping.is_set():
+                self._thread = threading.Thread(
+                    target=self._run, name="ovos-bus-notifier", daemon=True
+                )
+                self._thread.start()
+        self._wake.set()
+
+    def _run(self) -> None:
+        delay = self.RECONNECT_MIN
+        while True:
+            self._wake.wait()
+            if not self._stopping.is_set():
+                # Let the rest of a burst of edits arrive first
+                self._stopping.wait(self.coalesce)
+            with self._lock:
+                self._wake.clear()
+                batch, self._pending = self._pending, {}
+            try:
+                if batch:
+                    self._send(batch)
+            except (OSError, ValueError, self._websocket.WebSocketException) as exc:
+                self._requeue(batch)
+                self._disconnect()
+                if self._stopping.is_set():
+                    LOG.warning(
+                        "Messagebus unavailable, %d settings change(s) not sent: %s",
+                        len(self._pending),
+                        exc,
+                    )
+                    return
+                if delay == self.RECONNECT_MIN:
+                    LOG.warning("Messagebus at %s unavailable: %s", self.url, exc)
+                # Jitter, so devices restarting together do not retry together
+                self._stopping.wait(delay * random.uniform(1.0, 1.25))
+                delay = min(delay * 2, self.RECONNECT_MAX)
+                self._wake.set()
+                continue
+            if batch and delay != self.RECONNECT_MIN:
+                LOG.info("Messagebus at %s reachable again", self.url)
+                delay = self.RECONNECT_MIN
+            if self._stopping.is_set():
+                return
+
+    def _send(self, batch: Dict[str, Dict[str, Any]]) -> None:
+        ws = self._connection()
+        while batch:
+            key = next(iter(batch))
+            message = {
+                "type": self.message_type,
+                "data": batch[key],
+                "context": {"source": MESSAGE_SOURCE},
+            }
+            ws.send(json.dumps(message))
+            del batch[key]
+            self.sent += 1
+
+    def _requeue(self, unsent: Dict[str, Dict[str, Any]]) -> None:
+        """Put back unsent changes, unless a newer one arrived meanwhile."""
+        with self._lock:
+            newer, self._pending = self._pending, dict(unsent)
+            self._pending.update(newer)
+
+    def _connection(self):
+        ws = self._ws
+        if ws is not None and ws.connected:
+            return ws
+        ws = self._websocket.create_connection(self.url, timeout=self.CONNECT_TIMEOUT)
+        # The reader waits for as long as the bus is quiet
+        ws.settimeout(None)
+        self._ws = ws
+        self.connections += 1
+        threading.Thread(
+            target=self._drain, args=(ws,), name="ovos-bus-reader", daemon=True
+        ).start()
+        return ws
+
+    def _drain(self, ws) -> None:
+        """Read and discard what the bus broadcasts; pings are answered."""
+        close = self._websocket.ABNF.OPCODE_CLOSE
+        try:
+            while ws.recv_data(control_frame=False)[0] != close:
+                pass
+        except (OSError, ValueError, self._websocket.WebSocketException):
+            pass
+        # Dropped by the bus: reconnect when the next change is sent
+        self._close_socket(ws)
+
+    def _close_socket(self, ws) -> None:
+        sock = ws.sock
+        if sock is None:
+            return
+        try:
+            ws.send_close()
+        except (OSError, self._websocket.WebSocketException):
+            pass
+        try:
+            # Wakes the reader thread, which close() alone would not
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        ws.shutdown()
+
+    def _disconnect(self) -> None:
+        ws, self._ws = self._ws, None
+        if ws is not None:
+            self._close_socket(ws)
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None and self._ws.connected
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "url": self.url,
+            "connected": self.connected,
+            "connections": self.connections,
+            "pending": pending,
+            "sent": self.sent,
+            "dropped": self.dropped,
+        }
+
+    def close(self, timeout: float = 2.0) -> None:
+        """Send what is pending (one attempt, no retries), then disconnect."""
+        self._stopping.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._disconnect()
+
+
+_notifiers: Dict[Tuple[str, str, float], BusNotifier] = {}
+_notifiers_lock = threading.Lock()
+_warned_unavailable = False
+
+
+def coalesce_seconds() -> float:
+    try:
+        value = float(os.getenv("OVOS_CONFIG_BUS_COALESCE_MS", DEFAULT_COALESCE_MS))
+    except ValueError:
+        value = DEFAULT_COALESCE_MS
+    return max(value, 0.0) / 1000
+
+
+def get_notifier() -> Optional[BusNotifier]:
+    """The notifier for the configured bus, or None when notifications are off."""
+    url = os.getenv("OVOS_CONFIG_BUS_URL", "").strip()
+    if not url:
+        return None
+    key = (
+        url,
+        os.getenv("OVOS_CONFIG_BUS_MESSAGE", DEFAULT_MESSAGE_TYPE),
+        coalesce_seconds(),
+    )
+    global _warned_unavailable
+    with _notifiers_lock:
+        notifier = _notifiers.get(key)
+        if notifier is None:
+            try:
+                notifier = _notifiers[key] = BusNotifier(*key)
+            except RuntimeError as exc:
+                if not _warned_unavailable:
+                    LOG.warning("OVOS_CONFIG_BUS_URL is set, but %s", exc)
+                    _warned_unavailable = True
+                return None
+        return notifier
+
+
+def notify_settings_changed(settings_path: Path, settings: Dict) -> None:
+    """Announce that ``<skills dir>/<skill id>/settings.json`` was written."""
+    notifier = get_notifier()
+    if notifier is not None:
+        # Keyed by path: skills of the same id in two roots are separate
+        notifier.notify(str(settings_path), {settings_path.parent.name: settings})
+
+
+def stats() -> Dict[str, Any]:
+    with _notifiers_lock:
+        notifiers = list(_notifiers.values())
+    return {"notifiers": [notifier.stats() for notifier in notifiers]}
+
+
+def close() -> None:
+    """Flush and close every notifier, e.g. at shutdown."""
+    with _notifiers_lock:
+        notifiers = list(_notifiers.values())
+        _notifiers.clear()
+    for notifier in notifiers:
+        notifier.close()
@@ -0,0 +1,137 @@
+"""Numbered settings changes, for incremental sync of external mirrors.
+
+Every change to a skill's settings.json gets the next number of a sequence
+held by the server: writes through this tool are recorded as they happen,
+and edits made by anything else are found by a scan that compares each
+file's (mtime, size) with what was last seen. Only the latest number per
+skill is kept, so memory grows with the number of skills, not with the
+number of changes.
+
+The sequence restarts with the process. Each process has a random epoch;
+a client holding a number from another epoch must start over with a full
+sync.
+"""
+
+import os
+import secrets
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ovos_skill_config import iostats
+from ovos_skill_config.governor import check_deadline
+
+Fingerprint = Tuple[int, int]
+
+
+class ChangeLog:
+    """The sequence number of the latest change to each skill, per root."""
+
+    # Deleted skills remembered (so clients hear of the deletion); beyond
+    # this, the oldest entries are forgotten and older clients start over
+    MAX_ENTRIES = 10000
+
+    def __init__(self):
+        self.epoch = secrets.token_hex(8)
+        self._lock = threading.Lock()
+        self._seq = 0
+        # Clients behind this number missed forgotten entries
+        self._floor = 0
+        # (root, skill_id) -> seq of its latest change, oldest change first
+        self._latest: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+        # root -> {skill_id: fingerprint}, once the root was first scanned
+        self._seen: Dict[str, Dict[str, Fingerprint]] = {}
+
+    @property
+    def seq(self) -> int:
+        with self._lock:
+            return self._seq
+
+    def _bump(self, root: str, skill_id: str) -> int:
+        self._seq += 1
+        key = (root, skill_id)
+        self._latest.pop(key, None)
+        self._latest[key] = self._seq
+        while len(self._latest) > self.MAX_ENTRIES:
+            _, forgotten = self._latest.popitem(last=False)
+            self._floor = forgotten
+        return self._seq
+
+    def record_write(self, settings_path: Path) -> None:
+        """Record that this process wrote ``<root>/<skill id>/settings.json``."""
+        try:
+            fingerprint = _fingerprint(os.stat(settings_path))
+        except OSError:
+            return
+        root, skill_id = str(settings_path.parent.parent), settings_path.parent.name
+        with self._lock:
+            seen = self._seen.get(root)
+            if seen is not None:
+                seen[skill_id] = fingerprint
+            self._bump(root, skill_id)
+
+    def scan(self, root: str) -> None:
+        """Number the skills changed, added or removed on disk since last scan.
+
+        The first scan of a root only takes note of what is there.
+        """
+        current = dict(_scan_fingerprints(root))
+        with self._lock:
+            seen = self._seen.get(root)
+            self._seen[root] = current
+            if seen is None:
+                return
+            for skill_id, fingerprint in current.items():
+                if seen.get(skill_id) != fingerprint:
+                    self._bump(root, skill_id)
+            for skill_id in seen.keys() - current.keys():
+                self._bump(root, skill_id)
+
+    def since(self, root: str, seq: int) -> Optional[Dict[str, int]]:
+        """Skills of ``root`` changed after ``seq``, with the number of the
+        latest change; None when changes after ``seq`` were forgotten."""
+        with self._lock:
+            if seq < self._floor or seq > self._seq:
+                return None
+            changed = {}
+            for (change_root, skill_id), change_seq in reversed(self._latest.items()):
+                if change_seq <= seq:
+                    break
+                if change_root == root:
+                    changed[skill_id] = change_seq
+            return changed
+
+    def numbers(self, root: str) -> Dict[str, int]:
+        """The latest change number of every skill of ``root`` that has one."""
+        with self._lock:
+            return {
+                skill_id: change_seq
+                for (change_root, skill_id), change_seq in self._latest.items()
+                if change_root == root
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._latest)
+
+
+def _fingerprint(stat: os.stat_result) -> Fingerprint:
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _scan_fingerprints(root: str) -> Iterator[Tuple[str, Fingerprint]]:
+    """(skill id, fingerprint) of each settings.json under ``root``."""
+    try:
+        entries: List[os.DirEntry] = list(os.scandir(root))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        check_deadline()
+        if not entry.is_dir():
+            continue
+        try:
+            stat = iostats.stat(os.path.join(entry.path, "settings.json"))
+        except OSError:
+            continue
+        yield entry.name, _fingerprint(stat)
@@ -0,0 +1,502 @@
+"""Command line entry point: ``ovos-skill-config-tool``.
+
+Without a command it starts the server with uvicorn. Every server option has
+an environment default so existing deployments (``CONFIG_PORT``) keep working
+unchanged. The app is passed to uvicorn as an import string, which
+multi-worker mode requires.
+
+The get/set/patch/export/import/diff commands work on the settings files
+directly, without a server, for image builds and provisioning scripts. They
+read and write NDJSON, one ``{"id": ..., "settings": ...}`` record per line,
+and process skills on a small thread pool, one record at a time.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from ovos_skill_config.records import RecordParser
+
+APP = "ovos_skill_config.main:app"
+
+LOOPS = ("auto", "asyncio", "uvloop")
+HTTP_PARSERS = ("auto", "h11", "httptools")
+
+# Optional accelerators: uvicorn choices that need an extra module installed
+_ACCELERATORS = ("uvloop", "httptools")
+
+DEFAULT_JOBS = 8
+READ_CHUNK_CHARS = 64 * 1024
+
+
+def build_parser(parser: Optional[argparse.ArgumentParser] = None):
+    parser = parser or argparse.ArgumentParser(
+        prog="ovos-skill-config-tool",
+        description="Web UI and API for OVOS/Neon skill settings.",
+    )
+    parser.add_argument(
+        "--host",
+        default=os.getenv("CONFIG_HOST", "0.0.0.0"),
+        help="Interface to bind (default: 0.0.0.0, env CONFIG_HOST)",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        # Read from CONFIG_PORT only when serving, so a bad value there does
+        # not break the offline commands
+        default=None,
+        help="TCP port (default: 8000, env CONFIG_PORT)",
+    )
+    parser.add_argument(
+        "--uds",
+        default=os.getenv("CONFIG_UDS"),
+        help="Bind a Unix domain socket instead of host/port (env CONFIG_UDS)",
+    )
+    parser.add_argument(
+        "--loop",
+        choices=LOOPS,
+        default="auto",
+        help="Event loop; uvloop needs the [fast] extra (default: auto)",
+    )
+    parser.add_argument(
+        "--http",
+        choices=HTTP_PARSERS,
+        default="auto",
+        help="HTTP parser; httptools needs the [fast] extra (default: auto)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes (default: 1). In-memory state such as "
+        "write-behind buffers and undo history is per worker.",
+    )
+    parser.add_argument(
+        "--backlog",
+        type=int,
+        default=2048,
+        help="Maximum number of pending connections (default: 2048)",
+    )
+    parser.add_argument(
+        "--limit-concurrency",
+        type=int,
+        default=None,
+        help="Answer 503 beyond this many concurrent connections/tasks",
+    )
+    parser.add_argument(
+        "--timeout-keep-alive",
+        type=int,
+        default=5,
+        help="Seconds to keep idle keep-alive connections open (default: 5)",
+    )
+    parser.add_argument(
+        "--access-log",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Log every request (default: on)",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="info",
+        choices=("critical", "error", "warning", "info", "debug", "trace"),
+    )
+    _add_commands(parser)
+    return parser
+
+
+def _add_commands(parser: argparse.ArgumentParser) -> None:
+    offline = argparse.ArgumentParser(add_help=False)
+    offline.add_argument(
+        "--config-dir",
+        type=Path,
+        help="Skills directory (default: the one the server would use)",
+    )
+    offline.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f"Skills processed in parallel (default: {DEFAULT_JOBS})",
+    )
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    get = commands.add_parser(
+        "get", parents=[offline], help="Print settings of skills as NDJSON"
+    )
+    get.add_argument("skills", nargs="*", help="Skill ids (default: all)")
+    get.add_argument(
+        "--pointer",
+        default="",
+        help='JSON pointer inside the settings, e.g. "/units"; prints "value"',
+    )
+
+    set_ = commands.add_parser(
+        "set", parents=[offline], help="Set top-level settings of one skill"
+    )
+    set_.add_argument("skill_id")
+    set_.add_argument(
+        "assignments",
+        nargs="+",
+        metavar="KEY=VALUE",
+        help="VALUE is parsed as JSON, or taken as a string if it is not JSON",
+    )
+
+    patch = commands.add_parser(
+        "patch", parents=[offline], help="Apply one JSON Patch to many skills"
+    )
+    patch.add_argument("patch", help="JSON Patch (RFC 6902) file; - for stdin")
+    patch.add_argument("skills", nargs="+", help="Skill ids")
+
+    export = commands.add_parser(
+        "export", parents=[offline], help="Write settings of skills as NDJSON"
+    )
+    export.add_argument("skills", nargs="*", help="Skill ids (default: all)")
+    export.add_argument("-o", "--output", default="-", help="File (default: stdout)")
+    export.add_argument(
+        "--format",
+        choices=("ndjson", "json"),
+        default="ndjson",
+        help="json writes one array, like the web UI's export",
+    )
+
+    import_ = commands.add_parser(
+        "import", parents=[offline], help="Write settings from an export"
+    )
+    import_.add_argument(
+        "source", nargs="?", default="-", help="NDJSON or JSON export; - for stdin"
+    )
+    import_.add_argument(
+        "--mode",
+        choices=("replace", "merge"),
+        default="replace",
+        help="Replace each skill's settings, or merge into them (default: replace)",
+    )
+
+    diff = commands.add_parser(
+        "diff",
+        parents=[offline],
+        help="Print JSON Patches from current settings to an export",
+    )
+    diff.add_argument(
+        "source", nargs="?", default="-", help="NDJSON or JSON export; - for stdin"
+    )
+
+    from ovos_skill_config import fleet, loadtest
+
+    fleet.build_parser(
+        commands.add_parser(
+            "push", help="Push settings to many running instances (fleet)"
+        )
+    )
+    loadtest.build_parser(
+        commands.add_parser(
+            "loadtest", help="Measure throughput and latency of an instance"
+        )
+    )
+
+
+def bounded_map(
+    func: Callable[[Any], Dict], items: Iterable[Any], jobs: int
+) -> Iterator[Dict]:
+    """func(item) for each item on a thread pool, yielded in input order.
+
+    At most 2 * jobs items are in flight, so input is consumed as results are
+    written instead of being read up front.
+    """
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        pending: deque = deque()
+        for item in items:
+            pending.append(pool.submit(func, item))
+            if len(pending) >= 2 * jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def read_records(stream: IO[str]) -> Iterator[Dict]:
+    """Export records from NDJSON or a JSON array, parsed as they are read.
+
+    Malformed records are yielded as {"error": ...} so that one bad line is
+    reported without stopping the rest.
+    """
+    parser = RecordParser()
+    # A line at a time, so NDJSON records are handled as they arrive, but
+    # never more than READ_CHUNK_CHARS, so a one-line array is not read whole
+    for text in iter(lambda: stream.readline(READ_CHUNK_CHARS), ""):
+        yield from parser.feed(text)
+    yield from parser.close()
+
+
+def _write_record(output: IO[str], record: Dict) -> None:
+    output.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def _parse_assignment(assignment: str) -> tuple:
+    key, sep, raw = assignment.partition("=")
+    if not sep or not key:
+        raise ValueError(f"Expected KEY=VALUE, got {assignment!r}")
+    try:
+        return key, json.loads(raw)
+    except ValueError:
+        return key, raw
+
+
+def _open_input(source: str) -> IO[str]:
+    return sys.stdin if source == "-" else open(source, encoding="utf-8")
+
+
+class OfflineCommands:
+    """The offline commands, bound to one skills directory."""
+
+    def __init__(self, args: argparse.Namespace, output: IO[str]):
+        # Imported here so that starting the server does not load the app
+        # before uvicorn does
+        import ovos_skill_config.main as core
+
+        self.core = core
+        self.firstrun_key = core.FIRSTRUN_KEY
+        self.args = args
+        self.output = output
+        self.config_dir = args.config_dir or core.get_config_dir()
+        self.failed = False
+
+    def _results(
+        self, func: Callable[[Any], Dict], items: Iterable[Any]
+    ) -> Iterator[Dict]:
+        """func over items in parallel; exceptions become {"id", "error"}."""
+
+        def safe(item):
+            try:
+                return func(item)
+            except Exception as exc:
+                skill_id = item.get("id") if isinstance(item, dict) else item
+                return {"id": skill_id, "error": str(exc)}
+
+        for result in bounded_map(safe, items, self.args.jobs):
+            if "error" in result:
+                self.failed = True
+            yield result
+
+    def _emit(self, results: Iterable[Dict]) -> None:
+        for result in results:
+            _write_record(self.output, result)
+
+    def _skill_ids(self) -> List[str]:
+        return self.args.skills or sorted(self.core.list_skill_ids(self.config_dir))
+
+    def _existing(self) -> set:
+        return set(self.core.list_skill_ids(self.config_dir))
+
+    def _load(self, skill_id: str, existing: set) -> Dict:
+        """Current settings of a skill; never creates a settings file."""
+        if skill_id not in existing:
+            raise LookupError(f"No settings for skill {skill_id!r}")
+        return self.core.SkillSettings(skill_id, self.config_dir).settings
+
+    def _exported(self, settings: Dict) -> Dict:
+        return self.core.maybe_sort_settings(
+            {k: v for k, v in settings.items() if k != self.firstrun_key}
+        )
+
+    def get(self) -> None:
+        existing = self._existing()
+
+        def get_one(skill_id):
+            settings = self._load(skill_id, existing)
+            if not self.args.pointer:
+                return {"id": skill_id, "settings": settings}
+            value = self.core.resolve_json_pointer(settings, self.args.pointer)
+            return {"id": skill_id, "value": value}
+
+        self._emit(self._results(get_one, self._skill_ids()))
+
+    def set(self) -> None:
+        updates = dict(_parse_assignment(a) for a in self.args.assignments)
+
+        def set_one(skill_id):
+            skill = self.core.SkillSettings(skill_id, self.config_dir)
+            with skill.locked() as current:
+                skill.replace_settings({**current, **updates})
+            return {"id": skill_id, "ok": True}
+
+        self._emit(self._results(set_one, [self.args.skill_id]))
+
+    def patch(self) -> None:
+        with _open_input(self.args.patch) as stream:
+            operations = json.load(stream)
+        if not isinstance(operations, list):
+            raise ValueError("A JSON Patch must be an array of operations")
+
+        def patch_one(skill_id):
+            skill = self.core.SkillSettings(skill_id, self.config_dir)
+            skill.patch_settings(operations)
+            return {"id": skill_id, "ok": True}
+
+        self._emit(self._results(patch_one, self.args.skills))
+
+    def export(self) -> None:
+        existing = self._existing()
+
+        def export_one(skill_id):
+            settings = self._exported(self._load(skill_id, existing))
+            return {"id": skill_id, "settings": settings}
+
+        results = []
+        for result in self._results(export_one, self._skill_ids()):
+            if "error" in result:
+                # Keep the export itself importable
+                print(f"{result['id']}: {result['error']}", file=sys.stderr)
+            elif self.args.format == "json":
+                results.append(result)
+            else:
+                _write_record(self.output, result)
+        if self.args.format == "json":
+            json.dump(results, self.output, indent=2, ensure_ascii=False)
+            self.output.write("\n")
+
+    def import_(self) -> None:
+        def import_one(record):
+            if "error" in record:
+                return record
+            skill = self.core.SkillSettings(record["id"], self.config_dir)
+            if self.args.mode == "merge":
+                skill.merge_settings(record["settings"])
+            else:
+                with skill.locked() as current:
+                    # Exports leave the firstrun marker out; do not reset it
+                    kept = {k: current[k] for k in (self.firstrun_key,) if k in current}
+                    skill.replace_settings({**kept, **record["settings"]})
+            return {"id": record["id"], "ok": True}
+
+        with _open_input(self.args.source) as stream:
+            self._emit(self._results(import_one, read_records(stream)))
+
+    def diff(self) -> bool:
+        """Print a patch for every skill that differs; True if any did."""
+        existing = self._existing()
+        changed = False
+
+        def diff_one(record):
+            if "error" in record:
+                return record
+            current = (
+                self._exported(self._load(record["id"], existing))
+                if record["id"] in existing
+                else {}
+            )
+            operations = self.core.diff_json_patch(current, record["settings"])
+            return {"id": record["id"], "patch": operations}
+
+        with _open_input(self.args.source) as stream:
+            for result in self._results(diff_one, read_records(stream)):
+                if result.get("patch") == []:
+                    continue
+                changed = changed or "patch" in result
+                _write_record(self.output, result)
+        return changed
+
+
+def run_offline(args: argparse.Namespace, output: Optional[IO[str]] = None) -> int:
+    """Run an offline command; exit status 1 if any skill failed (or differs)."""
+    if getattr(args, "output", "-") != "-":
+        with open(args.output, "w", encoding="utf-8") as stream:
+            return _run_commands(args, stream)
+    return _run_commands(args, output or sys.stdout)
+
+
+def _run_commands(args: argparse.Namespace, output: IO[str]) -> int:
+    commands = OfflineCommands(args, output)
+    try:
+        if args.command == "diff":
+            return int(commands.diff() or commands.failed)
+        getattr(commands, "import_" if args.command == "import" else args.command)()
+    finally:
+        # Nothing may stay buffered when the process exits
+        commands.core.WRITE_BEHIND.flush()
+    return int(commands.failed)
+
+
+def default_port() -> int:
+    """The port from CONFIG_PORT (default 8000); ValueError if not a number."""
+    value = os.getenv("CONFIG_PORT", "8000")
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"CONFIG_PORT must be a port number, not {value!r}") from None
+
+
+def uvicorn_options(args: argparse.Namespace) -> dict:
+    """Translate parsed arguments into uvicorn.run() keyword arguments."""
+    options = {
+        "loop": args.loop,
+        "http": args.http,
+        "workers": args.workers,
+        "backlog": args.backlog,
+        "limit_concurrency": args.limit_concurrency,
+        "timeout_keep_alive": args.timeout_keep_alive,
+        "access_log": args.access_log,
+        "log_level": args.log_level,
+    }
+    if args.uds:
+        options["uds"] = args.uds
+    else:
+        options["host"] = args.host
+        options["port"] = default_port() if args.port is None else args.port
+    return options
+
+
+def _check_accelerators(parser: argparse.ArgumentParser, args) -> None:
+    for flag, choice in (("--loop", args.loop), ("--http", args.http)):
+        if choice in _ACCELERATORS and importlib.util.find_spec(choice) is None:
+            parser.error(
+                f"{flag} {choice} requires {choice}: "
+                "pip install ovos-skill-config-tool[fast]"
+            )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "push":
+        from ovos_skill_config import fleet
+
+        return fleet.run(args)
+    if args.command == "loadtest":
+        from ovos_skill_config import loadtest
+
+        try:
+            return loadtest.run(args)
+        except (RuntimeError, ValueError) as exc:
+            print(f"ovos-skill-config-tool loadtest: {exc}", file=sys.stderr)
+            return 2
+    if args.command:
+        if args.jobs < 1:
+            parser.error("--jobs must be at least 1")
+        try:
+            return run_offline(args)
+        except (OSError, ValueError) as exc:
+            print(f"ovos-skill-config-tool {args.command}: {exc}", file=sys.stderr)
+            return 2
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.port is None and not args.uds:
+        try:
+            args.port = default_port()
+        except ValueError as exc:
+            parser.error(str(exc))
+    _check_accelerators(parser, args)
+
+    import uvicorn
+
+    uvicorn.run(APP, **uvicorn_options(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
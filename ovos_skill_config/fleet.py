@@ -0,0 +1,318 @@
+"""Push settings changes to many remote instances of this tool concurrently.
+
+Requires httpx (``pip install ovos-skill-config-tool[fleet]``); it is imported
+lazily so the server itself does not depend on it. This module does not import
+the server, so the CLI starts without loading FastAPI routes.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import quote, urlsplit
+
+OPERATIONS = ("merge", "replace", "patch")
+
+# Transient failures worth retrying; anything else is reported immediately
+RETRY_STATUSES = (502, 503, 504)
+# Only these may be sent again after a request that may have been applied
+# (a timeout or a 502/503/504); a merge or patch could land twice
+IDEMPOTENT_OPERATIONS = ("replace",)
+
+DEFAULT_CONCURRENCY = 16
+DEFAULT_PER_HOST = 2
+DEFAULT_RETRIES = 2
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_BACKOFF = 0.5
+
+
+def _require_httpx():
+    try:
+        import httpx
+    except ImportError as exc:
+        raise RuntimeError(
+            "Fleet support requires httpx: pip install ovos-skill-config-tool[fleet]"
+        ) from exc
+    return httpx
+
+
+def load_inventory(source: Union[str, Path, Dict, List]) -> List[Dict[str, str]]:
+    """Normalize a device inventory into a list of device dicts.
+
+    Accepts a path to a JSON file, a list of devices, or
+    ``{"defaults": {...}, "devices": [...]}``. Each device is either a base URL
+    string or a dict with ``url`` and optional ``name``/``username``/``password``;
+    missing credentials fall back to ``defaults`` and then to ovos/ovos.
+    """
+    if isinstance(source, (str, Path)):
+        source = json.loads(Path(source).read_text())
+    defaults: Dict[str, Any] = {}
+    if isinstance(source, dict):
+        defaults = source.get("defaults") or {}
+        source = source.get("devices")
+    if not isinstance(source, list):
+        raise ValueError("Inventory must be a list of devices")
+
+    devices = []
+    for entry in source:
+        if isinstance(entry, str):
+            entry = {"url": entry}
+        if not isinstance(entry, dict) or not entry.get("url"):
+            raise ValueError(f"Invalid inventory entry: {entry!r}")
+        url = str(entry["url"]).rstrip("/")
+        devices.append(
+            {
+                "name": str(entry.get("name") or urlsplit(url).netloc or url),
+                "url": url,
+                "username": str(
+                    entry.get("username", defaults.get("username", "ovos"))
+                ),
+                "password": str(
+                    entry.get("password", defaults.get("password", "ovos"))
+                ),
+            }
+        )
+    return devices
+
+
+def _request_for(operation: str, skill_id: str) -> tuple:
+    """HTTP method and path of the remote API call for an operation."""
+    # One path segment, even for ids containing / ? # or %
+    skill_path = "/api/v1/skills/" + quote(skill_id, safe="")
+    if operation == "merge":
+        return "POST", skill_path + "/merge"
+    if operation == "replace":
+        return "POST", skill_path
+    if operation == "patch":
+        return "PATCH", skill_path
+    raise ValueError(f"Unknown operation: {operation!r}")
+
+
+def check_push(
+    operation: str,
+    payload: Any,
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    per_host: int = DEFAULT_PER_HOST,
+    retries: int = DEFAULT_RETRIES,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> None:
+    """Raise ValueError for a push that no device could accept."""
+    if operation not in OPERATIONS:
+        raise ValueError(f"Unknown operation: {operation!r}")
+    if operation == "patch" and not isinstance(payload, list):
+        raise ValueError("patch needs a list of operations")
+    if operation != "patch" and not isinstance(payload, dict):
+        raise ValueError(f"{operation} needs settings as an object")
+    if retries < 0:
+        raise ValueError("retries must not be negative")
+    for name, value in (
+        ("concurrency", concurrency),
+        ("per_host", per_host),
+        ("timeout", timeout),
+    ):
+        if value <= 0:
+            raise ValueError(f"{name} must be positive")
+
+
+async def _push_one(
+    client,
+    device: Dict[str, str],
+    method: str,
+    path: str,
+    payload: Any,
+    retries: int,
+    backoff: float,
+    limit: asyncio.Semaphore,
+    host_limit: asyncio.Semaphore,
+    idempotent: bool,
+) -> Dict[str, Any]:
+    httpx = _require_httpx()
+    # Errors raised before the request reached the device
+    not_sent = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+    started = time.monotonic()
+    result: Dict[str, Any] = {
+        "device": device["name"],
+        "url": device["url"],
+        "ok": False,
+        "status": None,
+        "attempts": 0,
+        "error": None,
+    }
+    # The host's slot first, so devices queued behind a busy host do not
+    # hold global slots the other hosts could use
+    async with host_limit, limit:
+        for attempt in range(retries + 1):
+            result["attempts"] = attempt + 1
+            try:
+                response = await client.request(
+                    method,
+                    device["url"] + path,
+                    json=payload,
+                    auth=(device["username"], device["password"]),
+                )
+            except httpx.TransportError as exc:
+                result["status"] = None
+                result["error"] = f"{type(exc).__name__}: {exc}"
+                if not idempotent and not isinstance(exc, not_sent):
+                    break
+            else:
+                result["status"] = response.status_code
+                if response.is_success:
+                    result["ok"] = True
+                    result["error"] = None
+                    break
+                try:
+                    result["error"] = response.json().get("detail")
+                except ValueError:
+                    result["error"] = response.text[:200]
+                if response.status_code not in RETRY_STATUSES or not idempotent:
+                    break
+            if attempt < retries:
+                await asyncio.sleep(backoff * 2**attempt)
+    result["elapsed"] = round(time.monotonic() - started, 4)
+    return result
+
+
+async def push(
+    devices: List[Dict[str, str]],
+    skill_id: str,
+    operation: str,
+    payload: Any,
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    per_host: int = DEFAULT_PER_HOST,
+    retries: int = DEFAULT_RETRIES,
+    timeout: float = DEFAULT_TIMEOUT,
+    backoff: float = DEFAULT_BACKOFF,
+    transport=None,
+) -> Dict[str, Any]:
+    """Apply one merge/replace/patch to every device and summarize the results.
+
+    Requests share one pooled async client; at most ``concurrency`` run at
+    once overall and ``per_host`` against any single host. Connection errors
+    are retried with exponential backoff; other timeouts and 502/503/504
+    responses only for ``replace``, since the failed request may have been
+    applied and a merge or patch must not be applied twice.
+    """
+    check_push(
+        operation,
+        payload,
+        concurrency=concurrency,
+        per_host=per_host,
+        retries=retries,
+        timeout=timeout,
+    )
+    httpx = _require_httpx()
+    method, path = _request_for(operation, skill_id)
+    limit = asyncio.Semaphore(concurrency)
+    host_limits: Dict[str, asyncio.Semaphore] = {}
+    for device in devices:
+        host = urlsplit(device["url"]).netloc
+        host_limits.setdefault(host, asyncio.Semaphore(per_host))
+
+    started = time.monotonic()
+    async with httpx.AsyncClient(
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=concurrency,
+            max_keepalive_connections=concurrency,
+        ),
+        transport=transport,
+    ) as client:
+        results = await asyncio.gather(
+            *(
+                _push_one(
+                    client,
+                    device,
+                    method,
+                    path,
+                    payload,
+                    retries,
+                    backoff,
+                    limit,
+                    host_limits[urlsplit(device["url"]).netloc],
+                    operation in IDEMPOTENT_OPERATIONS,
+                )
+                for device in devices
+            )
+        )
+    succeeded = sum(1 for result in results if result["ok"])
+    return {
+        "skill_id": skill_id,
+        "operation": operation,
+        "total": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "elapsed": round(time.monotonic() - started, 4),
+        "results": list(results),
+    }
+
+
+def build_parser(parser: Optional[argparse.ArgumentParser] = None):
+    parser = parser or argparse.ArgumentParser(
+        prog="ovos-skill-config-fleet",
+        description="Push skill settings to many ovos-skill-config-tool instances.",
+    )
+    parser.add_argument("inventory", help="JSON inventory file of devices")
+    parser.add_argument("skill_id", help="Skill whose settings are changed")
+    parser.add_argument("operation", choices=OPERATIONS)
+    parser.add_argument(
+        "data", help="JSON file with settings (or patch operations); - for stdin"
+    )
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST)
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES)
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT)
+    return parser
+
+
+def _read_json(path: str) -> Any:
+    """JSON from a file, or stdin for -, naming the file in errors."""
+    text = sys.stdin.read() if path == "-" else Path(path).read_text()
+    try:
+        return json.loads(text)
+    except ValueError as exc:
+        raise ValueError(f"{path}: {exc}") from exc
+
+
+def run(args: argparse.Namespace) -> int:
+    options = {
+        "concurrency": args.concurrency,
+        "per_host": args.per_host,
+        "retries": args.retries,
+        "timeout": args.timeout,
+    }
+    try:
+        payload = _read_json(args.data)
+        try:
+            devices = load_inventory(args.inventory)
+        except ValueError as exc:
+            raise ValueError(f"{args.inventory}: {exc}") from exc
+        check_push(args.operation, payload, **options)
+        _require_httpx()
+    except (OSError, RuntimeError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    report = asyncio.run(
+        push(
+            devices,
+            args.skill_id,
+            args.operation,
+            payload,
+            **options,
+        )
+    )
+    print(json.dumps(report, indent=2))
+    return 0 if report["failed"] == 0 else 1
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    return run(build_parser().parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""Resource governor for expensive requests on shared, low-power hardware.
+
+Expensive work (scanning every skill, rendering the full index, exports,
+snapshots) runs on a small dedicated thread pool instead of the event loop, so
+cheap routes such as /status stay responsive. Requests beyond the pool size
+wait in a bounded queue; when that is full they are shed with 503 and a
+Retry-After header. Work can carry a deadline that long filesystem loops check
+cooperatively through check_deadline().
+"""
+
+import asyncio
+import contextvars
+import ctypes
+import os
+import platform
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
+
+# Seconds clients are asked to wait before retrying a shed request
+RETRY_AFTER = 2
+
+# Linux has no libc wrapper for ioprio_set/ioprio_get: (set, get) syscall
+# numbers by machine, for the boards and PCs OVOS runs on
+_IOPRIO_SYSCALLS = {
+    "x86_64": (251, 252),
+    "aarch64": (30, 31),
+    "riscv64": (30, 31),
+    "armv6l": (314, 315),
+    "armv7l": (314, 315),
+    "i686": (289, 290),
+}
+_IOPRIO_WHO_PROCESS = 1
+_IOPRIO_CLASS_SHIFT = 13
+IOPRIO_CLASS_IDLE = 3
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "ovos_skill_config_deadline", default=None
+)
+
+
+class Overloaded(Exception):
+    """The expensive-request queue is full; the request was not started."""
+
+
+class DeadlineExceeded(Exception):
+    """An expensive request ran past its deadline and was abandoned."""
+
+
+def check_deadline() -> None:
+    """Raise DeadlineExceeded if the current request's deadline has passed.
+
+    Call this between units of filesystem work (e.g. once per skill); it is a
+    no-op outside governed work or when no deadline is configured.
+    """
+    deadline = _deadline.get()
+    if deadline is not None and time.monotonic() > deadline:
+        raise DeadlineExceeded("Request deadline exceeded")
+
+
+def _ioprio_syscall(call: int, *args: int) -> Optional[int]:
+    """Issue ioprio_set (call 0) or ioprio_get (call 1); None if unsupported."""
+    numbers = _IOPRIO_SYSCALLS.get(platform.machine())
+    if numbers is None:
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+    except OSError:
+        return None
+    result = libc.syscall(numbers[call], _IOPRIO_WHO_PROCESS, *args)
+    return None if result < 0 else result
+
+
+def io_priority_class(tid: int) -> Optional[int]:
+    """The I/O scheduling class of a thread, None where it cannot be read."""
+    value = _ioprio_syscall(1, tid)
+    return None if value is None else value >> _IOPRIO_CLASS_SHIFT
+
+
+def _lower_priority() -> None:
+    """Best effort: nice this worker thread and make its I/O idle class."""
+    tid = threading.get_native_id()
+    try:
+        os.setpriority(os.PRIO_PROCESS, tid, 10)
+    except (AttributeError, OSError):
+        pass
+    _ioprio_syscall(0, tid, IOPRIO_CLASS_IDLE << _IOPRIO_CLASS_SHIFT)
+
+
+class ResourceGovernor:
+    """Bounded pool plus queue for expensive work, with optional deadlines."""
+
+    def __init__(
+        self,
+        max_concurrent: int = 2,
+        max_queue: int = 8,
+        deadline: float = 0.0,
+        low_priority: bool = False,
+    ):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.deadline = max(0.0, deadline)
+        self.low_priority = low_priority
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._closed = False
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrent,
+            thread_name_prefix="ovos-config-governed",
+            initializer=_lower_priority if low_priority else None,
+        )
+
+    @property
+    def in_flight(self) -> int:
+        """Requests running or queued."""
+        with self._lock:
+            return self._in_flight
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self._in_flight >= self.max_concurrent + self.max_queue:
+                raise Overloaded("Too many expensive requests in progress")
+            self._in_flight += 1
+
+    def _release(self, _future=None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            idle = self._closed and self._in_flight == 0
+        if idle:
+            self._executor.shutdown(wait=False)
+
+    async def run(
+        self, func: Callable[..., Any], *args: Any, use_deadline: bool = True
+    ) -> Any:
+        """Run func(*args) on the governed pool and await its result.
+
+        Raises Overloaded when the queue is full and DeadlineExceeded when the
+        work (including time spent queued) outlives the deadline. Work that
+        must not be abandoned halfway passes ``use_deadline=False``.
+        """
+        self._admit()
+        deadline = None
+        if self.deadline and use_deadline:
+            deadline = time.monotonic() + self.deadline
+
+        def call():
+            _deadline.set(deadline)
+            check_deadline()
+            return func(*args)
+
+        try:
+            future = self._executor.submit(contextvars.copy_context().run, call)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        wrapped = asyncio.wrap_future(future)
+        if deadline is None:
+            return await wrapped
+        try:
+            return await asyncio.wait_for(wrapped, deadline - time.monotonic())
+        except asyncio.TimeoutError as exc:
+            # The worker notices at its next check_deadline() and stops
+            raise DeadlineExceeded("Request deadline exceeded") from exc
+
+    def stream(self, iterator: Iterator[Any]) -> AsyncIterator[Any]:
+        """Iterate a blocking iterator on the governed pool, item by item.
+
+        Admission happens here, before the response starts, so a full queue
+        still becomes a 503; the stream then holds its slot until exhausted.
+        Streams have no deadline: once bytes are sent it cannot turn into 503.
+        A generator is closed when the stream ends early (client disconnect).
+        """
+        self._admit()
+        return self._stream(iterator)
+
+    async def _stream(self, iterator: Iterator[Any]) -> AsyncIterator[Any]:
+        done = object()
+        context = contextvars.copy_context()
+        try:
+            while True:
+                item = await asyncio.wrap_future(
+                    self._executor.submit(context.run, next, iterator, done)
+                )
+                if item is done:
+                    return
+                yield item
+        finally:
+            self._release()
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                try:
+                    close()
+                except ValueError:
+                    # Cancelled mid-step: still running on the pool
+                    pass
+
+    def close(self) -> None:
+        """Shut the pool down once the work already admitted has finished."""
+        with self._lock:
+            self._closed = True
+            idle = self._in_flight == 0
+        if idle:
+            self._executor.shutdown(wait=False)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
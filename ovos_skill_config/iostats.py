@@ -0,0 +1,226 @@
+"""Per-request filesystem I/O accounting.
+
+File opens are counted process-wide through an audit hook (so opens done by
+json_database and its lock files are included); stats, bytes read/written
+and fsyncs are counted by the helpers below, which this package uses for its
+own filesystem access. Counts go to the IOStats of the current context, set
+per request by track(); work handed to other threads with
+contextvars.copy_context() (as the resource governor does) is included.
+"""
+
+import contextvars
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
+
+FIELDS = ("opens", "stats", "bytes_read", "bytes_written", "fsyncs")
+
+PathLike = Union[str, Path]
+
+
+class IOStats:
+    """Counters for one request (or any other unit of work).
+
+    A request's work runs on several threads at once (governor pool, bulk
+    workers, write-behind timers), so counts are added under a lock.
+    """
+
+    __slots__ = FIELDS + ("_lock",)
+
+    def __init__(self):
+        for field in FIELDS:
+            setattr(self, field, 0)
+        self._lock = threading.Lock()
+
+    def count(self, **amounts: int) -> None:
+        """Add to the named counters."""
+        with self._lock:
+            for field, amount in amounts.items():
+                if amount:
+                    setattr(self, field, getattr(self, field) + amount)
+
+    def add(self, other: "IOStats") -> None:
+        self.count(**other.as_dict())
+
+    def as_dict(self) -> Dict[str, int]:
+        with self._lock:
+            return {field: getattr(self, field) for field in FIELDS}
+
+    def __repr__(self) -> str:
+        counts = ", ".join(f"{k}={v}" for k, v in self.as_dict().items())
+        return f"IOStats({counts})"
+
+
+_current: contextvars.ContextVar[Optional[IOStats]] = contextvars.ContextVar(
+    "ovos_skill_config_iostats", default=None
+)
+
+
+def current() -> Optional[IOStats]:
+    """The IOStats being filled in this context, if any."""
+    return _current.get()
+
+
+@contextmanager
+def track() -> Iterator[IOStats]:
+    """Count the I/O done in this block (and in work it hands off)."""
+    stats = IOStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def record(
+    opens: int = 0,
+    stats: int = 0,
+    bytes_read: int = 0,
+    bytes_written: int = 0,
+    fsyncs: int = 0,
+) -> None:
+    counters = _current.get()
+    if counters is None:
+        return
+    counters.count(
+        opens=opens,
+        stats=stats,
+        bytes_read=bytes_read,
+        bytes_written=bytes_written,
+        fsyncs=fsyncs,
+    )
+
+
+def stat(path: PathLike) -> os.stat_result:
+    record(stats=1)
+    return os.stat(path)
+
+
+def exists(path: PathLike) -> bool:
+    try:
+        stat(path)
+    except OSError:
+        return False
+    return True
+
+
+def read_bytes(path: PathLike) -> bytes:
+    with open(path, "rb") as f:
+        data = f.read()
+    record(bytes_read=len(data))
+    return data
+
+
+def write_bytes(path: PathLike, data: bytes, sync: bool = False) -> None:
+    with open(path, "wb") as f:
+        f.write(data)
+        if sync:
+            f.flush()
+            fsync(f.fileno())
+    record(bytes_written=len(data))
+
+
+def fsync(fd: int) -> None:
+    os.fsync(fd)
+    record(fsyncs=1)
+
+
+HEADER_PREFIX = "X-IO-"
+
+
+def headers_for(stats: IOStats) -> Dict[str, str]:
+    """Debug response headers (X-IO-Opens, X-IO-Bytes-Read, ...)."""
+    return {
+        HEADER_PREFIX + field.replace("_", "-").title(): str(value)
+        for field, value in stats.as_dict().items()
+    }
+
+
+def from_headers(headers) -> Dict[str, int]:
+    """Counts back from debug headers, e.g. of a test client response."""
+    return {
+        field: int(headers[HEADER_PREFIX + field.replace("_", "-").title()])
+        for field in FIELDS
+    }
+
+
+class IOTotals:
+    """Process-wide I/O totals, overall and per route, for metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.totals = IOStats()
+        self.routes: Dict[str, Dict] = {}
+
+    def add(self, route: str, stats: IOStats) -> None:
+        with self._lock:
+            self.requests += 1
+            self.totals.add(stats)
+            entry = self.routes.setdefault(route, {"requests": 0, "totals": IOStats()})
+            entry["requests"] += 1
+            entry["totals"].add(stats)
+
+    def as_dict(self) -> Dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "totals": self.totals.as_dict(),
+                "routes": {
+                    route: {
+                        "requests": entry["requests"],
+                        "totals": entry["totals"].as_dict(),
+                    }
+                    for route, entry in sorted(self.routes.items())
+                },
+            }
+
+
+def _audit(event: str, args) -> None:
+    if event == "open":
+        counters = _current.get()
+        if counters is not None:
+            counters.count(opens=1)
+
+
+_installed = threading.Lock()
+_hook_added = False
+
+
+def install() -> None:
+    """Add the audit hook that counts opens (once per process)."""
+    global _hook_added
+    with _installed:
+        if not _hook_added:
+            sys.addaudithook(_audit)
+            _hook_added = True
+
+
+@contextmanager
+def budget(**limits: int) -> Iterator[IOStats]:
+    """Test helper: fail if the block does more I/O than allowed.
+
+    ``with budget(opens=2, bytes_written=0): ...`` raises AssertionError
+    listing every counter over its limit. Counters not named are unlimited.
+    """
+    unknown = set(limits) - set(FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown I/O counters: {sorted(unknown)}")
+    install()
+    with track() as stats:
+        yield stats
+    over_budget(stats.as_dict(), limits)
+
+
+def over_budget(counts: Dict[str, int], limits: Dict[str, int]) -> None:
+    """Raise AssertionError if any count exceeds its limit."""
+    exceeded = {
+        field: f"{counts[field]} > {limit}"
+        for field, limit in limits.items()
+        if counts[field] > limit
+    }
+    if exceeded:
+        raise AssertionError(f"I/O budget exceeded: {exceeded} (all: {counts})")
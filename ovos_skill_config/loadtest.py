@@ -0,0 +1,420 @@
+"""Measure end-to-end throughput and latency of an instance of this tool.
+
+Starts a local server against a synthetic config dir (or targets ``--url``),
+replays a weighted mix of web UI and API routes over one pooled async client,
+and reports req/s, p50/p95/p99 latency and error rate per route.
+
+Requires httpx (``pip install ovos-skill-config-tool[loadtest]``); like the
+fleet client it is imported lazily and this module does not import the server.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import shlex
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+ROUTES = {
+    "index": ("GET", "/"),
+    "skills": ("GET", "/api/v1/skills"),
+    "export": ("GET", "/export"),
+    "set": ("POST", "/web/skills/{skill_id}/set"),
+}
+# Routes that take the session cookie in --auth login mode; the JSON API only
+# accepts Basic auth and always gets it
+WEB_ROUTES = ("index", "export", "set")
+WRITE_ROUTES = ("set",)
+
+DEFAULT_MIX = "index=1,skills=4,export=1,set=2"
+DEFAULT_SKILLS = 50
+DEFAULT_CONNECTIONS = 8
+DEFAULT_DURATION = 10.0
+DEFAULT_WARMUP = 1.0
+DEFAULT_TIMEOUT = 30.0
+STARTUP_TIMEOUT = 30.0
+
+
+def _require_httpx():
+    try:
+        import httpx
+    except ImportError as exc:
+        raise RuntimeError(
+            "The load test requires httpx: pip install ovos-skill-config-tool[loadtest]"
+        ) from exc
+    return httpx
+
+
+def parse_mix(text: str) -> Dict[str, int]:
+    """Parse ``route=weight,...`` into a dict of positive integer weights."""
+    mix: Dict[str, int] = {}
+    for item in text.split(","):
+        name, _, weight = item.strip().partition("=")
+        if name not in ROUTES:
+            raise ValueError(
+                f"Unknown route {name!r} in mix; choose from {', '.join(ROUTES)}"
+            )
+        try:
+            mix[name] = int(weight or 1)
+        except ValueError as exc:
+            raise ValueError(f"Invalid weight for {name!r}: {weight!r}") from exc
+        if mix[name] < 0:
+            raise ValueError(f"Invalid weight for {name!r}: {weight!r}")
+    mix = {name: weight for name, weight in mix.items() if weight}
+    if not mix:
+        raise ValueError("The route mix is empty")
+    return mix
+
+
+def seed_config_dir(config_home: Path, skills: int = DEFAULT_SKILLS) -> List[str]:
+    """Write ``skills`` synthetic skills under an XDG config home.
+
+    Settings are shaped like real skills (scalars, a nested object, a list)
+    so pages and exports render the same widgets they do on a device.
+    Returns the skill ids.
+    """
+    skill_ids = []
+    for n in range(skills):
+        skill_id = f"loadtest-skill-{n:04d}.openvoiceos"
+        skill_dir = config_home / "mycroft" / "skills" / skill_id
+        skill_dir.mkdir(parents=True, exist_ok=True)
+        settings = {
+            "lang": "en-us",
+            "units": "metric",
+            "volume": n % 100,
+            "enabled": n % 2 == 0,
+            "api_key": f"{n:032x}",
+            "location": {"city": f"City {n}", "lat": 38.9 + n / 1000, "lon": -77.0},
+            "phrases": [f"phrase {i}" for i in range(n % 8)],
+        }
+        (skill_dir / "settings.json").write_text(json.dumps(settings, indent=4))
+        skill_ids.append(skill_id)
+    return skill_ids
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def summarize(
+    latencies: Dict[str, List[float]], errors: Dict[str, Dict[str, int]], elapsed: float
+) -> Dict:
+    """Per-route and total req/s, latency percentiles (ms) and error rates.
+
+    Percentiles are over successful responses only, so fast rejections (503
+    from the governor, 401) do not flatter them; those count as errors.
+    """
+
+    def stats(samples: List[float], failed: Dict[str, int]) -> Dict:
+        failures = sum(failed.values())
+        total = len(samples) + failures
+        result = {
+            "requests": total,
+            "rps": round(total / elapsed, 1) if elapsed else 0.0,
+            "errors": failures,
+            "error_rate": round(failures / total, 4) if total else 0.0,
+            "error_kinds": dict(sorted(failed.items())),
+        }
+        for name, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+            result[name] = (
+                round(percentile(samples, fraction) * 1000, 2) if samples else None
+            )
+        return result
+
+    routes = {
+        name: stats(latencies.get(name, []), errors.get(name, {}))
+        for name in sorted(set(latencies) | set(errors))
+    }
+    all_errors: Dict[str, int] = {}
+    for failed in errors.values():
+        for kind, count in failed.items():
+            all_errors[kind] = all_errors.get(kind, 0) + count
+    total = stats([s for samples in latencies.values() for s in samples], all_errors)
+    return {"elapsed": round(elapsed, 3), "routes": routes, "total": total}
+
+
+def format_report(summary: Dict) -> str:
+    lines = [
+        f"{'route':<8} {'requests':>9} {'req/s':>8} {'p50':>8} {'p95':>8}"
+        f" {'p99':>8} {'errors':>7}  (ms, over {summary['elapsed']:.1f}s)"
+    ]
+    rows = list(summary["routes"].items()) + [("total", summary["total"])]
+    for name, stats in rows:
+        percentiles = " ".join(
+            f"{stats[p]:>8.1f}" if stats[p] is not None else f"{'-':>8}"
+            for p in ("p50", "p95", "p99")
+        )
+        lines.append(
+            f"{name:<8} {stats['requests']:>9} {stats['rps']:>8.1f} {percentiles}"
+            f" {stats['error_rate']:>7.1%}"
+        )
+    for name, stats in rows[:-1]:
+        if stats["error_kinds"]:
+            kinds = ", ".join(f"{k}: {v}" for k, v in stats["error_kinds"].items())
+            lines.append(f"  {name} errors: {kinds}")
+    return "\n".join(lines)
+
+
+async def _login(client, username: str, password: str) -> None:
+    """Sign in through the HTML form; the client keeps the session cookie."""
+    response = await client.post(
+        "/login", data={"username": username, "password": password}
+    )
+    if response.status_code != 303:
+        raise RuntimeError(f"Login failed: HTTP {response.status_code}")
+
+
+async def run_load(
+    base_url: str,
+    mix: Dict[str, int],
+    skill_ids: List[str],
+    *,
+    duration: float = DEFAULT_DURATION,
+    warmup: float = DEFAULT_WARMUP,
+    connections: int = DEFAULT_CONNECTIONS,
+    auth: str = "basic",
+    username: str = "ovos",
+    password: str = "ovos",
+    timeout: float = DEFAULT_TIMEOUT,
+    seed: Optional[int] = None,
+    transport=None,
+) -> Dict:
+    """Drive the route mix from ``connections`` concurrent workers.
+
+    Each worker has one request in flight at a time and picks the next route
+    at random by weight. A warmup phase runs the same mix first and is not
+    measured. Redirects are not followed, so a lost session (redirect to
+    /login) counts as an error rather than a fast success.
+    """
+    httpx = _require_httpx()
+    if "set" in mix and not skill_ids:
+        raise ValueError("The set route needs at least one skill")
+    basic = (username, password)
+    routes, weights = list(mix), list(mix.values())
+    rng = random.Random(seed)
+
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        auth=basic if auth == "basic" else None,
+        timeout=timeout,
+        follow_redirects=False,
+        limits=httpx.Limits(
+            max_connections=connections, max_keepalive_connections=connections
+        ),
+        transport=transport,
+    ) as client:
+        if auth == "login":
+            await _login(client, username, password)
+
+        async def request(name: str, n: int):
+            method, path = ROUTES[name]
+            kwargs = {}
+            if auth == "login" and name not in WEB_ROUTES:
+                kwargs["auth"] = basic
+            if name == "set":
+                path = path.format(skill_id=rng.choice(skill_ids))
+                kwargs["data"] = {"path": '["loadtest"]', "type": "number", "value": n}
+            return await client.request(method, path, **kwargs)
+
+        async def phase(seconds: float):
+            latencies: Dict[str, List[float]] = {name: [] for name in routes}
+            errors: Dict[str, Dict[str, int]] = {name: {} for name in routes}
+            deadline = time.perf_counter() + seconds
+
+            async def worker():
+                n = 0
+                while time.perf_counter() < deadline:
+                    n += 1
+                    name = rng.choices(routes, weights)[0]
+                    start = time.perf_counter()
+                    try:
+                        response = await request(name, n)
+                    except httpx.HTTPError as exc:
+                        kind = type(exc).__name__
+                    else:
+                        if response.is_success:
+                            latencies[name].append(time.perf_counter() - start)
+                            continue
+                        kind = str(response.status_code)
+                    errors[name][kind] = errors[name].get(kind, 0) + 1
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(connections)))
+            return latencies, errors, time.perf_counter() - started
+
+        if warmup > 0:
+            await phase(warmup)
+        return summarize(*await phase(duration))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def local_server(
+    config_home: Path,
+    username: str,
+    password: str,
+    server_args: List[str] = (),
+) -> Iterator[str]:
+    """Run ovos-skill-config-tool on a free local port; yields its base URL."""
+    httpx = _require_httpx()
+    port = _free_port()
+    env = dict(
+        os.environ,
+        XDG_CONFIG_HOME=str(config_home),
+        OVOS_CONFIG_USERNAME=username,
+        OVOS_CONFIG_PASSWORD=password,
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "ovos_skill_config.cli"]
+        + ["--host", "127.0.0.1", "--port", str(port)]
+        + ["--no-access-log", "--log-level", "warning"]
+        + list(server_args),
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while True:
+            if server.poll() is not None:
+                raise RuntimeError(f"Server exited with {server.returncode}")
+            try:
+                httpx.get(base_url + "/status", timeout=1.0)
+                break
+            except httpx.TransportError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError("Server did not start in time") from None
+                time.sleep(0.1)
+        yield base_url
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def build_parser(parser: Optional[argparse.ArgumentParser] = None):
+    parser = parser or argparse.ArgumentParser(
+        prog="ovos-skill-config-tool loadtest",
+        description="Load test an ovos-skill-config-tool instance.",
+    )
+    parser.add_argument(
+        "--url",
+        help="Instance to test (default: start a local one on a synthetic config dir)",
+    )
+    parser.add_argument(
+        "--mix",
+        default=DEFAULT_MIX,
+        help=f"Weighted routes, from {', '.join(ROUTES)} (default: {DEFAULT_MIX})",
+    )
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION)
+    parser.add_argument("--warmup", type=float, default=DEFAULT_WARMUP)
+    parser.add_argument("-c", "--connections", type=int, default=DEFAULT_CONNECTIONS)
+    parser.add_argument("--auth", choices=("basic", "login"), default="basic")
+    parser.add_argument("--username", default=os.getenv("OVOS_CONFIG_USERNAME", "ovos"))
+    parser.add_argument("--password", default=os.getenv("OVOS_CONFIG_PASSWORD", "ovos"))
+    parser.add_argument(
+        "--skills",
+        type=int,
+        default=DEFAULT_SKILLS,
+        help="Synthetic skills to seed the local instance with",
+    )
+    parser.add_argument(
+        "--server-args",
+        default="",
+        help='Extra options for the local server, e.g. "--loop uvloop"',
+    )
+    parser.add_argument(
+        "--allow-writes",
+        action="store_true",
+        help="Allow the set route against --url (it writes a 'loadtest' key)",
+    )
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT)
+    parser.add_argument("--seed", type=int, help="Seed the route/skill choice")
+    parser.add_argument("--json", action="store_true", help="Print a JSON report")
+    return parser
+
+
+def _remote_skill_ids(url: str, username: str, password: str) -> List[str]:
+    httpx = _require_httpx()
+    response = httpx.get(
+        url.rstrip("/") + "/api/v1/skills", auth=(username, password), timeout=30
+    )
+    response.raise_for_status()
+    return [skill["id"] for skill in response.json()]
+
+
+def _target(args, mix: Dict[str, int], stack: contextlib.ExitStack) -> Tuple:
+    """Base URL and skill ids to test, starting a local server if needed."""
+    if args.url:
+        if any(name in WRITE_ROUTES for name in mix) and not args.allow_writes:
+            raise ValueError(
+                "The mix writes settings; pass --allow-writes to run it against --url"
+            )
+        skill_ids = []
+        if "set" in mix:
+            skill_ids = _remote_skill_ids(args.url, args.username, args.password)
+        return args.url.rstrip("/"), skill_ids
+    config_home = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+    skill_ids = seed_config_dir(config_home, args.skills)
+    base_url = stack.enter_context(
+        local_server(
+            config_home, args.username, args.password, shlex.split(args.server_args)
+        )
+    )
+    return base_url, skill_ids
+
+
+def run(args: argparse.Namespace) -> int:
+    mix = parse_mix(args.mix)
+    if args.connections < 1:
+        raise ValueError("--connections must be at least 1")
+    with contextlib.ExitStack() as stack:
+        base_url, skill_ids = _target(args, mix, stack)
+        summary = asyncio.run(
+            run_load(
+                base_url,
+                mix,
+                skill_ids,
+                duration=args.duration,
+                warmup=args.warmup,
+                connections=args.connections,
+                auth=args.auth,
+                username=args.username,
+                password=args.password,
+                timeout=args.timeout,
+                seed=args.seed,
+            )
+        )
+    summary["config"] = {
+        "url": args.url or "local",
+        "mix": mix,
+        "connections": args.connections,
+        "auth": args.auth,
+        "skills": len(skill_ids),
+    }
+    print(json.dumps(summary, indent=2) if args.json else format_report(summary))
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    try:
+        return run(build_parser().parse_args(argv))
+    except (RuntimeError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""Structured, non-blocking logging for the server.
+
+configure() routes the ``ovos_skill_config`` loggers through a bounded queue
+to a handler on a background thread, so request handlers and the event loop
+never wait on stderr or a slow terminal. When the queue is full, records
+are dropped and counted rather than blocking the caller.
+
+Records are JSON lines by default. They carry the record's ``extra``
+fields, so they can be filtered with grep or jq.
+
+- OVOS_CONFIG_LOG_FORMAT: ``json`` (default) or ``text``
+- OVOS_CONFIG_LOG_LEVEL: default INFO
+"""
+
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, TextIO
+
+LOGGER_NAME = "ovos_skill_config"
+QUEUE_SIZE = 10000
+
+# Attributes every LogRecord has; anything else was passed as extra=
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None)))
+_RECORD_ATTRIBUTES |= {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message, extras."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created))
+            + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records instead of blocking on a full queue."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Format the message and traceback now, in the logging thread, but
+        # keep extras as fields for the formatter on the other side
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_lock = threading.Lock()
+_listener: Optional[logging.handlers.QueueListener] = None
+_handler: Optional[DroppingQueueHandler] = None
+
+
+def configure(stream: Optional[TextIO] = None) -> None:
+    """Send this package's logs through the queue; idempotent.
+
+    ``stream`` defaults to stderr. Call shutdown() to flush and stop.
+    """
+    global _listener, _handler
+    with _lock:
+        if _listener is not None:
+            return
+        output = logging.StreamHandler(stream or sys.stderr)
+        if os.getenv("OVOS_CONFIG_LOG_FORMAT", "json").lower() == "text":
+            output.setFormatter(
+                logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+            )
+        else:
+            output.setFormatter(JsonFormatter())
+        log_queue: queue.Queue = queue.Queue(QUEUE_SIZE)
+        _handler = DroppingQueueHandler(log_queue)
+        _listener = logging.handlers.QueueListener(log_queue, output)
+        _listener.start()
+        logger = logging.getLogger(LOGGER_NAME)
+        logger.addHandler(_handler)
+        try:
+            logger.setLevel(os.getenv("OVOS_CONFIG_LOG_LEVEL", "INFO").upper())
+        except ValueError:
+            logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+
+def shutdown() -> None:
+    """Write out queued records and detach the queue handler."""
+    global _listener, _handler
+    with _lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        logger = logging.getLogger(LOGGER_NAME)
+        logger.removeHandler(_handler)
+        logger.propagate = True
+        if _handler.dropped:
+            logger.warning("%d log records were dropped", _handler.dropped)
+        _listener = _handler = None
+
+
+# Filled in as a request is served (the user once authenticated); a dict so
+# that code running in copied contexts (thread pools) can add to it
+_request_info: contextvars.ContextVar[Optional[Dict[str, Any]]] = (
+    contextvars.ContextVar("ovos_skill_config_request_info", default=None)
+)
+
+
+@contextmanager
+def request_info() -> Iterator[Dict[str, Any]]:
+    """Collect details about the current request for its access log record."""
+    info: Dict[str, Any] = {}
+    token = _request_info.set(info)
+    try:
+        yield info
+    finally:
+        _request_info.reset(token)
+
+
+def set_user(username: str) -> None:
+    """Record the authenticated user of the current request, if any."""
+    info = _request_info.get()
+    if info is not None:
+        info["user"] = username
+
+
+class RateLimitedLogger:
+    """Log at most one record per key (e.g. a skill id) per interval.
+
+    Repeats in between are counted and reported as ``suppressed`` on the
+    next record for that key. At most ``max_keys`` keys are remembered,
+    least recently logged first out, so memory stays bounded.
+    """
+
+    def __init__(
+        self, logger: logging.Logger, interval: float = 60.0, max_keys: int = 1024
+    ):
+        self.logger = logger
+        self.interval = interval
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        # key -> [time last logged, repeats suppressed since]
+        self._seen: "OrderedDict[str, list]" = OrderedDict()
+
+    def log(self, level: int, key: str, msg: str, *args: Any, **extra: Any) -> bool:
+        """Log unless ``key`` was logged less than ``interval`` ago."""
+        now = time.monotonic()
+        with self._lock:
+            seen = self._seen.get(key)
+            if seen is not None and now - seen[0] < self.interval:
+                seen[1] += 1
+                return False
+            suppressed = seen[1] if seen is not None else 0
+            self._seen.pop(key, None)
+            self._seen[key] = [now, 0]
+            while len(self._seen) > self.max_keys:
+                self._seen.popitem(last=False)
+        if suppressed:
+            extra["suppressed"] = suppressed
+        self.logger.log(level, msg, *args, extra=extra)
+        return True
+
+    def __len__(self) -> int:
+        """Keys remembered."""
+        with self._lock:
+            return len(self._seen)
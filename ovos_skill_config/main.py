@@ -1,19 +1,97 @@
 import base64
+import codecs
+import contextvars
+import copy
+import fnmatch
+import hashlib
+import json
+import logging
 import os
+import re
 import secrets
 import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, asynccontextmanager, contextmanager, nullcontext
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
+from combo_lock import ComboLock
 from fastapi import Depends, FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
-from fastapi.staticfiles import StaticFiles
 from json_database import JsonStorage
 from json_database.exceptions import DatabaseNotCommitted
+from json_database.utils import merge_dict
+from starlette.datastructures import Headers, MutableHeaders
+
+from ovos_skill_config import bus, fleet, iostats, logs, memstats, timing, tracing
+from ovos_skill_config.changes import ChangeLog
+from ovos_skill_config.governor import (
+    RETRY_AFTER,
+    DeadlineExceeded,
+    Overloaded,
+    ResourceGovernor,
+    check_deadline,
+)
+from ovos_skill_config.mirror import (
+    SettingsMirror,
+    encode_value,
+    parse_settings,
+    pointer_token,
+)
+from ovos_skill_config.records import (
+    RecordParser,
+    RecordSyntaxError,
+    RecordTooLarge,
+)
+from ovos_skill_config.snapshots import SnapshotNotFound, SnapshotStore
+from ovos_skill_config.writebehind import WriteBehindBuffer
+
+# When run as a script (python -m ovos_skill_config.main), this module loads
+# as "__main__"; register it under its canonical name so that web's import
+# of it, and uvicorn's import of the app string, bind to this same module
+# instead of executing it a second time (a second app, with its middlewares
+# and diagnostics registered twice)
+sys.modules.setdefault("ovos_skill_config.main", sys.modules[__name__])
+
+# Settings documents waiting for a debounced write (OVOS_CONFIG_WRITE_BEHIND_MS)
+WRITE_BEHIND = WriteBehindBuffer()
+
+# Change numbers for GET /api/v1/changes
+CHANGES = ChangeLog()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    logs.configure()
+    for problem in config_root_problems():
+        LOG.error("%s", problem)
+    yield
+    # Never lose debounced edits on shutdown
+    WRITE_BEHIND.flush()
+    # After the flush, so the changes it writes are announced too
+    bus.close()
+    logs.shutdown()
+
+
+app = FastAPI(title="OVOS/Neon Skill Configuration API", lifespan=lifespan)
+
+
+@app.exception_handler(Overloaded)
+@app.exception_handler(DeadlineExceeded)
+async def shed_request(request: Request, exc: Exception) -> JSONResponse:
+    """Shed expensive requests the governor could not serve in time."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(RETRY_AFTER)},
+    )
 
-app = FastAPI(title="OVOS/Neon Skill Configuration API")
 
 # Basic auth security
 security = HTTPBasic()
@@ -24,16 +102,421 @@ DEFAULT_PASSWORD = os.getenv("OVOS_CONFIG_PASSWORD", "ovos")
 
 
 def verify_credentials(credentials: HTTPBasicCredentials = Depends(security)):
-    correct_username = secrets.compare_digest(credentials.username, DEFAULT_USERNAME)
-    correct_password = secrets.compare_digest(credentials.password, DEFAULT_PASSWORD)
+    with timing.phase("auth"), tracing.span("auth.basic"):
+        correct_username = secrets.compare_digest(
+            credentials.username, DEFAULT_USERNAME
+        )
+        correct_password = secrets.compare_digest(
+            credentials.password, DEFAULT_PASSWORD
+        )
     if not (correct_username and correct_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
         )
+    logs.set_user(credentials.username)
     return credentials.username
 
 
+LOG = logging.getLogger(__name__)
+
+IO_TOTALS = iostats.IOTotals()
+iostats.install()
+
+
+MIB = 1024 * 1024
+DEFAULT_MAX_BODY_BYTES = MIB
+DEFAULT_MAX_IMPORT_BYTES = 64 * MIB
+DEFAULT_MAX_DEPTH = 32
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(int(os.getenv(name, default)), 0)
+    except ValueError:
+        return default
+
+
+@lru_cache()
+def _parse_body_limits(spec: str) -> Tuple[Tuple[str, int], ...]:
+    """Parse an OVOS_CONFIG_BODY_LIMITS value ("/login=16384,/web/*=65536")."""
+    limits = []
+    for entry in spec.split(","):
+        pattern, sep, value = entry.strip().rpartition("=")
+        try:
+            limits.append((pattern.strip(), max(int(value), 0)))
+        except ValueError:
+            sep = ""
+        if not sep or not pattern.strip():
+            LOG.warning("Ignoring invalid OVOS_CONFIG_BODY_LIMITS entry: %r", entry)
+    return tuple(limits)
+
+
+def body_limit(path: str) -> int:
+    """Largest request body accepted for a request path, in bytes (0: any).
+
+    Read at request time: the first OVOS_CONFIG_BODY_LIMITS pattern
+    (fnmatch, on the path) that matches; else OVOS_CONFIG_MAX_IMPORT_BYTES
+    (default 64 MiB) for imports, which are parsed a record at a time, and
+    OVOS_CONFIG_MAX_BODY_BYTES (default 1 MiB) for everything else.
+    """
+    spec = os.getenv("OVOS_CONFIG_BODY_LIMITS", "")
+    for pattern, limit in _parse_body_limits(spec) if spec else ():
+        if fnmatch.fnmatchcase(path, pattern):
+            return limit
+    if path.endswith("/skills:import"):
+        return _env_int("OVOS_CONFIG_MAX_IMPORT_BYTES", DEFAULT_MAX_IMPORT_BYTES)
+    return _env_int("OVOS_CONFIG_MAX_BODY_BYTES", DEFAULT_MAX_BODY_BYTES)
+
+
+def max_settings_depth() -> int:
+    """How deeply settings may nest (OVOS_CONFIG_MAX_DEPTH, default 32; 0: any)."""
+    return _env_int("OVOS_CONFIG_MAX_DEPTH", DEFAULT_MAX_DEPTH)
+
+
+def settings_too_deep(value: Any, limit: Optional[int] = None) -> bool:
+    """Whether objects/arrays in ``value`` nest more than ``limit`` levels."""
+    limit = max_settings_depth() if limit is None else limit
+    if not limit:
+        return False
+    stack = [(value, 1)]
+    while stack:
+        node, depth = stack.pop()
+        if isinstance(node, dict):
+            children = node.values()
+        elif isinstance(node, list):
+            children = node
+        else:
+            continue
+        if depth > limit:
+            return True
+        stack.extend((child, depth + 1) for child in children)
+    return False
+
+
+def check_settings_depth(value: Any) -> None:
+    """Reject (400) a request body whose settings nest too deeply."""
+    limit = max_settings_depth()
+    if settings_too_deep(value, limit):
+        raise HTTPException(
+            status_code=400, detail=f"Settings nest more than {limit} levels deep"
+        )
+
+
+class RequestTooLarge(HTTPException):
+    """Raised while reading a request body that goes over its route's limit.
+
+    An HTTPException, so FastAPI's body parsing passes it on and it is
+    answered with 413 wherever the body is being read.
+    """
+
+    def __init__(self, limit: int):
+        super().__init__(
+            status_code=413,
+            detail=f"Request body over the limit of {limit} bytes",
+        )
+
+
+class BodyLimitMiddleware:
+    """Enforce body_limit() without ever buffering more than the limit.
+
+    A Content-Length over the limit is refused before the body is read;
+    bodies of unknown length are counted as they arrive, and reading stops
+    with a 413 at the first chunk past the limit.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        limit = body_limit(scope["path"])
+        if not limit:
+            await self.app(scope, receive, send)
+            return
+        length = Headers(scope=scope).get("content-length", "")
+        if length.isdigit() and int(length) > limit:
+            exc = RequestTooLarge(limit)
+            response = JSONResponse(
+                {"detail": exc.detail},
+                status_code=exc.status_code,
+                headers={"Connection": "close"},
+            )
+            await response(scope, receive, send)
+            return
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise RequestTooLarge(limit)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+app.add_middleware(BodyLimitMiddleware)
+
+
+def io_debug_enabled() -> bool:
+    """Whether responses carry X-IO-* headers (OVOS_CONFIG_IO_DEBUG)."""
+    return os.getenv("OVOS_CONFIG_IO_DEBUG", "").lower() in ("1", "true", "yes")
+
+
+class IOAccountingMiddleware:
+    """Count each request's filesystem I/O (see ovos_skill_config.iostats).
+
+    Totals are recorded once the last body chunk is sent, so streamed pages
+    are fully counted; debug headers can only cover I/O done before the
+    response starts.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        debug = io_debug_enabled()
+        with iostats.track() as stats:
+
+            async def send_with_accounting(message):
+                if message["type"] == "http.response.start" and debug:
+                    headers = MutableHeaders(scope=message)
+                    for name, value in iostats.headers_for(stats).items():
+                        headers.append(name, value)
+                elif message["type"] == "http.response.body" and not message.get(
+                    "more_body"
+                ):
+                    route = getattr(scope.get("route"), "path", "(unrouted)")
+                    IO_TOTALS.add(route, stats)
+                    LOG.debug("%s %s I/O: %s", scope["method"], scope["path"], stats)
+                await send(message)
+
+            await self.app(scope, receive, send_with_accounting)
+
+
+app.add_middleware(IOAccountingMiddleware)
+
+
+def server_timing_enabled() -> bool:
+    """Whether responses carry a Server-Timing header (OVOS_CONFIG_SERVER_TIMING)."""
+    return os.getenv("OVOS_CONFIG_SERVER_TIMING", "").lower() in ("1", "true", "yes")
+
+
+class ServerTimingMiddleware:
+    """Add a Server-Timing header with each request's phases (see timing).
+
+    Streamed responses are held back until their last chunk while this is
+    enabled, so the header covers the whole page, not just its first bytes.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not server_timing_enabled():
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        held: List[Dict] = []
+        with timing.track() as timings:
+
+            async def send_with_timing(message):
+                if message["type"] == "http.response.start":
+                    held.append(message)
+                    return
+                if message["type"] != "http.response.body" or not held:
+                    await send(message)
+                    return
+                held.append(message)
+                if message.get("more_body"):
+                    return
+                start, *body = held
+                held.clear()
+                MutableHeaders(scope=start).append(
+                    "Server-Timing",
+                    timing.header_value(timings, time.perf_counter() - started),
+                )
+                await send(start)
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": b"".join(chunk.get("body", b"") for chunk in body),
+                    }
+                )
+
+            await self.app(scope, receive, send_with_timing)
+
+
+app.add_middleware(ServerTimingMiddleware)
+
+# Warn once, not per request, when OVOS_CONFIG_TRACE=otel cannot work
+_otel_missing_warned = False
+
+
+class TracingMiddleware:
+    """Record a trace of each request when OVOS_CONFIG_TRACE is set.
+
+    The root span covers the request until its last body chunk is sent;
+    spans opened by the code that serves it (see tracing) are its children.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        target = tracing.exporter() if scope["type"] == "http" else ""
+        if not target:
+            await self.app(scope, receive, send)
+            return
+        attributes = {"http.method": scope["method"], "url.path": scope["path"]}
+        name = f"{scope['method']} {scope['path']}"
+        if target == "otel":
+            await self._call_otel(scope, receive, send, name, attributes)
+            return
+        started = tracing.start_trace(Headers(scope=scope).get(tracing.TRACEPARENT))
+        if started is None:
+            await self.app(scope, receive, send)
+            return
+        trace, sampled = started
+
+        async def send_traced(message):
+            if message["type"] == "http.response.start":
+                root.set(**{"http.status_code": message["status"]})
+                if sampled:
+                    MutableHeaders(scope=message).append("X-Trace-Id", trace.trace_id)
+            await send(message)
+
+        token = tracing.activate(trace)
+        try:
+            with tracing.Span(trace, name, attributes) as root:
+                await self.app(scope, receive, send_traced)
+        finally:
+            tracing.deactivate(token)
+            route = getattr(scope.get("route"), "path", None)
+            if route:
+                root.name = f"{scope['method']} {route}"
+                root.set(**{"http.route": route})
+            slow = tracing.slow_threshold_ms()
+            if sampled or (slow is not None and root.duration_ms >= slow):
+                tracing.export(trace, root, target)
+
+    async def _call_otel(self, scope, receive, send, name, attributes):
+        global _otel_missing_warned
+        if not tracing.otel_installed():
+            if not _otel_missing_warned:
+                _otel_missing_warned = True
+                LOG.warning("OVOS_CONFIG_TRACE=otel needs opentelemetry-api installed")
+            await self.app(scope, receive, send)
+            return
+        headers = {
+            key.decode("latin-1"): value.decode("latin-1")
+            for key, value in scope["headers"]
+        }
+        with tracing.otel_request(name, headers, attributes) as request_span:
+
+            async def send_traced(message):
+                if message["type"] == "http.response.start":
+                    request_span.set_attribute("http.status_code", message["status"])
+                await send(message)
+
+            await self.app(scope, receive, send_traced)
+
+
+app.add_middleware(TracingMiddleware)
+
+ACCESS_LOG = logging.getLogger(f"{__name__}.access")
+
+
+def access_log_enabled() -> bool:
+    """Whether every request is logged (OVOS_CONFIG_ACCESS_LOG)."""
+    return os.getenv("OVOS_CONFIG_ACCESS_LOG", "").lower() in ("1", "true", "yes")
+
+
+def slow_request_ms() -> float:
+    """Requests at least this slow are logged as warnings (default 1000 ms)."""
+    try:
+        return float(os.getenv("OVOS_CONFIG_SLOW_REQUEST_MS", "1000"))
+    except ValueError:
+        return 1000.0
+
+
+class AccessLogMiddleware:
+    """Log each request with its route, skill, status, latency, bytes and user.
+
+    Every request is logged at INFO with OVOS_CONFIG_ACCESS_LOG; slow
+    requests and server errors are always logged, as warnings and errors.
+    Latency runs until the last body chunk is sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        response = {"status": None, "bytes": 0}
+
+        async def send_logged(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["bytes"] += len(message.get("body", b""))
+            await send(message)
+
+        with logs.request_info() as info:
+            try:
+                await self.app(scope, receive, send_logged)
+            except BaseException:
+                self.log(scope, response, info, started, exc_info=True)
+                raise
+            self.log(scope, response, info, started)
+
+    @staticmethod
+    def log(scope, response, info, started, exc_info=False) -> None:
+        latency_ms = (time.perf_counter() - started) * 1000
+        status_code = 500 if exc_info else response["status"]
+        if exc_info or (status_code or 0) >= 500:
+            level = logging.ERROR
+        elif latency_ms >= slow_request_ms():
+            level = logging.WARNING
+        elif access_log_enabled():
+            level = logging.INFO
+        else:
+            return
+        route = getattr(scope.get("route"), "path", None)
+        ACCESS_LOG.log(
+            level,
+            "%s %s %s %.1fms",
+            scope["method"],
+            scope["path"],
+            status_code,
+            latency_ms,
+            exc_info=exc_info,
+            extra={
+                "method": scope["method"],
+                "route": route,
+                "path": scope["path"],
+                "skill_id": scope.get("path_params", {}).get("skill_id"),
+                "status": status_code,
+                "latency_ms": round(latency_ms, 2),
+                "bytes": response["bytes"],
+                "user": info.get("user"),
+            },
+        )
+
+
+app.add_middleware(AccessLogMiddleware)
+
 # Enable CORS
 app.add_middleware(
     CORSMiddleware,
@@ -100,6 +583,61 @@ def maybe_sort_settings(settings: Dict) -> Dict:
     return settings
 
 
+def write_behind_delay() -> float:
+    """Debounce window in seconds for write-behind mode, 0 when disabled.
+
+    Controlled by the OVOS_CONFIG_WRITE_BEHIND_MS env var, read at request
+    time. When set, writes update an in-memory document immediately and reach
+    settings.json once edits have paused for that many milliseconds.
+    """
+    try:
+        return max(float(os.getenv("OVOS_CONFIG_WRITE_BEHIND_MS", "0")), 0.0) / 1000
+    except ValueError:
+        return 0.0
+
+
+# The governor in use, closed when a config change replaces it
+_CURRENT_GOVERNOR: List[ResourceGovernor] = []
+
+
+@lru_cache(maxsize=1)
+def _governor(
+    max_concurrent: int, max_queue: int, deadline: float, low_priority: bool
+) -> ResourceGovernor:
+    governor = ResourceGovernor(max_concurrent, max_queue, deadline, low_priority)
+    for replaced in _CURRENT_GOVERNOR:
+        replaced.close()
+    _CURRENT_GOVERNOR[:] = [governor]
+    return governor
+
+
+def get_governor() -> ResourceGovernor:
+    """Resource governor for expensive requests, configured from env vars.
+
+    Read at request time: OVOS_CONFIG_MAX_EXPENSIVE (concurrent expensive
+    requests, default 2), OVOS_CONFIG_MAX_QUEUE (requests allowed to wait,
+    default 8), OVOS_CONFIG_REQUEST_DEADLINE (seconds, default 0 = none) and
+    OVOS_CONFIG_LOW_PRIORITY (run expensive work niced with idle I/O priority).
+    """
+    try:
+        max_concurrent = int(os.getenv("OVOS_CONFIG_MAX_EXPENSIVE", "2"))
+        max_queue = int(os.getenv("OVOS_CONFIG_MAX_QUEUE", "8"))
+        deadline = float(os.getenv("OVOS_CONFIG_REQUEST_DEADLINE", "0"))
+    except ValueError:
+        max_concurrent, max_queue, deadline = 2, 8, 0.0
+    low_priority = os.getenv("OVOS_CONFIG_LOW_PRIORITY", "").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+    return _governor(max_concurrent, max_queue, deadline, low_priority)
+
+
+async def governed(func, *args, use_deadline: bool = True) -> Any:
+    """Run expensive blocking work under the resource governor."""
+    return await get_governor().run(func, *args, use_deadline=use_deadline)
+
+
 @lru_cache()
 def get_config_dir() -> Path:
     """Get the XDG config directory for skills."""
@@ -109,14 +647,237 @@ def get_config_dir() -> Path:
     return Path(config_folder) / base_folder / "skills"
 
 
+DEFAULT_ROOT = "default"
+
+
+@lru_cache()
+def _parse_roots(spec: str) -> Dict[str, Path]:
+    """Parse an OVOS_CONFIG_ROOTS value ("name=/path,other=/path")."""
+    roots: Dict[str, Path] = {}
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, sep, path = entry.partition("=")
+        name, path = name.strip(), path.strip()
+        if not sep or not name or not path or name != os.path.basename(name):
+            raise ValueError(f"Invalid OVOS_CONFIG_ROOTS entry: {entry!r}")
+        roots[name] = Path(os.path.expanduser(path))
+    return roots
+
+
+def get_config_roots() -> Dict[str, Path]:
+    """Named skills directories managed by this instance (multi-root mode).
+
+    OVOS_CONFIG_ROOTS lists "name=/path/to/skills" pairs, comma separated, read
+    at request time. When unset, the single get_config_dir() directory is
+    exposed as the "default" root.
+    """
+    roots = _parse_roots(os.getenv("OVOS_CONFIG_ROOTS", ""))
+    if not roots:
+        return {DEFAULT_ROOT: get_config_dir()}
+    return dict(roots)
+
+
+def config_root_problem(name: str, path: Path) -> Optional[str]:
+    """Why a configured root cannot be used, or None if it can."""
+    if not path.is_dir():
+        return f"Config root {name!r} is not a directory: {path}"
+    return None
+
+
+def config_root_problems() -> List[str]:
+    """Every problem with OVOS_CONFIG_ROOTS; checked (and logged) at startup."""
+    try:
+        roots = _parse_roots(os.getenv("OVOS_CONFIG_ROOTS", ""))
+    except ValueError as exc:
+        return [str(exc)]
+    problems = (config_root_problem(name, path) for name, path in roots.items())
+    return [problem for problem in problems if problem]
+
+
+def _config_roots_or_503() -> Dict[str, Path]:
+    try:
+        return get_config_roots()
+    except ValueError as exc:
+        # The server's configuration is wrong, not the request
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+
+
+def resolve_root(request: Request, root: Optional[str] = None) -> Path:
+    """Resolve an optional root name to its skills directory.
+
+    503 if OVOS_CONFIG_ROOTS is malformed. An unknown root is 404 in the
+    path (/api/v1/roots/{root}/...) and 400 as a ?root= query value; a root
+    whose directory is missing is 404.
+    """
+    if root is None:
+        return get_config_dir()
+    roots = _config_roots_or_503()
+    if root not in roots:
+        status_code = 404 if "root" in request.path_params else 400
+        raise HTTPException(
+            status_code=status_code, detail=f"Unknown config root: {root}"
+        )
+    problem = config_root_problem(root, roots[root])
+    if problem:
+        raise HTTPException(status_code=404, detail=problem)
+    return roots[root]
+
+
+@lru_cache(maxsize=64)
+def _real_root(config_dir: Path) -> str:
+    """realpath() of a skills directory, cached per root."""
+    return os.path.realpath(str(config_dir))
+
+
+class PatchError(ValueError):
+    """A JSON Patch document could not be applied."""
+
+
+def parse_json_pointer(pointer: str) -> List[str]:
+    """Split an RFC 6901 JSON pointer ("/a/0/b~1c") into unescaped tokens."""
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise PatchError(f"Invalid JSON pointer: {pointer!r}")
+    return [
+        token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")
+    ]
+
+
+def _container_key(container: Any, token: str, for_add: bool = False) -> Any:
+    """Map a pointer token onto a dict key or list index, PatchError if absent."""
+    if isinstance(container, dict):
+        if not for_add and token not in container:
+            raise PatchError(f"Path not found: {token!r}")
+        return token
+    if isinstance(container, list):
+        if for_add and token == "-":
+            return len(container)
+        if not token.isdigit() or (token != "0" and token.startswith("0")):
+            raise PatchError(f"Invalid array index: {token!r}")
+        index = int(token)
+        limit = len(container) + 1 if for_add else len(container)
+        if index >= limit:
+            raise PatchError(f"Array index out of range: {index}")
+        return index
+    raise PatchError(f"Cannot index into {type(container).__name__}")
+
+
+def resolve_json_pointer(document: Any, pointer: Union[str, List[str]]) -> Any:
+    """Return the value a JSON pointer refers to, PatchError if missing."""
+    tokens = parse_json_pointer(pointer) if isinstance(pointer, str) else pointer
+    node = document
+    for token in tokens:
+        node = node[_container_key(node, token)]
+    return node
+
+
+def apply_json_patch(document: Dict, operations: List[Dict]) -> Dict:
+    """Apply RFC 6902 add/remove/replace/move/copy/test operations.
+
+    Works on a deep copy; the input document is never modified and a failing
+    operation leaves no partial result behind.
+    """
+    result = copy.deepcopy(document)
+    for op in operations:
+        if not isinstance(op, dict) or not isinstance(op.get("path"), str):
+            raise PatchError(f"Invalid patch operation: {op!r}")
+        kind = op.get("op")
+        tokens = parse_json_pointer(op["path"])
+        if kind in ("add", "replace", "test") and "value" not in op:
+            raise PatchError(f"Missing value for {kind!r} operation")
+        if kind == "test":
+            if resolve_json_pointer(result, tokens) != op["value"]:
+                raise PatchError(f"Test failed at {op['path']!r}")
+            continue
+        if kind in ("move", "copy"):
+            if not isinstance(op.get("from"), str):
+                raise PatchError(f"Missing from for {kind!r} operation")
+            source = parse_json_pointer(op["from"])
+            value = copy.deepcopy(resolve_json_pointer(result, source))
+            if kind == "move":
+                if tokens[: len(source)] == source and tokens != source:
+                    raise PatchError("Cannot move a value into itself")
+                result = _remove_at(result, source)
+            result = _add_at(result, tokens, value)
+        elif kind == "add":
+            result = _add_at(result, tokens, copy.deepcopy(op["value"]))
+        elif kind == "remove":
+            result = _remove_at(result, tokens)
+        elif kind == "replace":
+            resolve_json_pointer(result, tokens)
+            result = _add_at(result, tokens, copy.deepcopy(op["value"]), True)
+        else:
+            raise PatchError(f"Unsupported patch operation: {kind!r}")
+    if not isinstance(result, dict):
+        raise PatchError("Patched settings must be a JSON object")
+    return result
+
+
+def _add_at(document: Any, tokens: List[str], value: Any, replace=False) -> Any:
+    if not tokens:
+        return value
+    parent = resolve_json_pointer(document, tokens[:-1])
+    key = _container_key(parent, tokens[-1], for_add=not replace)
+    if isinstance(parent, list) and not replace:
+        parent.insert(key, value)
+    else:
+        parent[key] = value
+    return document
+
+
+def _remove_at(document: Any, tokens: List[str]) -> Any:
+    if not tokens:
+        raise PatchError("Cannot remove the whole document")
+    parent = resolve_json_pointer(document, tokens[:-1])
+    key = _container_key(parent, tokens[-1])
+    del parent[key]
+    return document
+
+
+def diff_json_patch(old: Any, new: Any, path: str = "") -> List[Dict]:
+    """JSON Patch operations that turn `old` into `new`.
+
+    Objects are compared key by key; any other changed value (lists
+    included) is replaced whole. Values compare as JSON, so 1 != true.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        operations = [
+            {"op": "remove", "path": f"{path}/{pointer_token(key)}"}
+            for key in old
+            if key not in new
+        ]
+        for key, value in new.items():
+            child = f"{path}/{pointer_token(key)}"
+            if key in old:
+                operations.extend(diff_json_patch(old[key], value, child))
+            else:
+                operations.append({"op": "add", "path": child, "value": value})
+        return operations
+    if json.dumps(old, sort_keys=True) == json.dumps(new, sort_keys=True):
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+# json_database names its cross-process lock file after the settings file, so
+# every settings.json shares one lock (as do OVOS skills using JsonStorage).
+# Threads of this process queue on this lock first: the file lock polls, and
+# is then only ever contended by other processes.
+SETTINGS_LOCK = threading.RLock()
+
+
 class SkillSettings:
     """Wrapper class for skill settings using json_database."""
 
-    def __init__(self, skill_id: str):
+    def __init__(self, skill_id: str, config_dir: Optional[Path] = None):
         self.skill_id = skill_id
-        self.config_dir = get_config_dir()
+        self.config_dir = get_config_dir() if config_dir is None else config_dir
         self.settings_path = self._safe_settings_path(skill_id)
         self.db: JsonStorage
+        self.last_write_skipped = False
+        self._holds_lock = False
         self._init_db()
 
     def _safe_settings_path(self, skill_id: str) -> Path:
@@ -127,7 +888,7 @@ class SkillSettings:
             or skill_id != os.path.basename(skill_id)
         ):
             raise ValueError(f"Invalid skill id: {skill_id!r}")
-        root = os.path.realpath(str(self.config_dir))
+        root = _real_root(self.config_dir)
         resolved = os.path.realpath(os.path.join(root, skill_id, "settings.json"))
         if not resolved.startswith(root + os.sep):
             raise ValueError(f"Invalid skill id: {skill_id!r}")
@@ -135,22 +896,143 @@ class SkillSettings:
 
     def _init_db(self):
         """Initialize the JsonStorage database, ensuring it contains valid JSON."""
-        if not self.settings_path.parent.exists():
-            self.settings_path.parent.mkdir(parents=True, exist_ok=True)
-        try:
-            # Ensure file exists
-            self.settings_path.touch(exist_ok=True)
-            # Check if file is empty and initialize if necessary
-            if self.settings_path.stat().st_size == 0:
-                with open(self.settings_path, "w") as f:
-                    f.write("{}")
-            self.db = JsonStorage(
-                str(self.settings_path)
-            )  # JsonStorage expects string path
-        except Exception as e:
-            raise RuntimeError(
-                f"Failed to initialize settings database: {str(e)}"
-            ) from e
+        with (
+            timing.phase("read"),
+            tracing.span("settings.read", skill_id=self.skill_id) as span,
+        ):
+            try:
+                try:
+                    size = iostats.stat(self.settings_path).st_size
+                except FileNotFoundError:
+                    self.settings_path.parent.mkdir(parents=True, exist_ok=True)
+                    size = 0
+                with SETTINGS_LOCK:
+                    self.db = JsonStorage(
+                        str(self.settings_path)
+                    )  # JsonStorage expects string path
+                if size == 0:
+                    size = self._create_if_empty()
+                iostats.record(bytes_read=size)
+                span.set(bytes=size)
+                self._loaded = dict(self.db)
+                self._load_pending()
+                # Just loaded: the first read of .settings needn't hit the disk again
+                self._fresh = True
+            except Exception as e:
+                raise RuntimeError(
+                    f"Failed to initialize settings database: {str(e)}"
+                ) from e
+
+    # Documents read from or handed to this class (pending write-behind
+    # documents, .settings results, undo snapshots in the web UI) share nested
+    # values and are never modified in place; edits build new containers.
+    # That is also what lets _loaded, the document as last read or written,
+    # be a shallow copy.
+
+    def _create_if_empty(self) -> int:
+        """Write {} to a missing or empty file; return the size read.
+
+        Checked again under the lock: a file seen empty may just have been
+        truncated by a writer that is about to fill it.
+        """
+        with self.locked():
+            try:
+                size = iostats.stat(self.settings_path).st_size
+            except FileNotFoundError:
+                size = 0
+            if size == 0:
+                iostats.write_bytes(self.settings_path, b"{}")
+                return 2
+            return size
+
+    def _file_lock(self):
+        """The settings locks, unless this instance already holds them."""
+        return nullcontext() if self._holds_lock else _settings_lock(self.db.lock)
+
+    @contextmanager
+    def locked(self) -> Iterator[Dict]:
+        """Hold the settings lock for a read-modify-write of this skill.
+
+        Yields the current settings, read under the lock, so that no other
+        writer (thread, or process using json_database) can interleave
+        before the block's write. Re-entrant within one instance.
+        """
+        if self._holds_lock:
+            yield dict(self.db)
+            return
+        with _settings_lock(self.db.lock):
+            self._holds_lock = True
+            try:
+                if not self._load_pending():
+                    try:
+                        self._reload()
+                    except DatabaseNotCommitted:
+                        self.db.clear()
+                        self._loaded = {}
+                self._fresh = False
+                yield dict(self.db)
+            finally:
+                self._holds_lock = False
+
+    def _load_pending(self) -> bool:
+        """Load a pending write-behind document over the on-disk contents."""
+        pending = WRITE_BEHIND.get(str(self.settings_path))
+        if pending is None:
+            return False
+        self.db.clear()
+        self.db.update(pending)
+        self._loaded = pending
+        return True
+
+    def _persist(self) -> None:
+        """Write the current settings, now or debounced in write-behind mode.
+
+        Nothing is written when the document is unchanged (same content
+        digest as when last read or written): no file rewrite, no mtime bump
+        for running skills to react to. last_write_skipped tells callers.
+        """
+        with (
+            timing.phase("write"),
+            tracing.span("settings.write", skill_id=self.skill_id) as span,
+        ):
+            self._fresh = False
+            document = dict(self.db)
+            self.last_write_skipped = content_digest(document) == content_digest(
+                self._loaded
+            )
+            span.set(skipped=self.last_write_skipped)
+            if self.last_write_skipped:
+                return
+            self._loaded = document
+            delay = write_behind_delay()
+            span.set(write_behind=bool(delay))
+            if delay:
+                WRITE_BEHIND.stage(
+                    str(self.settings_path),
+                    document,
+                    lambda doc, path=self.settings_path, lock=self.db.lock: (
+                        _write_settings_file(path, doc, _settings_lock(lock))
+                    ),
+                    delay,
+                )
+            else:
+                _write_settings_file(self.settings_path, document, self._file_lock())
+
+    def _reload(self) -> None:
+        """JsonStorage.reload(), reading through the I/O accounting helpers."""
+        with (
+            timing.phase("read"),
+            tracing.span("settings.read", skill_id=self.skill_id) as span,
+            self._file_lock(),
+        ):
+            try:
+                raw = iostats.read_bytes(self.settings_path)
+            except FileNotFoundError as exc:
+                raise DatabaseNotCommitted from exc
+            span.set(bytes=len(raw))
+            self.db.clear()
+            self.db.update(parse_settings(raw))
+            self._loaded = dict(self.db)
 
     def get_setting(self, key: str, default: Any = None) -> Any:
         """Get a specific setting value."""
@@ -162,8 +1044,9 @@ class SkillSettings:
     def update_setting(self, key: str, value: Any) -> Dict:
         """Update a single setting."""
         try:
-            self.db[key] = value
-            self.db.store()  # Persist changes immediately
+            with self.locked():
+                self.db[key] = value
+                self._persist()  # Persist changes immediately
             return {key: value}
         except Exception as e:
             raise ValueError(f"Error updating setting {key}: {str(e)}") from e
@@ -171,29 +1054,52 @@ class SkillSettings:
     def merge_settings(self, new_settings: Dict) -> Dict:
         """Merge new settings with existing ones."""
         try:
-            self.db.merge(new_settings, merge_lists=True, skip_empty=False)
-            self.db.store()
-            return dict(self.db)
+            with self.locked() as current:
+                with (
+                    timing.phase("mutate"),
+                    tracing.span("settings.merge", skill_id=self.skill_id),
+                ):
+                    merged = merge_documents(current, new_settings)
+                self.db.clear()
+                self.db.update(merged)
+                self._persist()
+            return merged
         except Exception as e:
             raise ValueError(f"Error merging settings: {str(e)}") from e
 
     def replace_settings(self, new_settings: Dict) -> Dict:
         """Replace all settings with new values."""
         try:
-            self.db.clear()
-            # skip_empty=False: a faithful replace must keep empty values
-            # ({}, [], "") instead of silently dropping them
-            self.db.merge(new_settings, skip_empty=False)
-            self.db.store()
+            # A plain update (not merge()) keeps empty values ({}, [], "")
+            # and the caller's containers as they are, without copying
+            with self.locked():
+                self.db.clear()
+                self.db.update(new_settings)
+                self._persist()
             return dict(self.db)
         except Exception as e:
             raise ValueError(f"Error replacing settings: {str(e)}") from e
 
+    def patch_settings(self, operations: List[Dict]) -> Dict:
+        """Apply a JSON Patch (RFC 6902) to the current settings."""
+        with self.locked() as current:
+            with (
+                timing.phase("mutate"),
+                tracing.span(
+                    "settings.patch", skill_id=self.skill_id, operations=len(operations)
+                ),
+            ):
+                patched = apply_json_patch(current, operations)
+            return self.replace_settings(patched)
+
     @property
     def settings(self) -> Dict:
         """Get all current settings."""
         try:
-            self.db.reload()  # Ensure we have latest data
+            if self._fresh:
+                self._fresh = False
+            elif not self._load_pending():
+                self._reload()  # Ensure we have latest data
             return dict(self.db)
         except DatabaseNotCommitted:
             return {}  # Return empty dict for new/empty settings
@@ -201,47 +1107,388 @@ class SkillSettings:
             raise ValueError(f"Error getting settings: {str(e)}") from e
 
 
-def load_all_skills() -> List[Dict]:
-    """Load every skill directory that contains a settings.json file."""
-    skills_dir = get_config_dir()
-    if not skills_dir.exists():
-        return []
+def merge_documents(document: Dict, new_settings: Dict) -> Dict:
+    """The result of merging new_settings into document, as merge does it.
 
-    skills = []
-    for skill_dir in skills_dir.iterdir():
-        if not skill_dir.is_dir():
-            continue
+    Nested objects are merged and lists extended (skipping duplicates);
+    merge_dict() works in place, so it is given a deep copy of document.
+    """
+    merged = copy.deepcopy(document)
+    merge_dict(merged, new_settings, merge_lists=True, skip_empty=False)
+    return merged
 
-        settings_file = skill_dir / "settings.json"
-        if not settings_file.exists():
-            continue
 
+def content_digest(document: Dict) -> bytes:
+    """Digest of a settings document's content, key order included.
+
+    Compact canonical JSON, so formatting does not matter but 1 and true do.
+    """
+    encoded = json.dumps(document, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).digest()
+
+
+@contextmanager
+def _settings_lock(file_lock) -> Iterator[None]:
+    """Hold SETTINGS_LOCK and a settings file lock, timing the wait for them."""
+    with ExitStack() as stack:
+        with timing.phase("lock"), tracing.span("settings.lock"):
+            stack.enter_context(SETTINGS_LOCK)
+            stack.enter_context(file_lock)
+        yield
+
+
+@lru_cache()
+def _json_storage_lock(name: str) -> ComboLock:
+    """The cross-process lock JsonStorage takes for files called ``name``."""
+    return ComboLock(os.path.join(tempfile.gettempdir(), name + ".lock"))
+
+
+def settings_file_lock(path: Path):
+    """The locks a write of ``path`` holds, for readers outside SkillSettings."""
+    return _settings_lock(_json_storage_lock(path.name))
+
+
+def _write_settings_file(path: Path, document: Dict, lock) -> None:
+    """Serialize settings the same way JsonStorage.store() does.
+
+    ``lock`` is held for the write: _settings_lock() of the file's lock, or a
+    no-op when the caller already holds it. Once written, the change is
+    numbered for /api/v1/changes and announced on the messagebus, if
+    configured (see ovos_skill_config.bus).
+    """
+    data = json.dumps(document, indent=4, ensure_ascii=False).encode("utf-8")
+    with lock:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        iostats.write_bytes(path, data)
+        CHANGES.record_write(path)
+    bus.notify_settings_changed(path, document)
+
+
+def list_skill_ids(config_dir: Optional[Path] = None) -> List[str]:
+    """Ids of every skill directory that contains a settings.json file."""
+    skills_dir = get_config_dir() if config_dir is None else config_dir
+    with timing.phase("scan"), tracing.span("settings.scan") as span:
         try:
-            skill_settings = SkillSettings(skill_dir.name)
-            skills.append({"id": skill_dir.name, "settings": skill_settings.settings})
+            entries = list(os.scandir(skills_dir))
+        except FileNotFoundError:
+            return []
+        # DirEntry.is_dir() comes from the directory listing: one stat per skill
+        skill_ids = [
+            entry.name
+            for entry in entries
+            if entry.is_dir() and iostats.exists(Path(entry.path) / "settings.json")
+        ]
+        span.set(skills=len(skill_ids))
+        return skill_ids
+
+
+@lru_cache()
+def _open_mirror(db_path: str) -> SettingsMirror:
+    return SettingsMirror(db_path)
+
+
+def get_mirror() -> Optional[SettingsMirror]:
+    """The SQLite settings mirror, or None when it is disabled.
+
+    Enabled by pointing OVOS_CONFIG_MIRROR_DB (read at request time) at a
+    database file. The settings.json files remain the source of truth; the
+    mirror is refreshed from them before every read it serves.
+    """
+    db_path = os.getenv("OVOS_CONFIG_MIRROR_DB")
+    return _open_mirror(db_path) if db_path else None
+
+
+def sync_mirror(mirror: SettingsMirror, config_dir: Optional[Path] = None) -> str:
+    """Refresh the mirror for one skills directory and return its mirror key."""
+    root = _real_root(get_config_dir() if config_dir is None else config_dir)
+    mirror.sync(
+        root,
+        Path(root),
+        list_skill_ids(Path(root)),
+        pending=lambda path: WRITE_BEHIND.get(str(path)),
+        lock=settings_file_lock,
+    )
+    return root
+
+
+def get_snapshot_store() -> SnapshotStore:
+    """Snapshot store configured by env vars, read at request time.
+
+    OVOS_CONFIG_SNAPSHOT_DIR defaults to
+    $XDG_STATE_HOME/ovos-skill-config/snapshots; OVOS_CONFIG_SNAPSHOT_RETENTION
+    is the number of snapshots kept per skills directory (default 20), and
+    OVOS_CONFIG_SNAPSHOT_TRUST_MTIME skips re-reading files whose size and
+    mtime are unchanged.
+    """
+    base_dir = os.getenv("OVOS_CONFIG_SNAPSHOT_DIR")
+    if not base_dir:
+        state_home = os.getenv("XDG_STATE_HOME", os.path.expanduser("~/.local/state"))
+        base_dir = os.path.join(state_home, "ovos-skill-config", "snapshots")
+    try:
+        retention = int(os.getenv("OVOS_CONFIG_SNAPSHOT_RETENTION", "20"))
+    except ValueError:
+        retention = 20
+    trust_mtime = os.getenv("OVOS_CONFIG_SNAPSHOT_TRUST_MTIME", "").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+    return SnapshotStore(Path(base_dir), retention, trust_mtime)
+
+
+# A broken settings file is reported once a minute, not on every page load
+SKILL_ERRORS = logs.RateLimitedLogger(LOG, interval=60.0)
+
+
+def iter_skills(
+    skill_ids: List[str], config_dir: Optional[Path] = None
+) -> Iterator[Dict]:
+    """Load skills one at a time, skipping any that fail to load."""
+    for skill_id in skill_ids:
+        check_deadline()
+        try:
+            skill_settings = SkillSettings(skill_id, config_dir)
+            yield {"id": skill_id, "settings": skill_settings.settings}
         except Exception as e:
-            print(f"Error loading settings for {skill_dir.name}: {e}")
+            SKILL_ERRORS.log(
+                logging.WARNING,
+                skill_id,
+                "Error loading settings for %s: %s",
+                skill_id,
+                e,
+                skill_id=skill_id,
+            )
             continue
 
-    return skills
+
+def load_all_skills(config_dir: Optional[Path] = None) -> List[Dict]:
+    """Load every skill directory that contains a settings.json file."""
+    mirror = get_mirror()
+    if mirror is not None:
+        with timing.phase("read"):
+            return mirror.list_skills(sync_mirror(mirror, config_dir))
+    return list(iter_skills(list_skill_ids(config_dir), config_dir))
+
+
+def mirrored_listing(mirror: SettingsMirror, config_dir: Path) -> bytes:
+    """The skills listing as JSON, joined from the mirror's stored documents."""
+    root = sync_mirror(mirror, config_dir)
+    with timing.phase("read"):
+        # Stored documents are already compact JSON, so they are not re-parsed
+        entries = [
+            f'{{"id":{encode_value(skill_id)},"settings":{document}}}'
+            for skill_id, document in mirror.list_documents(root)
+        ]
+    return f"[{','.join(entries)}]".encode("utf-8")
+
+
+def scan_roots(roots: Dict[str, Path]) -> Dict[str, List[str]]:
+    """List the skill ids of several roots concurrently, one thread per root."""
+    if not roots:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(len(roots), 16)) as pool:
+        results = pool.map(list_skill_ids, roots.values())
+        return dict(zip(roots, results))
+
+
+# Every skill route is also reachable scoped to a named root as
+# /api/v1/roots/{root}/skills/...; unscoped routes use get_config_dir().
+
+
+@app.get("/api/v1/roots")
+async def list_roots(username: str = Depends(verify_credentials)) -> List[Dict]:
+    """List the configured config roots and the skills found in each.
+
+    A root whose directory is missing is listed with an ``error`` instead.
+    """
+    roots = _config_roots_or_503()
+    problems = {name: config_root_problem(name, path) for name, path in roots.items()}
+    scanned = scan_roots(
+        {name: path for name, path in roots.items() if not problems[name]}
+    )
+    listed = []
+    for name, path in roots.items():
+        entry = {"name": name, "path": str(path)}
+        if problems[name]:
+            entry["error"] = problems[name]
+        else:
+            entry["skills"] = sorted(scanned[name])
+        listed.append(entry)
+    return listed
 
 
 @app.get("/api/v1/skills")
-async def list_skills(username: str = Depends(verify_credentials)) -> List[Dict]:
+@app.get("/api/v1/roots/{root}/skills")
+async def list_skills(
+    config_dir: Path = Depends(resolve_root),
+    username: str = Depends(verify_credentials),
+) -> List[Dict]:
     """List all available skills with their settings."""
+    mirror = get_mirror()
+    if mirror is not None and not sort_keys_enabled():
+        content = await governed(mirrored_listing, mirror, config_dir)
+        return Response(content=content, media_type="application/json")
     return [
         {"id": skill["id"], "settings": maybe_sort_settings(skill["settings"])}
-        for skill in load_all_skills()
+        for skill in await governed(load_all_skills, config_dir)
     ]
 
 
+def _changes_since(
+    config_dir: Path, since: Optional[int], epoch: Optional[str]
+) -> Dict:
+    root = _real_root(config_dir)
+    CHANGES.scan(root)
+    # Read before the changes: anything numbered later is in the next response
+    seq = CHANGES.seq
+    changed = None
+    if since is not None and epoch in (None, CHANGES.epoch):
+        changed = CHANGES.since(root, since)
+    reset = changed is None
+    if reset:
+        numbers = CHANGES.numbers(root)
+        changed = {
+            skill_id: numbers.get(skill_id, 0)
+            for skill_id in list_skill_ids(Path(root))
+        }
+    present, deleted = [], []
+    for skill_id in sorted(changed):
+        if iostats.exists(Path(root) / skill_id / "settings.json"):
+            present.append(skill_id)
+        else:
+            deleted.append({"id": skill_id, "seq": changed[skill_id]})
+    return {
+        "epoch": CHANGES.epoch,
+        "seq": seq,
+        "reset": reset,
+        "skills": [
+            {
+                "id": skill["id"],
+                "seq": changed[skill["id"]],
+                "settings": maybe_sort_settings(skill["settings"]),
+            }
+            for skill in iter_skills(present, config_dir)
+        ],
+        "deleted": deleted,
+    }
+
+
+@app.get("/api/v1/changes")
+@app.get("/api/v1/roots/{root}/changes")
+async def list_changes(
+    since: Optional[int] = None,
+    epoch: Optional[str] = None,
+    config_dir: Path = Depends(resolve_root),
+    username: str = Depends(verify_credentials),
+) -> Dict:
+    """Skills changed since change number ``since``, with their settings.
+
+    Pass back the ``seq`` and ``epoch`` of the previous response. When the
+    response has ``"reset": true`` (no ``since``, server restarted, or too
+    far behind) it lists every skill and replaces the client's copy entirely.
+    """
+    if since is not None and since < 0:
+        raise HTTPException(status_code=400, detail="since must not be negative")
+    try:
+        return await governed(_changes_since, config_dir, since, epoch)
+    except (Overloaded, DeadlineExceeded):
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
+def _count_skills(config_dir: Path) -> int:
+    mirror = get_mirror()
+    if mirror is not None:
+        return mirror.count(sync_mirror(mirror, config_dir))
+    return len(list_skill_ids(config_dir))
+
+
+@app.get("/api/v1/skills:count")
+@app.get("/api/v1/roots/{root}/skills:count")
+async def count_skills(
+    config_dir: Path = Depends(resolve_root),
+    username: str = Depends(verify_credentials),
+) -> Dict:
+    """Number of skills with a settings.json file."""
+    try:
+        return {"count": await governed(_count_skills, config_dir)}
+    except (Overloaded, DeadlineExceeded):
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
+def _query_value(value: str) -> Any:
+    """A query string value as JSON (true, 5, "x"), else as a plain string."""
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def _query_skills(
+    config_dir: Path, path: str, tokens: List[str], expected: Any
+) -> List[Dict]:
+    mirror = get_mirror()
+    if mirror is not None:
+        return mirror.query(sync_mirror(mirror, config_dir), path, expected)
+    matches = []
+    for skill in load_all_skills(config_dir):
+        try:
+            found = resolve_json_pointer(skill["settings"], tokens)
+        except PatchError:
+            continue
+        if isinstance(found, (dict, list)):
+            # Objects and arrays match on presence only, as in the mirror
+            if expected is not ...:
+                continue
+            found = None
+        elif expected is not ... and encode_value(found) != encode_value(expected):
+            continue
+        matches.append({"id": skill["id"], "value": found})
+    return sorted(matches, key=lambda match: match["id"])
+
+
+@app.get("/api/v1/skills:query")
+@app.get("/api/v1/roots/{root}/skills:query")
+async def query_skills(
+    path: str,
+    value: Optional[str] = None,
+    config_dir: Path = Depends(resolve_root),
+    username: str = Depends(verify_credentials),
+) -> List[Dict]:
+    """Skills whose settings contain a JSON pointer, optionally equal to a value.
+
+    ``?path=/lang&value=en-us`` matches skills with ``"lang": "en-us"``;
+    ``value`` is parsed as JSON when possible, so ``value=true`` matches a
+    boolean. Without ``value`` every skill that has the path is returned.
+    """
+    try:
+        tokens = parse_json_pointer(path)
+    except PatchError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if not tokens:
+        raise HTTPException(status_code=400, detail="path must name a setting")
+    expected = ... if value is None else _query_value(value)
+    try:
+        return await governed(_query_skills, config_dir, path, tokens, expected)
+    except (Overloaded, DeadlineExceeded):
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
 @app.get("/api/v1/skills/{skill_id}")
+@app.get("/api/v1/roots/{root}/skills/{skill_id}")
 async def get_skill_settings(
-    skill_id: str, username: str = Depends(verify_credentials)
+    skill_id: str,
+    config_dir: Path = Depends(resolve_root),
+    username: str = Depends(verify_credentials),
 ) -> Dict:
     """Get settings for a specific skill. Creates empty settings if skill doesn't exist."""
     try:
-        skill_settings = SkillSettings(skill_id)
+        skill_settings = SkillSettings(skill_id, config_dir)
         return {
             "id": skill_id,
             "settings": maybe_sort_settings(skill_settings.settings),
@@ -251,25 +1498,281 @@ async def get_skill_settings(
 
 
 @app.get("/api/v1/skills/{skill_id}/settings/{key}")
+@app.get("/api/v1/roots/{root}/skills/{skill_id}/settings/{key}")
 async def get_skill_setting(
-    skill_id: str, key: str, username: str = Depends(verify_credentials)
+    skill_id: str,
+    key: str,
+    config_dir: Path = Depends(resolve_root),
+    username: str = Depends(verify_credentials),
 ) -> Dict:
     """Get a specific setting value for a skill. Creates empty settings if skill doesn't exist."""
     try:
-        skill_settings = SkillSettings(skill_id)
+        skill_settings = SkillSettings(skill_id, config_dir)
         value = skill_settings.get_setting(key)
         return {"id": skill_id, "key": key, "value": value}
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
 
+# Upper bound on (skill, path) pairs per batchGet request
+MAX_BATCH_GET_ITEMS = 1000
+
+
+def _batch_get(config_dir: Path, items: List[Tuple[str, str, List[str]]]) -> List[Dict]:
+    """Resolve (skill id, pointer) pairs, loading each skill's settings once."""
+    documents: Dict[str, Any] = {}
+    results = []
+    for skill_id, path, tokens in items:
+        if skill_id not in documents:
+            check_deadline()
+            try:
+                documents[skill_id] = SkillSettings(skill_id, config_dir).settings
+            except Exception as exc:
+                documents[skill_id] = exc
+        document = documents[skill_id]
+        result = {"id": skill_id, "path": path}
+        if isinstance(document, Exception):
+            result["error"] = str(document)
+        else:
+            try:
+                result["value"] = resolve_json_pointer(document, tokens)
+            except PatchError as exc:
+                result["error"] = str(exc)
+        results.append(result)
+    return results
+
+
+@app.post("/api/v1/settings:batchGet")
+@app.post("/api/v1/roots/{root}/settings:batchGet")
+async def batch_get_settings(
+    request: Dict,
+    config_dir: Path = Depends(resolve_root),
+    username: str = Depends(verify_credentials),
+) -> Dict:
+    """Values at JSON pointers across many skills, in one request.
+
+    Body: ``{"items": [{"id": "skill.author", "path": "/lang"}, ...]}``.
+    Results keep the request order; each has ``value``, or ``error`` when the
+    path does not exist. Every skill's settings file is read once.
+    """
+    items = request.get("items")
+    if not isinstance(items, list) or len(items) > MAX_BATCH_GET_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"items must be a list of at most {MAX_BATCH_GET_ITEMS} entries",
+        )
+    parsed = []
+    for item in items:
+        if (
+            not isinstance(item, dict)
+            or not isinstance(item.get("id"), str)
+            or not isinstance(item.get("path"), str)
+        ):
+            raise HTTPException(
+                status_code=400, detail=f"Invalid item (needs id and path): {item!r}"
+            )
+        try:
+            parsed.append((item["id"], item["path"], parse_json_pointer(item["path"])))
+        except PatchError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+    try:
+        return {"results": await governed(_batch_get, config_dir, parsed)}
+    except (Overloaded, DeadlineExceeded):
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
+def get_skill_info(skill_id: str) -> Dict[str, str]:
+    """Humanize a skill id into a display name and author.
+
+    Port of the React UI's getSkillInfo, quirks included.
+    """
+    parts = skill_id.split(".")
+    author = parts[-1] if len(parts) > 1 else "unknown"
+    name_with_prefix = ".".join(parts[:-1]) or skill_id
+    stripped = re.sub(r"^(skill-|ovos-skill-|ovos-)", "", name_with_prefix, count=1)
+    words = re.split(r"[-_]", stripped)
+    name = " ".join(word[:1].upper() + word[1:] for word in words)
+    if name_with_prefix.startswith("skill"):
+        name += " Skill"
+    return {"name": name, "author": author}
+
+
+DEFAULT_BULK_CONCURRENCY = 4
+MAX_BULK_CONCURRENCY = 16
+
+
+def _select_skill_ids(config_dir: Path, selector: Dict) -> List[str]:
+    """Skill ids matching a selector's id glob and author (all given ones)."""
+    skill_ids = sorted(list_skill_ids(config_dir))
+    if "ids" in selector:
+        skill_ids = fnmatch.filter(skill_ids, selector["ids"])
+    if "author" in selector:
+        # Same author as the web UI shows
+        skill_ids = [
+            skill_id
+            for skill_id in skill_ids
+            if get_skill_info(skill_id)["author"] == selector["author"]
+        ]
+    return skill_ids
+
+
+def _bulk_update_one(
+    config_dir: Path,
+    skill_id: str,
+    has: Optional[List[str]],
+    operation: str,
+    body: Any,
+    dry_run: bool,
+) -> Optional[Dict]:
+    """Merge into / patch one skill; None if it lacks the selector's path."""
+    check_deadline()
+    try:
+        skill = SkillSettings(skill_id, config_dir)
+        with nullcontext(skill.settings) if dry_run else skill.locked() as current:
+            if has is not None:
+                try:
+                    resolve_json_pointer(current, has)
+                except PatchError:
+                    return None
+            if operation == "patch":
+                updated = apply_json_patch(current, body)
+            else:
+                updated = merge_documents(current, body)
+            result: Dict[str, Any] = {
+                "id": skill_id,
+                "changed": content_digest(updated) != content_digest(current),
+            }
+            if dry_run:
+                result["patch"] = diff_json_patch(current, updated)
+            elif result["changed"]:
+                skill.replace_settings(updated)
+        return result
+    except (PatchError, ValueError, RuntimeError) as exc:
+        return {"id": skill_id, "changed": False, "error": str(exc)}
+
+
+def _bulk_update(
+    config_dir: Path,
+    selector: Dict,
+    has: Optional[List[str]],
+    operation: str,
+    body: Any,
+    dry_run: bool,
+    concurrency: int,
+) -> Dict:
+    skill_ids = _select_skill_ids(config_dir, selector)
+    results: List[Optional[Dict]] = []
+    if skill_ids:
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(skill_ids))) as pool:
+            # A context copy per task carries the deadline and I/O accounting
+            futures = [
+                pool.submit(
+                    contextvars.copy_context().run,
+                    _bulk_update_one,
+                    config_dir,
+                    skill_id,
+                    has,
+                    operation,
+                    body,
+                    dry_run,
+                )
+                for skill_id in skill_ids
+            ]
+            results = [future.result() for future in futures]
+    matched = [result for result in results if result is not None]
+    return {
+        "dry_run": dry_run,
+        "matched": len(matched),
+        "changed": sum(result["changed"] for result in matched),
+        "failed": sum("error" in result for result in matched),
+        "results": matched,
+    }
+
+
+@app.post("/api/v1/skills:bulkMerge")
+@app.post("/api/v1/roots/{root}/skills:bulkMerge")
+async def bulk_merge_skills(
+    request: Dict,
+    config_dir: Path = Depends(resolve_root),
+    username: str = Depends(verify_credentials),
+) -> Dict:
+    """Merge settings into (or JSON-Patch) every skill matching a selector.
+
+    Body: ``{"selector": {"ids": "ovos-skill-*", "author": "openvoiceos",
+    "has": "/lang"}, "merge": {...}}``, or ``"patch": [...]`` instead of
+    ``merge``. Selector fields are combined; at least one is required (use
+    ``"ids": "*"`` for every skill). ``"dry_run": true`` reports what would
+    change, as JSON Patches, without writing. Skills are updated
+    ``concurrency`` (default 4, at most 16) at a time.
+    """
+    selector = request.get("selector")
+    if (
+        not isinstance(selector, dict)
+        or not selector.keys() & {"ids", "author", "has"}
+        or selector.keys() - {"ids", "author", "has"}
+        or not all(isinstance(value, str) for value in selector.values())
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail="selector needs string ids, author and/or has fields",
+        )
+    try:
+        has = parse_json_pointer(selector["has"]) if "has" in selector else None
+    except PatchError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if ("merge" in request) == ("patch" in request):
+        raise HTTPException(status_code=400, detail="Give either merge or patch")
+    operation = "merge" if "merge" in request else "patch"
+    body = request[operation]
+    check_settings_depth(body)
+    if not isinstance(body, dict if operation == "merge" else list):
+        raise HTTPException(
+            status_code=400,
+            detail="merge must be an object and patch a list of operations",
+        )
+    dry_run = request.get("dry_run", False)
+    concurrency = request.get("concurrency", DEFAULT_BULK_CONCURRENCY)
+    if not isinstance(dry_run, bool) or not (
+        isinstance(concurrency, int) and 1 <= concurrency <= MAX_BULK_CONCURRENCY
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail="dry_run must be a boolean and concurrency "
+            f"an integer from 1 to {MAX_BULK_CONCURRENCY}",
+        )
+    try:
+        # A deadline may stop a dry run, never a half-applied update
+        return await governed(
+            _bulk_update,
+            config_dir,
+            selector,
+            has,
+            operation,
+            body,
+            dry_run,
+            concurrency,
+            use_deadline=dry_run,
+        )
+    except (Overloaded, DeadlineExceeded):
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
 @app.post("/api/v1/skills/{skill_id}/merge")
+@app.post("/api/v1/roots/{root}/skills/{skill_id}/merge")
 async def merge_skill_settings(
-    skill_id: str, settings: Dict, username: str = Depends(verify_credentials)
+    skill_id: str,
+    settings: Dict,
+    config_dir: Path = Depends(resolve_root),
+    username: str = Depends(verify_credentials),
 ) -> Dict:
     """Merge new settings with existing ones. Creates skill if it doesn't exist."""
+    check_settings_depth(settings)
     try:
-        skill_settings = SkillSettings(skill_id)
+        skill_settings = SkillSettings(skill_id, config_dir)
         merged = skill_settings.merge_settings(settings)
         return {"id": skill_id, "settings": merged}
     except Exception as exc:
@@ -277,50 +1780,379 @@ async def merge_skill_settings(
 
 
 @app.post("/api/v1/skills/{skill_id}")
+@app.post("/api/v1/roots/{root}/skills/{skill_id}")
 async def replace_skill_settings(
-    skill_id: str, settings: Dict, username: str = Depends(verify_credentials)
+    skill_id: str,
+    settings: Dict,
+    config_dir: Path = Depends(resolve_root),
+    username: str = Depends(verify_credentials),
 ) -> Dict:
     """Replace all settings for a skill. Creates skill if it doesn't exist."""
+    check_settings_depth(settings)
     try:
-        skill_settings = SkillSettings(skill_id)
+        skill_settings = SkillSettings(skill_id, config_dir)
         replaced = skill_settings.replace_settings(settings)
         return {"id": skill_id, "settings": replaced}
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
 
-# HTML routes (server-rendered UI) must be registered before the static mount.
-# Imported here (not at the top) because ovos_skill_config.web imports back into
-# this module for SkillSettings and friends.
-# When run as a script (python -m ovos_skill_config.main), this module loads as
-# "__main__"; register it under its canonical name so web's import binds to this
-# same module instead of re-executing it (circular-import crash otherwise).
-sys.modules.setdefault("ovos_skill_config.main", sys.modules[__name__])
-from ovos_skill_config.web import router as web_router  # noqa: E402
+@app.patch("/api/v1/skills/{skill_id}")
+@app.patch("/api/v1/roots/{root}/skills/{skill_id}")
+async def patch_skill_settings(
+    skill_id: str,
+    operations: List[Dict],
+    config_dir: Path = Depends(resolve_root),
+    username: str = Depends(verify_credentials),
+) -> Dict:
+    """Apply a JSON Patch to a skill's settings. Creates skill if it doesn't exist."""
+    check_settings_depth(operations)
+    try:
+        skill_settings = SkillSettings(skill_id, config_dir)
+        patched = skill_settings.patch_settings(operations)
+        return {"id": skill_id, "settings": patched}
+    except PatchError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
 
-app.include_router(web_router)
 
-package_dir = Path(__file__).parent
-# Define the default path relative to the package
-default_static_dir = package_dir / "static"
-# Get the static directory from env var, defaulting to the package's static dir
-static_dir_path = os.getenv("OVOS_CONFIG_STATIC_DIR", str(default_static_dir))
-# Ensure it's a Path object for consistency if needed, although StaticFiles accepts string
-static_dir = Path(static_dir_path)
+# Set by OVOS on a skill's first run; exports leave it out, imports keep it
+FIRSTRUN_KEY = "__mycroft_skill_firstrun"
 
-# Mount the static files LAST so real routes ("/", "/login", API, ...) win.
-# html=False: "/" is now a server-rendered route, not a SPA index.html.
-# Root-level files like /logo.svg and /config.json remain reachable (Docker
-# deployments volume-mount over them).
-app.mount("/", StaticFiles(directory=str(static_dir), html=False), name="static")
+IMPORT_MODES = ("replace", "merge")
 
 
-def main():
-    import uvicorn
+def _import_record(config_dir: Path, record: Dict, mode: str) -> Dict:
+    """Write one export record; errors become {"id", "error"}."""
+    if "error" in record:
+        return record
+    skill_id = record["id"]
+    try:
+        if settings_too_deep(record["settings"]):
+            raise ValueError(
+                f"settings nest more than {max_settings_depth()} levels deep"
+            )
+        skill = SkillSettings(skill_id, config_dir)
+        if mode == "merge":
+            skill.merge_settings(record["settings"])
+        else:
+            with skill.locked() as current:
+                kept = {k: current[k] for k in (FIRSTRUN_KEY,) if k in current}
+                skill.replace_settings({**kept, **record["settings"]})
+    except Exception as exc:
+        return {"id": skill_id, "error": str(exc)}
+    return {"id": skill_id, "ok": True}
+
+
+@app.post("/api/v1/skills:import")
+@app.post("/api/v1/roots/{root}/skills:import")
+async def import_skills(
+    request: Request,
+    mode: str = "replace",
+    config_dir: Path = Depends(resolve_root),
+    username: str = Depends(verify_credentials),
+) -> Dict:
+    """Import an export: NDJSON records or a JSON array of them.
+
+    Records (``{"id": ..., "settings": {...}}``) are parsed and written as
+    the body arrives, so memory use is bounded by the largest record, not
+    the whole export. ``mode=replace`` (the default) replaces each skill's
+    settings, keeping its firstrun marker; ``mode=merge`` merges into them.
+    Bad records are reported in ``errors`` and the rest still imported. A
+    record over OVOS_CONFIG_MAX_BODY_BYTES stops the import with 413,
+    listing what was imported before it; 400 if the part of it received
+    so far does not parse.
+    """
+    if mode not in IMPORT_MODES:
+        raise HTTPException(
+            status_code=400, detail=f"mode must be one of {', '.join(IMPORT_MODES)}"
+        )
+    parser = RecordParser(max_record=body_limit("/api/v1/skills"))
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    imported = 0
+    errors: List[Dict] = []
+
+    async def apply(records: List[Dict]) -> None:
+        nonlocal imported
+        for record in records:
+            result = await governed(
+                _import_record, config_dir, record, mode, use_deadline=False
+            )
+            if "error" in result:
+                errors.append(result)
+            else:
+                imported += 1
+
+    try:
+        async for chunk in request.stream():
+            await apply(parser.feed(decoder.decode(chunk)))
+        await apply(parser.feed(decoder.decode(b"", final=True)) + parser.close())
+    except (RecordTooLarge, RecordSyntaxError) as exc:
+        return JSONResponse(
+            {"detail": str(exc), "imported": imported, "errors": errors},
+            status_code=413 if isinstance(exc, RecordTooLarge) else 400,
+        )
+    except (Overloaded, DeadlineExceeded, HTTPException):
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+    return {"imported": imported, "errors": errors}
+
+
+def _create_snapshot(config_dir: Path) -> Dict:
+    WRITE_BEHIND.flush()
+    root = _real_root(config_dir)
+    return get_snapshot_store().create(
+        root, list_skill_ids(Path(root)), lock=settings_file_lock
+    )
+
+
+@app.post("/api/v1/snapshots")
+@app.post("/api/v1/roots/{root}/snapshots")
+async def create_snapshot(
+    config_dir: Path = Depends(resolve_root),
+    username: str = Depends(verify_credentials),
+) -> Dict:
+    """Snapshot every skill's settings.json; unchanged files are shared."""
+    try:
+        return await governed(_create_snapshot, config_dir)
+    except (Overloaded, DeadlineExceeded):
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
+@app.get("/api/v1/snapshots")
+@app.get("/api/v1/roots/{root}/snapshots")
+async def list_snapshots(
+    config_dir: Path = Depends(resolve_root),
+    username: str = Depends(verify_credentials),
+) -> List[Dict]:
+    """List snapshots of the skills directory, newest first."""
+    try:
+        return get_snapshot_store().list(_real_root(config_dir))
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
+@app.get("/api/v1/snapshots/{snapshot_id}")
+@app.get("/api/v1/roots/{root}/snapshots/{snapshot_id}")
+async def get_snapshot(
+    snapshot_id: str,
+    config_dir: Path = Depends(resolve_root),
+    username: str = Depends(verify_credentials),
+) -> Dict:
+    """Get a snapshot's manifest (skill ids with content hashes)."""
+    try:
+        return get_snapshot_store().get(_real_root(config_dir), snapshot_id)
+    except SnapshotNotFound as exc:
+        raise HTTPException(status_code=404, detail="Snapshot not found") from exc
+
+
+def _restore_documents(config_dir: Path, documents: Dict[str, Dict]) -> None:
+    for skill_id, document in documents.items():
+        SkillSettings(skill_id, config_dir).replace_settings(document)
+
+
+@app.post("/api/v1/snapshots/{snapshot_id}/restore")
+@app.post("/api/v1/roots/{root}/snapshots/{snapshot_id}/restore")
+async def restore_snapshot(
+    snapshot_id: str,
+    request: Optional[Dict] = None,
+    config_dir: Path = Depends(resolve_root),
+    username: str = Depends(verify_credentials),
+) -> Dict:
+    """Restore every skill in a snapshot, or only ``{"skills": [...]}``.
+
+    Skills created after the snapshot are left untouched.
+    """
+    skill_ids = (request or {}).get("skills")
+    if skill_ids is not None and not isinstance(skill_ids, list):
+        raise HTTPException(status_code=400, detail="skills must be a list")
+    try:
+        documents = get_snapshot_store().documents(
+            _real_root(config_dir), snapshot_id, skill_ids
+        )
+    except SnapshotNotFound as exc:
+        raise HTTPException(status_code=404, detail="Snapshot not found") from exc
+    try:
+        await governed(_restore_documents, config_dir, documents, use_deadline=False)
+    except Overloaded:
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+    return {"id": snapshot_id, "restored": sorted(documents)}
+
+
+@app.get("/api/v1/diagnostics/io")
+async def io_diagnostics(username: str = Depends(verify_credentials)) -> Dict:
+    """Filesystem I/O totals since startup, overall and per route."""
+    return IO_TOTALS.as_dict()
+
+
+MEMORY_SAMPLER = memstats.TracemallocSampler()
+MAX_TRACEMALLOC_TOP = 500
+MAX_TRACEMALLOC_FRAMES = 64
+
+
+def _skill_index_stats() -> Dict:
+    db_path = os.getenv("OVOS_CONFIG_MIRROR_DB")
+    if not db_path:
+        return {"enabled": False}
+    try:
+        db_bytes = os.path.getsize(db_path)
+    except OSError:
+        db_bytes = None
+    return {"enabled": True, "db_bytes": db_bytes}
+
+
+memstats.register("write_behind", WRITE_BEHIND.stats)
+memstats.register("io_totals", lambda: {"routes": len(IO_TOTALS.routes)})
+memstats.register("skill_errors", lambda: {"entries": len(SKILL_ERRORS)})
+memstats.register("skill_index", _skill_index_stats)
+memstats.register("messagebus", bus.stats)
+memstats.register("changes", lambda: {"entries": len(CHANGES), "seq": CHANGES.seq})
+memstats.register(
+    "caches",
+    lambda: {
+        func.__name__: memstats.cache_stats(func)
+        for func in (get_config_dir, _parse_roots, _real_root, _open_mirror, _governor)
+    },
+)
+
+
+@app.get("/api/v1/diagnostics/memory")
+async def memory_diagnostics(username: str = Depends(verify_credentials)) -> Dict:
+    """RSS, sizes of in-process state, and whether tracemalloc is running."""
+    return {
+        **memstats.process_stats(),
+        "structures": memstats.structures(),
+        "tracemalloc": MEMORY_SAMPLER.status(),
+    }
+
+
+@app.post("/api/v1/diagnostics/memory/tracemalloc")
+async def tracemalloc_snapshot(
+    top: int = 20,
+    diff: bool = False,
+    frames: int = 1,
+    username: str = Depends(verify_credentials),
+) -> Dict:
+    """Top allocation sites, starting tracemalloc on first use.
+
+    ``?diff=true`` ranks sites by growth since the previous snapshot.
+    ``frames`` (traceback depth) applies when tracing starts.
+    """
+    if not 1 <= top <= MAX_TRACEMALLOC_TOP:
+        raise HTTPException(
+            status_code=400, detail=f"top must be 1-{MAX_TRACEMALLOC_TOP}"
+        )
+    if not 1 <= frames <= MAX_TRACEMALLOC_FRAMES:
+        raise HTTPException(
+            status_code=400, detail=f"frames must be 1-{MAX_TRACEMALLOC_FRAMES}"
+        )
+    try:
+        return await governed(
+            MEMORY_SAMPLER.snapshot, top, diff, frames, use_deadline=False
+        )
+    except Overloaded:
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
 
-    port = os.getenv("CONFIG_PORT", "8000")
 
-    uvicorn.run(app, host="0.0.0.0", port=int(port))
+@app.delete("/api/v1/diagnostics/memory/tracemalloc")
+async def tracemalloc_stop(username: str = Depends(verify_credentials)) -> Dict:
+    """Stop tracemalloc, which slows down every allocation while it runs."""
+    MEMORY_SAMPLER.stop()
+    return MEMORY_SAMPLER.status()
+
+
+@app.post("/api/v1/fleet/push")
+async def fleet_push(
+    request: Dict, username: str = Depends(verify_credentials)
+) -> Dict:
+    """Push a merge/replace/patch for one skill to every device in an inventory.
+
+    Body: ``{"devices": [...], "skill_id": ..., "operation": "merge",
+    "settings": {...}}`` plus optional concurrency/per_host/retries/timeout.
+    ``settings`` must be an object (a list of operations for patch); 400 if
+    not, or if retries is negative or any other option not positive.
+    """
+    operation = request.get("operation", "merge")
+    skill_id = request.get("skill_id")
+    if (
+        operation not in fleet.OPERATIONS
+        or not isinstance(skill_id, str)
+        or not skill_id
+    ):
+        raise HTTPException(status_code=400, detail="Invalid skill_id or operation")
+    try:
+        devices = fleet.load_inventory(
+            {"defaults": request.get("defaults"), "devices": request.get("devices")}
+        )
+        options = {
+            key: type(default)(request[key])
+            for key, default in (
+                ("concurrency", fleet.DEFAULT_CONCURRENCY),
+                ("per_host", fleet.DEFAULT_PER_HOST),
+                ("retries", fleet.DEFAULT_RETRIES),
+                ("timeout", fleet.DEFAULT_TIMEOUT),
+            )
+            if key in request
+        }
+        fleet.check_push(operation, request.get("settings"), **options)
+    except (TypeError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    try:
+        return await fleet.push(
+            devices, skill_id, operation, request.get("settings"), **options
+        )
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
+def api_only_enabled() -> bool:
+    """Whether to serve only /status and /api/v1/* (OVOS_CONFIG_API_ONLY).
+
+    Read once at import: the web UI router, templates and static files are
+    either wired into the app or never imported.
+    """
+    return os.getenv("OVOS_CONFIG_API_ONLY", "").lower() in ("1", "true", "yes")
+
+
+def _mount_web_ui(app: FastAPI) -> None:
+    # HTML routes (server-rendered UI) must be registered before the static
+    # mount. Imported here (not at the top) because ovos_skill_config.web
+    # imports back into this module for SkillSettings and friends (see the
+    # sys.modules alias at the top for running this module as a script).
+    from fastapi.staticfiles import StaticFiles
+
+    from ovos_skill_config.web import router as web_router
+
+    app.include_router(web_router)
+
+    # Get the static directory from env var, defaulting to the package's
+    # static dir
+    default_static_dir = Path(__file__).parent / "static"
+    static_dir = Path(os.getenv("OVOS_CONFIG_STATIC_DIR", str(default_static_dir)))
+
+    # Mount the static files LAST so real routes ("/", "/login", API, ...) win.
+    # html=False: "/" is now a server-rendered route, not a SPA index.html.
+    # Root-level files like /logo.svg and /config.json remain reachable (Docker
+    # deployments volume-mount over them).
+    app.mount("/", StaticFiles(directory=str(static_dir), html=False), name="static")
+
+
+if not api_only_enabled():
+    _mount_web_ui(app)
+
+
+def main():
+    from ovos_skill_config import cli
+
+    return cli.main()
 
 
 if __name__ == "__main__":
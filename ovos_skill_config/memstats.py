@@ -0,0 +1,197 @@
+"""Process memory diagnostics: RSS, sizes of in-process state, tracemalloc.
+
+Modules holding long-lived state (undo snapshots, write-behind documents,
+caches) register a function with register() that reports its size; the
+diagnostics endpoint calls them all. Sizes from deep_sizeof() are estimates:
+shared objects are counted once, and large structures are cut off after
+MAX_OBJECTS objects (reported as ``truncated``).
+
+tracemalloc is off unless started through a TracemallocSampler, since it
+slows every allocation down. Each snapshot becomes the baseline for the
+next, so two snapshots a few hours apart show what grew in between.
+"""
+
+import gc
+import os
+import sys
+import threading
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Objects visited per deep_sizeof() call
+MAX_OBJECTS = 100000
+
+Source = Callable[[], Dict[str, Any]]
+
+_sources: Dict[str, Source] = {}
+
+
+def register(name: str, source: Source) -> None:
+    """Report ``source()`` under ``name`` in structures()."""
+    _sources[name] = source
+
+
+def structures() -> Dict[str, Dict[str, Any]]:
+    """Every registered source's report; a failing one reports its error."""
+    reports = {}
+    for name, source in sorted(_sources.items()):
+        try:
+            reports[name] = source()
+        except Exception as exc:
+            reports[name] = {"error": f"{type(exc).__name__}: {exc}"}
+    return reports
+
+
+def deep_sizeof(obj: Any, max_objects: int = MAX_OBJECTS) -> Tuple[int, bool]:
+    """Approximate bytes held by ``obj`` and its contents, and if cut off."""
+    seen = set()
+    stack = [obj]
+    size = 0
+    while stack:
+        if len(seen) >= max_objects:
+            return size, True
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            # Copies, in case another thread changes the dict meanwhile
+            stack.extend(list(item))
+            stack.extend(list(item.values()))
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+    return size, False
+
+
+def container_stats(container: Any) -> Dict[str, Any]:
+    """Entry count and estimated size of a dict, list or set."""
+    size, truncated = deep_sizeof(container)
+    stats = {"entries": len(container), "bytes": size}
+    if truncated:
+        stats["truncated"] = True
+    return stats
+
+
+def cache_stats(func: Callable) -> Dict[str, Any]:
+    """Size and hit counts of a functools.lru_cache wrapped function."""
+    info = func.cache_info()
+    return {
+        "entries": info.currsize,
+        "max_entries": info.maxsize,
+        "hits": info.hits,
+        "misses": info.misses,
+    }
+
+
+def rss_bytes() -> Optional[int]:
+    """Current resident set size, None where /proc is not available."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Highest resident set size so far, None where unsupported."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def process_stats() -> Dict[str, Any]:
+    """RSS and garbage collector counters for this process."""
+    return {
+        "rss_bytes": rss_bytes(),
+        "peak_rss_bytes": peak_rss_bytes(),
+        "threads": threading.active_count(),
+        "gc": {
+            "counts": list(gc.get_count()),
+            "collections": [s["collections"] for s in gc.get_stats()],
+            "uncollectable": len(gc.garbage),
+        },
+    }
+
+
+class TracemallocSampler:
+    """Top allocation sites from tracemalloc, optionally as a diff."""
+
+    # Allocations by tracemalloc itself and the import system are noise
+    FILTERS = (
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+
+    def status(self) -> Dict[str, Any]:
+        tracing = tracemalloc.is_tracing()
+        status: Dict[str, Any] = {
+            "tracing": tracing,
+            "has_baseline": self._baseline is not None,
+        }
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            status.update(
+                frames=tracemalloc.get_traceback_limit(),
+                traced_bytes=current,
+                peak_traced_bytes=peak,
+                overhead_bytes=tracemalloc.get_tracemalloc_memory(),
+            )
+        return status
+
+    def snapshot(self, top: int = 20, diff: bool = False, frames: int = 1) -> Dict:
+        """Take a snapshot, starting tracemalloc first if it is off.
+
+        With ``diff``, sites are ranked by growth since the previous
+        snapshot. Right after starting there is nothing to report yet:
+        only allocations made while tracing are seen.
+        """
+        with self._lock:
+            started = not tracemalloc.is_tracing()
+            if started:
+                self._baseline = None
+                tracemalloc.start(frames)
+            key = "traceback" if tracemalloc.get_traceback_limit() > 1 else "lineno"
+            snapshot = tracemalloc.take_snapshot().filter_traces(self.FILTERS)
+            baseline, self._baseline = self._baseline, snapshot
+        if diff and baseline is not None:
+            stats = snapshot.compare_to(baseline, key)
+            top_stats = [self._stat(s, s.size_diff, s.count_diff) for s in stats[:top]]
+        else:
+            stats = snapshot.statistics(key)
+            top_stats = [self._stat(s) for s in stats[:top]]
+        return {
+            "started": started,
+            "diff": diff and baseline is not None,
+            "top": top_stats,
+            **self.status(),
+        }
+
+    @staticmethod
+    def _stat(
+        stat, size_diff: Optional[int] = None, count_diff: Optional[int] = None
+    ) -> Dict:
+        frames: List[str] = [f"{f.filename}:{f.lineno}" for f in stat.traceback]
+        entry = {"site": frames[0], "size": stat.size, "count": stat.count}
+        if len(frames) > 1:
+            entry["traceback"] = frames
+        if size_diff is not None:
+            entry.update(size_diff=size_diff, count_diff=count_diff)
+        return entry
+
+    def stop(self) -> None:
+        """Stop tracing and drop the baseline."""
+        with self._lock:
+            self._baseline = None
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
@@ -0,0 +1,259 @@
+"""Optional SQLite mirror of every skill's settings for indexed queries.
+
+The settings.json files stay the source of truth. sync() re-reads only files
+whose size/mtime changed (and re-indexes only when the content hash changed),
+so keeping the mirror current costs one stat() per skill.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, Tuple
+
+from json_database.utils import uncomment_json
+
+from ovos_skill_config import iostats
+from ovos_skill_config.governor import check_deadline
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS skills (
+    root TEXT NOT NULL,
+    skill_id TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    document TEXT NOT NULL,
+    PRIMARY KEY (root, skill_id)
+);
+CREATE TABLE IF NOT EXISTS settings (
+    root TEXT NOT NULL,
+    skill_id TEXT NOT NULL,
+    path TEXT NOT NULL,
+    type TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (root, skill_id, path)
+);
+CREATE INDEX IF NOT EXISTS settings_path_value ON settings (root, path, value);
+"""
+
+# Returns a pending (not yet written) document for a settings file, if any
+PendingLookup = Callable[[Path], Optional[Dict]]
+# Returns the lock writers hold on a settings file, to read it whole
+FileLockFactory = Callable[[Path], ContextManager]
+
+
+def encode_value(value: Any) -> str:
+    """Canonical JSON text used to store and match leaf values."""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def pointer_token(key: Any) -> str:
+    """Escape a dict key or list index as one RFC 6901 JSON pointer token."""
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def flatten(document: Any, prefix: str = "") -> Iterator[Tuple[str, str, Any]]:
+    """Yield (JSON pointer, type, encoded leaf value or None) for every node."""
+    if isinstance(document, dict):
+        items = document.items()
+    elif isinstance(document, list):
+        items = enumerate(document)
+    else:
+        return
+    for key, value in items:
+        path = f"{prefix}/{pointer_token(key)}"
+        if isinstance(value, dict):
+            yield path, "object", None
+        elif isinstance(value, list):
+            yield path, "array", None
+        else:
+            yield path, _leaf_type(value), encode_value(value)
+        yield from flatten(value, path)
+
+
+def _leaf_type(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, (int, float)):
+        return "number"
+    return "string"
+
+
+def load_settings(raw: bytes) -> Optional[Dict]:
+    """Parse like JsonStorage (comment lines allowed); None if not an object."""
+    try:
+        document = json.loads(uncomment_json(raw.decode("utf-8")))
+    except (UnicodeDecodeError, ValueError):
+        return None
+    return document if isinstance(document, dict) else None
+
+
+def parse_settings(raw: bytes) -> Dict:
+    """Parse like JsonStorage: comment lines allowed, unreadable files are {}."""
+    document = load_settings(raw)
+    return {} if document is None else document
+
+
+def read_settings_file(
+    path: Path, lock: Optional[FileLockFactory] = None
+) -> Tuple[os.stat_result, bytes]:
+    """stat() and read a settings file under ``lock``, so never mid-write."""
+    with lock(path) if lock else nullcontext():
+        return iostats.stat(path), iostats.read_bytes(path)
+
+
+class SettingsMirror:
+    """SQLite copy of skill settings: documents plus flattened key paths."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        # One sync per root at a time; readers use their own connections
+        self._sync_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def sync(
+        self,
+        root: str,
+        config_dir: Path,
+        skill_ids: List[str],
+        pending: Optional[PendingLookup] = None,
+        lock: Optional[FileLockFactory] = None,
+    ) -> Dict[str, int]:
+        """Bring one root's rows up to date with its settings.json files.
+
+        Changed files are read under ``lock``. A file that does not parse to
+        an object is stored as ``{}``, as SkillSettings loads it.
+        """
+        stats = {"scanned": 0, "updated": 0, "removed": 0}
+        with self._sync_lock, self._connect() as conn:
+            known = {
+                row[0]: row[1:]
+                for row in conn.execute(
+                    "SELECT skill_id, mtime_ns, size, sha256 FROM skills WHERE root = ?",
+                    (root,),
+                )
+            }
+            for skill_id in skill_ids:
+                check_deadline()
+                stats["scanned"] += 1
+                path = config_dir / skill_id / "settings.json"
+                document = pending(path) if pending else None
+                if document is not None:
+                    raw = encode_value(document).encode("utf-8")
+                    mtime_ns, size = -1, len(raw)
+                else:
+                    try:
+                        st = iostats.stat(path)
+                    except OSError:
+                        continue
+                    previous = known.get(skill_id)
+                    if previous and previous[:2] == (st.st_mtime_ns, st.st_size):
+                        continue
+                    try:
+                        st, raw = read_settings_file(path, lock)
+                    except OSError:
+                        continue
+                    mtime_ns, size = st.st_mtime_ns, st.st_size
+                digest = hashlib.sha256(raw).hexdigest()
+                previous = known.get(skill_id)
+                if previous and previous[2] == digest:
+                    conn.execute(
+                        "UPDATE skills SET mtime_ns = ?, size = ? "
+                        "WHERE root = ? AND skill_id = ?",
+                        (mtime_ns, size, root, skill_id),
+                    )
+                    continue
+                if document is None:
+                    document = parse_settings(raw)
+                self._store(conn, root, skill_id, mtime_ns, size, digest, document)
+                stats["updated"] += 1
+            for skill_id in set(known) - set(skill_ids):
+                conn.execute(
+                    "DELETE FROM skills WHERE root = ? AND skill_id = ?",
+                    (root, skill_id),
+                )
+                conn.execute(
+                    "DELETE FROM settings WHERE root = ? AND skill_id = ?",
+                    (root, skill_id),
+                )
+                stats["removed"] += 1
+        return stats
+
+    @staticmethod
+    def _store(conn, root, skill_id, mtime_ns, size, digest, document) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO skills "
+            "(root, skill_id, mtime_ns, size, sha256, document) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (root, skill_id, mtime_ns, size, digest, encode_value(document)),
+        )
+        conn.execute(
+            "DELETE FROM settings WHERE root = ? AND skill_id = ?", (root, skill_id)
+        )
+        conn.executemany(
+            "INSERT INTO settings (root, skill_id, path, type, value) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                (root, skill_id, path, node_type, value)
+                for path, node_type, value in flatten(document)
+            ),
+        )
+
+    def list_documents(self, root: str) -> List[Tuple[str, str]]:
+        """(skill id, settings as stored JSON text) for every skill, by id."""
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT skill_id, document FROM skills WHERE root = ? "
+                "ORDER BY skill_id",
+                (root,),
+            ).fetchall()
+
+    def list_skills(self, root: str) -> List[Dict]:
+        """Every mirrored skill of a root with its settings, by id."""
+        return [
+            {"id": skill_id, "settings": json.loads(document)}
+            for skill_id, document in self.list_documents(root)
+        ]
+
+    def count(self, root: str) -> int:
+        with self._connect() as conn:
+            (count,) = conn.execute(
+                "SELECT COUNT(*) FROM skills WHERE root = ?", (root,)
+            ).fetchone()
+        return count
+
+    def query(self, root: str, path: str, value: Any = ...) -> List[Dict]:
+        """Skills that have a key path, optionally with a given leaf value.
+
+        Returns ``[{"id": ..., "value": ...}]``; containers match on presence
+        only and report ``None`` as their value.
+        """
+        sql = "SELECT skill_id, value FROM settings WHERE root = ? AND path = ?"
+        params: Tuple = (root, path)
+        if value is not ...:
+            sql += " AND value = ?"
+            params += (encode_value(value),)
+        with self._connect() as conn:
+            rows = conn.execute(sql + " ORDER BY skill_id", params).fetchall()
+        return [
+            {"id": skill_id, "value": None if raw is None else json.loads(raw)}
+            for skill_id, raw in rows
+        ]
@@ -0,0 +1,202 @@
+"""Incremental parsing of settings exports as they are received.
+
+An export is NDJSON (one ``{"id": ..., "settings": {...}}`` record per line,
+as ``ovos-skill-config-tool export`` writes it) or a JSON array of the same
+records (the web UI's export). RecordParser is fed the text piece by piece
+and returns each record as soon as it is complete, so only one record at a
+time has to be held in memory, however large the export.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+
+class RecordTooLarge(ValueError):
+    """A record is larger than the parser's limit."""
+
+
+class RecordSyntaxError(ValueError):
+    """An unfinished record over the parser's limit is already malformed."""
+
+
+# Reported for records nested past what json can decode (RecursionError)
+TOO_DEEP = "nested too deeply to parse"
+_LITERALS = ("true", "false", "null", "NaN", "Infinity", "-Infinity")
+# What can follow the digits of a number cut short, e.g. "1." or "2e-"
+_NUMBER_TAIL = re.compile(r"\.\d*|(\.\d+)?[eE][-+]?\d*")
+
+
+def syntax_error(text: str) -> Optional[str]:
+    """Why text cannot be the start of a JSON value, or None if it can be."""
+    text = text.strip()
+    try:
+        json.loads(text)
+    except RecursionError:
+        return TOO_DEEP
+    except json.JSONDecodeError as exc:
+        if exc.msg.startswith("Unterminated string"):
+            return None
+        rest = text[exc.pos :]
+        if not rest or _NUMBER_TAIL.fullmatch(rest):
+            return None
+        if any(literal.startswith(rest) for literal in _LITERALS):
+            return None
+        return str(exc)
+    return None
+
+
+def check_record(value: Any, number: int) -> Dict:
+    """The record itself if valid, else an {"error": ...} entry for it."""
+    if not isinstance(value, dict) or not isinstance(value.get("id"), str):
+        return {"error": f"record {number}: expected an object with a string id"}
+    if not isinstance(value.get("settings"), dict):
+        return {"error": f"record {number}: settings must be an object"}
+    return value
+
+
+class RecordParser:
+    """Split a streamed export into records.
+
+    feed() returns the records completed by the text given so far; close()
+    those left at the end. Malformed records come back as {"error": ...}
+    so the rest can still be imported. A record (line, or array element)
+    over ``max_record`` characters raises RecordTooLarge, once the records
+    before it have been returned; 0 means no limit. If the text buffered
+    for an unfinished record goes over the limit and already fails to
+    parse, RecordSyntaxError is raised instead, as it is for an array
+    element nested too deeply to decode.
+    """
+
+    def __init__(self, max_record: int = 0):
+        self.max_record = max_record
+        self.count = 0
+        self._buffer = ""
+        # None until the first character: "lines" (NDJSON) or "array"
+        self._format: Optional[str] = None
+        self._separator_next = False
+        self._done = False
+        self._trailing_data = False
+        self._error: Optional[ValueError] = None
+        self._decoder = json.JSONDecoder()
+
+    def feed(self, text: str) -> List[Dict]:
+        self._buffer += text
+        return self._parse(final=False)
+
+    def close(self) -> List[Dict]:
+        records = self._parse(final=True)
+        if self._format == "array" and not self._done:
+            records.append({"error": f"record {self.count + 1}: unterminated array"})
+            self._done = True
+        return records
+
+    def _parse(self, final: bool) -> List[Dict]:
+        if self._error is not None:
+            raise self._error
+        records: List[Dict] = []
+        try:
+            self._parse_into(records, final)
+        except (RecordTooLarge, RecordSyntaxError) as exc:
+            if not records:
+                raise
+            self._error = exc
+        return records
+
+    def _parse_into(self, records: List[Dict], final: bool) -> None:
+        if self._format is None:
+            stripped = self._buffer.lstrip()
+            if not stripped:
+                self._buffer = ""
+                return
+            self._format = "array" if stripped[0] == "[" else "lines"
+            self._buffer = stripped[1:] if self._format == "array" else stripped
+        if self._format == "lines":
+            self._parse_lines(records, final)
+        else:
+            self._parse_array(records, final)
+
+    def _number(self) -> int:
+        self.count += 1
+        return self.count
+
+    def _too_large(self, size: int) -> None:
+        if self.max_record and size > self.max_record:
+            raise RecordTooLarge(
+                f"record {self.count + 1}: over the size limit of {self.max_record}"
+            )
+
+    def _check_unfinished(self, text: str) -> None:
+        if self.max_record and len(text) > self.max_record:
+            error = syntax_error(text)
+            if error is not None:
+                raise RecordSyntaxError(f"record {self.count + 1}: {error}")
+            self._too_large(len(text))
+
+    def _parse_lines(self, records: List[Dict], final: bool) -> None:
+        *lines, self._buffer = self._buffer.split("\n")
+        if final:
+            lines.append(self._buffer)
+            self._buffer = ""
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                value = json.loads(line)
+            except ValueError as exc:
+                records.append({"error": f"record {self._number()}: {exc}"})
+                continue
+            except RecursionError:
+                records.append({"error": f"record {self._number()}: {TOO_DEEP}"})
+                continue
+            self._too_large(len(line))
+            records.append(check_record(value, self._number()))
+        self._check_unfinished(self._buffer)
+
+    def _parse_array(self, records: List[Dict], final: bool) -> None:
+        buffer, pos = self._buffer, 0
+        while not self._done:
+            while pos < len(buffer) and buffer[pos].isspace():
+                pos += 1
+            if pos == len(buffer):
+                break
+            char = buffer[pos]
+            if char == "]":
+                self._done = True
+                pos += 1
+                break
+            if self._separator_next:
+                if char != ",":
+                    records.append(
+                        {"error": f"record {self.count + 1}: expected , or ]"}
+                    )
+                    self._done = self._trailing_data = True
+                    break
+                self._separator_next = False
+                pos += 1
+                continue
+            try:
+                value, end = self._decoder.raw_decode(buffer, pos)
+            except RecursionError:
+                # Its end cannot be found, so neither can the records after it
+                raise RecordSyntaxError(f"record {self.count + 1}: {TOO_DEEP}")
+            except ValueError as exc:
+                if final:
+                    records.append({"error": f"record {self.count + 1}: {exc}"})
+                    self._done = True
+                break
+            if end == len(buffer) and not final and not isinstance(value, dict):
+                # A number may go on in the next piece of text
+                break
+            self._too_large(end - pos)
+            records.append(check_record(value, self._number()))
+            self._separator_next = True
+            pos = end
+        self._buffer = buffer[pos:]
+        if self._done:
+            if self._buffer.strip() and not self._trailing_data:
+                records.append({"error": "unexpected data after the array"})
+                self._trailing_data = True
+            self._buffer = ""
+        else:
+            self._check_unfinished(self._buffer)
@@ -0,0 +1,195 @@
+"""Point-in-time snapshots of a skills directory in a content-addressed store.
+
+Every settings.json is stored once per distinct content under
+``objects/<sha256[:2]>/<sha256>``; a snapshot is a small manifest mapping skill
+ids to hashes. Every file is read and hashed, so an edit is never missed.
+With ``trust_mtime``, files whose size and mtime match the previous snapshot
+of the same directory are not re-read, so an unchanged tree costs one stat()
+per skill; a same-size edit that keeps the mtime (coarse timestamps, tools
+that preserve it) is then left out, which is why that is opt-in.
+"""
+
+import hashlib
+import json
+import os
+import re
+import secrets
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ovos_skill_config import iostats
+from ovos_skill_config.mirror import (
+    FileLockFactory,
+    load_settings,
+    parse_settings,
+    read_settings_file,
+)
+
+SNAPSHOT_ID = re.compile(r"^\d{8}T\d{6}\d{6}Z-[0-9a-f]{6}$")
+
+
+class SnapshotNotFound(KeyError):
+    """No snapshot with the requested id exists for this directory."""
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{secrets.token_hex(4)}.tmp")
+    iostats.write_bytes(tmp, data)
+    os.replace(tmp, path)
+
+
+class SnapshotStore:
+    """Deduplicated snapshots of skills directories, with a retention limit."""
+
+    def __init__(self, base_dir: Path, retention: int = 20, trust_mtime: bool = False):
+        self.base_dir = Path(base_dir)
+        self.retention = max(1, retention)
+        self.trust_mtime = trust_mtime
+        self._lock = threading.Lock()
+
+    def _object_path(self, digest: str) -> Path:
+        return self.base_dir / "objects" / digest[:2] / digest
+
+    def _manifest_path(self, snapshot_id: str) -> Path:
+        return self.base_dir / "manifests" / f"{snapshot_id}.json"
+
+    def _manifests(self, config_dir: str) -> List[Dict]:
+        """Manifests of one directory, oldest first."""
+        manifest_dir = self.base_dir / "manifests"
+        if not manifest_dir.is_dir():
+            return []
+        manifests = []
+        for path in sorted(manifest_dir.glob("*.json")):
+            try:
+                manifest = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            if manifest.get("config_dir") == config_dir:
+                manifests.append(manifest)
+        return manifests
+
+    @staticmethod
+    def _summary(manifest: Dict) -> Dict:
+        return {
+            key: manifest[key] for key in ("id", "created", "config_dir", "size")
+        } | {"skills": len(manifest["skills"])}
+
+    def create(
+        self,
+        config_dir: str,
+        skill_ids: List[str],
+        lock: Optional[FileLockFactory] = None,
+    ) -> Dict:
+        """Snapshot the settings.json of every given skill in a directory.
+
+        Files are read under ``lock`` (with ``trust_mtime``, only those whose
+        size or mtime changed); one that does not parse to an object is left
+        out, so restoring never writes a truncated file back.
+        """
+        with self._lock:
+            previous = self._manifests(config_dir)
+            known = previous[-1]["skills"] if previous else {}
+            skills: Dict[str, Dict] = {}
+            new_objects = 0
+            for skill_id in sorted(skill_ids):
+                path = Path(config_dir) / skill_id / "settings.json"
+                try:
+                    st = iostats.stat(path)
+                except OSError:
+                    continue
+                entry = known.get(skill_id)
+                if (
+                    self.trust_mtime
+                    and entry
+                    and (entry["mtime_ns"], entry["size"])
+                    == (st.st_mtime_ns, st.st_size)
+                    and self._object_path(entry["sha256"]).exists()
+                ):
+                    skills[skill_id] = entry
+                    continue
+                try:
+                    st, raw = read_settings_file(path, lock)
+                except OSError:
+                    continue
+                if load_settings(raw) is None:
+                    continue
+                digest = hashlib.sha256(raw).hexdigest()
+                object_path = self._object_path(digest)
+                if not object_path.exists():
+                    _atomic_write(object_path, raw)
+                    new_objects += 1
+                skills[skill_id] = {
+                    "sha256": digest,
+                    "size": len(raw),
+                    "mtime_ns": st.st_mtime_ns,
+                }
+
+            now = time.time()
+            snapshot_id = (
+                time.strftime("%Y%m%dT%H%M%S", time.gmtime(now))
+                + f"{int(now % 1 * 1e6):06d}Z-{secrets.token_hex(3)}"
+            )
+            manifest = {
+                "id": snapshot_id,
+                "created": now,
+                "config_dir": config_dir,
+                "size": sum(entry["size"] for entry in skills.values()),
+                "skills": skills,
+            }
+            _atomic_write(
+                self._manifest_path(snapshot_id), json.dumps(manifest).encode("utf-8")
+            )
+            self._prune(previous + [manifest])
+        return self._summary(manifest) | {"new_objects": new_objects}
+
+    def _prune(self, manifests: List[Dict]) -> None:
+        """Drop manifests beyond the retention limit and orphaned objects."""
+        expired = manifests[: max(0, len(manifests) - self.retention)]
+        if not expired:
+            return
+        for manifest in expired:
+            self._manifest_path(manifest["id"]).unlink(missing_ok=True)
+        referenced = set()
+        for path in (self.base_dir / "manifests").glob("*.json"):
+            try:
+                manifest = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            referenced.update(entry["sha256"] for entry in manifest["skills"].values())
+        for manifest in expired:
+            for entry in manifest["skills"].values():
+                if entry["sha256"] not in referenced:
+                    self._object_path(entry["sha256"]).unlink(missing_ok=True)
+
+    def list(self, config_dir: str) -> List[Dict]:
+        """Summaries of a directory's snapshots, newest first."""
+        return [self._summary(m) for m in reversed(self._manifests(config_dir))]
+
+    def get(self, config_dir: str, snapshot_id: str) -> Dict:
+        """The manifest of one snapshot, SnapshotNotFound if unknown."""
+        if not SNAPSHOT_ID.match(snapshot_id):
+            raise SnapshotNotFound(snapshot_id)
+        try:
+            manifest = json.loads(self._manifest_path(snapshot_id).read_text())
+        except (OSError, ValueError) as exc:
+            raise SnapshotNotFound(snapshot_id) from exc
+        if manifest.get("config_dir") != config_dir:
+            raise SnapshotNotFound(snapshot_id)
+        return manifest
+
+    def documents(
+        self, config_dir: str, snapshot_id: str, skill_ids: Optional[List[str]] = None
+    ) -> Dict[str, Dict]:
+        """Parsed settings of every skill (or the given skills) in a snapshot."""
+        skills = self.get(config_dir, snapshot_id)["skills"]
+        if skill_ids is not None:
+            skills = {k: v for k, v in skills.items() if k in skill_ids}
+        return {
+            skill_id: parse_settings(
+                iostats.read_bytes(self._object_path(entry["sha256"]))
+            )
+            for skill_id, entry in skills.items()
+        }
@@ -0,0 +1,145 @@
+"""Per-request phase timing for Server-Timing response headers.
+
+Code marks the phases of its work with phase("read"), phase("render"), ...;
+the time spent in each is summed into the Timings of the current context,
+set per request by track(). Phases are exclusive: entering a different
+phase pauses the enclosing one, so a template that loads skills as it
+renders reports the reads under "read" and only the rest under "render".
+Re-entering the phase already running is a no-op. Work handed to other
+threads with contextvars.copy_context() is included; there it does not
+pause the phase of the thread that handed it off.
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator, List, Optional
+
+# Phase name -> description shown by browser devtools, in header order
+PHASES = {
+    "auth": "Credential/session check",
+    "scan": "Skill directory scan",
+    "lock": "Waiting for the settings lock",
+    "read": "Settings reads",
+    "mutate": "Applying the change",
+    "write": "Settings writes",
+    "render": "Template rendering",
+}
+
+
+class Timings:
+    """Seconds spent per phase for one request."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.durations: Dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+
+class _Frame:
+    """The phase running in one thread, and when it last (re)started."""
+
+    __slots__ = ("name", "started", "thread")
+
+    def __init__(self, name: str, started: float):
+        self.name = name
+        self.started = started
+        self.thread = threading.get_ident()
+
+
+_current: contextvars.ContextVar[Optional[Timings]] = contextvars.ContextVar(
+    "ovos_skill_config_timings", default=None
+)
+_active: contextvars.ContextVar[Optional[_Frame]] = contextvars.ContextVar(
+    "ovos_skill_config_timing_phase", default=None
+)
+
+
+def current() -> Optional[Timings]:
+    """The Timings being filled in this context, if any."""
+    return _current.get()
+
+
+@contextmanager
+def track() -> Iterator[Timings]:
+    """Time the phases of the work done in this block."""
+    timings = Timings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+class _Phase:
+    """Context manager that times one phase in the current thread."""
+
+    __slots__ = ("timings", "name", "frame", "outer", "token")
+
+    def __init__(self, timings: Timings, name: str, outer: Optional[_Frame]):
+        self.timings = timings
+        self.name = name
+        # A phase running in the thread that handed this work off keeps going
+        if outer is not None and outer.thread != threading.get_ident():
+            outer = None
+        self.outer = outer
+
+    def __enter__(self) -> None:
+        now = time.perf_counter()
+        if self.outer is not None:
+            self.timings.add(self.outer.name, now - self.outer.started)
+        self.frame = _Frame(self.name, now)
+        self.token = _active.set(self.frame)
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        now = time.perf_counter()
+        self.timings.add(self.name, now - self.frame.started)
+        _active.reset(self.token)
+        if self.outer is not None:
+            self.outer.started = now
+
+
+NO_PHASE = nullcontext()
+
+
+def phase(name: str):
+    """Count the time spent in this block towards ``name``.
+
+    Outside track(), and inside a phase of the same name, this returns a
+    shared no-op context manager, so it costs next to nothing when
+    Server-Timing is off.
+    """
+    timings = _current.get()
+    outer = _active.get()
+    if timings is None or (outer is not None and outer.name == name):
+        return NO_PHASE
+    return _Phase(timings, name, outer)
+
+
+def header_value(timings: Timings, total: float) -> str:
+    """Server-Timing value: each phase that ran, then the total, in ms."""
+    durations = dict(timings.durations)
+    names = [name for name in PHASES if name in durations]
+    names += sorted(name for name in durations if name not in PHASES)
+    metrics: List[str] = []
+    for name in names:
+        description = PHASES.get(name)
+        desc = f';desc="{description}"' if description else ""
+        metrics.append(f"{name}{desc};dur={durations[name] * 1000:.2f}")
+    metrics.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(metrics)
+
+
+def from_header(value: str) -> Dict[str, float]:
+    """Durations in ms back from a Server-Timing value, e.g. in tests."""
+    durations = {}
+    for metric in value.split(","):
+        name, *params = (part.strip() for part in metric.split(";"))
+        for param in params:
+            if param.startswith("dur="):
+                durations[name] = float(param[4:])
+    return durations
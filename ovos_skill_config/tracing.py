@@ -0,0 +1,347 @@
+"""Per-request tracing: spans around auth, settings I/O, edits and rendering.
+
+OVOS_CONFIG_TRACE picks where traces go and is read at request time:
+
+- unset: tracing is off. span() then returns a shared no-op context manager
+  without allocating anything.
+- ``console``: each trace is printed to stderr as an indented span tree.
+- ``file:/path/traces.jsonl``: spans are appended as JSON lines using
+  OpenTelemetry field names (trace_id, span_id, parent_span_id, ...).
+- ``otel``: spans go to the OpenTelemetry API (``pip install
+  opentelemetry-api`` and an SDK/exporter configured by the deployment).
+  Sampling and export are then up to the SDK.
+
+For the built-in exporters, OVOS_CONFIG_TRACE_SAMPLE (0.0-1.0, default 1.0)
+sets the share of requests traced. An incoming W3C ``traceparent`` header
+continues the caller's trace, and its sampled flag wins. With
+OVOS_CONFIG_TRACE_SLOW_MS set, requests that were not sampled are still
+recorded and exported if they take longer than that. This catches sporadic
+slow requests at a low sample rate.
+
+Like iostats and timing, the current trace lives in a contextvar, so work
+handed to other threads with contextvars.copy_context() gets child spans.
+"""
+
+import contextvars
+import importlib.util
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+LOG = logging.getLogger(__name__)
+
+# The trace being recorded in this context: a Trace, OTEL when spans go to
+# OpenTelemetry, or None when this request is not traced
+OTEL = object()
+_current_trace: contextvars.ContextVar[Any] = contextvars.ContextVar(
+    "ovos_skill_config_trace", default=None
+)
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "ovos_skill_config_span", default=None
+)
+
+# Spans kept per trace; a page over thousands of skills drops the rest
+MAX_SPANS = 2000
+
+TRACEPARENT = "traceparent"
+
+
+class Span:
+    """One timed operation; also its own context manager."""
+
+    __slots__ = (
+        "trace",
+        "name",
+        "span_id",
+        "parent_id",
+        "attributes",
+        "start_ns",
+        "end_ns",
+        "error",
+        "_started",
+        "_token",
+    )
+
+    def __init__(self, trace: "Trace", name: str, attributes: Dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.span_id = _new_id(8)
+        parent = _current_span.get()
+        self.parent_id = parent.span_id if parent is not None else trace.parent_id
+        self.attributes = attributes
+        self.start_ns = 0
+        self.end_ns = 0
+        self.error: Optional[str] = None
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def __enter__(self) -> "Span":
+        self.start_ns = time.time_ns()
+        self._started = time.perf_counter_ns()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.end_ns = self.start_ns + time.perf_counter_ns() - self._started
+        if exc_type is not None and self.error is None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            # Closed from another context, e.g. a streamed page abandoned by
+            # its client and closed by the garbage collector
+            pass
+        self.trace.add(self)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "name": self.name,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "status": "ERROR" if self.error else "OK",
+            **({"error": self.error} if self.error else {}),
+        }
+
+
+class Trace:
+    """The finished spans of one request."""
+
+    def __init__(self, trace_id: str, parent_id: Optional[str] = None):
+        self.trace_id = trace_id
+        self.parent_id = parent_id
+        self.spans: List[Span] = []
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            if len(self.spans) < MAX_SPANS:
+                self.spans.append(span)
+            else:
+                self.dropped += 1
+
+
+class _NoSpan:
+    """What span() returns while tracing is off."""
+
+    __slots__ = ()
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+NO_SPAN = _NoSpan()
+
+
+class _OtelSpan:
+    """Adapts an OpenTelemetry span to this module's span() interface."""
+
+    __slots__ = ("_manager", "_span")
+
+    def __init__(self, name: str, attributes: Dict[str, Any]):
+        self._manager = _otel_tracer().start_as_current_span(
+            name, attributes=_otel_attributes(attributes)
+        )
+
+    def set(self, **attributes: Any) -> None:
+        self._span.set_attributes(_otel_attributes(attributes))
+
+    def __enter__(self) -> "_OtelSpan":
+        self._span = self._manager.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._manager.__exit__(exc_type, exc, tb)
+
+
+def span(name: str, **attributes: Any):
+    """A span named ``name`` under the current one, if this request is traced.
+
+    Use as ``with tracing.span("settings.read", skill_id=...) as s:``; call
+    ``s.set(...)`` to add attributes known only later.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return NO_SPAN
+    if trace is OTEL:
+        return _OtelSpan(name, attributes)
+    return Span(trace, name, attributes)
+
+
+def _new_id(size: int) -> str:
+    return random.getrandbits(size * 8).to_bytes(size, "big").hex()
+
+
+def exporter() -> str:
+    """The configured exporter (OVOS_CONFIG_TRACE), "" when tracing is off."""
+    return os.getenv("OVOS_CONFIG_TRACE", "").strip()
+
+
+def sample_rate() -> float:
+    try:
+        return min(max(float(os.getenv("OVOS_CONFIG_TRACE_SAMPLE", "1")), 0.0), 1.0)
+    except ValueError:
+        return 1.0
+
+
+def slow_threshold_ms() -> Optional[float]:
+    try:
+        return float(os.environ["OVOS_CONFIG_TRACE_SLOW_MS"])
+    except (KeyError, ValueError):
+        return None
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    """(trace_id, parent span id, sampled) from a W3C traceparent header."""
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    version, trace_id, parent_id, flags = parts[:4]
+    try:
+        int(trace_id, 16), int(parent_id, 16)
+        sampled = bool(int(flags, 16) & 1)
+    except ValueError:
+        return None
+    if version == "ff" or trace_id == "0" * 32 or parent_id == "0" * 16:
+        return None
+    return trace_id, parent_id, sampled
+
+
+def start_trace(traceparent: Optional[str] = None) -> Optional[Tuple[Trace, bool]]:
+    """A Trace to record this request into and whether it was sampled.
+
+    None when the request is not recorded at all: not sampled and no slow
+    request threshold set.
+    """
+    parent = parse_traceparent(traceparent)
+    if parent is not None:
+        trace_id, parent_id, sampled = parent
+    else:
+        trace_id, parent_id = _new_id(16), None
+        rate = sample_rate()
+        sampled = rate >= 1.0 or random.random() < rate
+    if not sampled and slow_threshold_ms() is None:
+        return None
+    return Trace(trace_id, parent_id), sampled
+
+
+def activate(trace) -> Any:
+    """Make ``trace`` (a Trace, OTEL or None) current; returns a reset token."""
+    return _current_trace.set(trace)
+
+
+def deactivate(token) -> None:
+    _current_trace.reset(token)
+
+
+_export_lock = threading.Lock()
+
+
+def export(trace: Trace, root: Span, target: Optional[str] = None) -> None:
+    """Write a finished trace to the configured exporter."""
+    target = exporter() if target is None else target
+    if trace.dropped:
+        root.attributes["dropped_spans"] = trace.dropped
+    spans = sorted(trace.spans, key=lambda s: s.start_ns)
+    try:
+        if target == "console":
+            text = format_tree(spans)
+            with _export_lock:
+                print(text, file=sys.stderr, flush=True)
+        elif target.startswith("file:"):
+            lines = "".join(json.dumps(s.as_dict(), default=str) + "\n" for s in spans)
+            with _export_lock, open(target[5:], "a", encoding="utf-8") as f:
+                f.write(lines)
+        else:
+            LOG.warning("Unknown OVOS_CONFIG_TRACE exporter: %r", target)
+    except OSError as exc:
+        LOG.warning("Could not export trace %s: %s", trace.trace_id, exc)
+
+
+def format_tree(spans: List[Span]) -> str:
+    """Spans of one trace as an indented tree, children under parents."""
+    children: Dict[Optional[str], List[Span]] = {}
+    ids = {s.span_id for s in spans}
+    for s in spans:
+        parent = s.parent_id if s.parent_id in ids else None
+        children.setdefault(parent, []).append(s)
+    lines = []
+
+    def walk(parent: Optional[str], depth: int) -> None:
+        for s in children.get(parent, []):
+            attributes = " ".join(f"{k}={v}" for k, v in s.attributes.items())
+            error = f" ERROR {s.error}" if s.error else ""
+            lines.append(
+                f"{'  ' * depth}{s.name} {s.duration_ms:.2f}ms {attributes}{error}".rstrip()
+            )
+            walk(s.span_id, depth + 1)
+
+    if spans:
+        lines.append(f"trace {spans[0].trace.trace_id}")
+    walk(None, 1)
+    return "\n".join(lines)
+
+
+def _otel_tracer():
+    from opentelemetry import trace
+
+    return trace.get_tracer("ovos_skill_config")
+
+
+def _otel_attributes(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    """OpenTelemetry only takes str/bool/int/float (or lists of them)."""
+    return {
+        key: value if isinstance(value, (str, bool, int, float)) else str(value)
+        for key, value in attributes.items()
+        if value is not None
+    }
+
+
+def otel_installed() -> bool:
+    return importlib.util.find_spec("opentelemetry") is not None
+
+
+@contextmanager
+def otel_request(name: str, headers: Mapping[str, str], attributes: Dict[str, Any]):
+    """A server span for one request, continuing the caller's trace context.
+
+    Needs opentelemetry-api (see otel_installed()).
+    """
+    from opentelemetry import trace
+    from opentelemetry.propagate import extract
+
+    with _otel_tracer().start_as_current_span(
+        name,
+        context=extract(headers),
+        kind=trace.SpanKind.SERVER,
+        attributes=_otel_attributes(attributes),
+    ) as request_span:
+        token = activate(OTEL)
+        try:
+            yield request_span
+        finally:
+            deactivate(token)
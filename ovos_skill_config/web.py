@@ -1,28 +1,30 @@
 """Server-rendered web UI (Jinja2 + htmx) for the skill configuration tool."""
 
 import base64
-import copy
 import hashlib
 import hmac
+import itertools
 import json
 import os
-import re
 import secrets
 import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
 from urllib.parse import parse_qsl
 
 from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import RedirectResponse, Response
-from fastapi.templating import Jinja2Templates
+from fastapi.responses import RedirectResponse, Response, StreamingResponse
+from markupsafe import Markup
 
 import ovos_skill_config.main as core
+from ovos_skill_config import iostats, logs, memstats, timing, tracing
 
 router = APIRouter()
 
 AUTH_COOKIE_NAME = "ovos_config_auth"
-FIRSTRUN_KEY = "__mycroft_skill_firstrun"
+FIRSTRUN_KEY = core.FIRSTRUN_KEY
+get_skill_info = core.get_skill_info
 
 # Signing key for session cookies; regenerated at startup, so sessions do not
 # survive a restart (users just log in again). Credentials themselves are never
@@ -30,29 +32,80 @@ FIRSTRUN_KEY = "__mycroft_skill_firstrun"
 SESSION_SECRET = secrets.token_bytes(32)
 SESSION_TTL_SECONDS = 7 * 24 * 60 * 60
 
-# Per-skill single-level undo snapshots: {skill_id: settings before last change}
+# Per-skill single-level undo snapshots: {skill_id: settings before last change},
+# in edit order, for at most MAX_UNDO_SNAPSHOTS skills
 UNDO_SNAPSHOTS: Dict[str, Dict] = {}
+MAX_UNDO_SNAPSHOTS = 256
 
 _package_dir = Path(__file__).parent
-templates = Jinja2Templates(directory=str(_package_dir / "templates"))
 
 PathSegment = Union[str, int]
 
+DEFAULT_RENDER_PAGE_SIZE = 100
 
-def get_skill_info(skill_id: str) -> Dict[str, str]:
-    """Humanize a skill id into a display name and author.
 
-    Port of the React UI's getSkillInfo, quirks included.
+def render_page_size() -> int:
+    """How many children of an object/array are rendered per page.
+
+    Controlled by the OVOS_CONFIG_RENDER_PAGE_SIZE env var, read at request
+    time, so huge lists/dicts cost a bounded amount of HTML per render.
+    """
+    try:
+        size = int(os.getenv("OVOS_CONFIG_RENDER_PAGE_SIZE", ""))
+    except ValueError:
+        return DEFAULT_RENDER_PAGE_SIZE
+    return max(size, 1)
+
+
+def page_children(container: Union[Dict, List], offset: int = 0) -> Dict[str, Any]:
+    """Slice one page of (key, value) pairs out of a dict or list."""
+    size = render_page_size()
+    pairs = container.items() if isinstance(container, dict) else enumerate(container)
+    items = list(itertools.islice(pairs, offset, offset + size))
+    remaining = max(len(container) - offset - len(items), 0)
+    return {
+        "items": items,
+        "next_offset": offset + len(items) if remaining else None,
+        "remaining": remaining,
+    }
+
+
+@lru_cache(maxsize=None)
+def get_templates():
+    """The Jinja2 environment, built on first render rather than at import.
+
+    Keeps jinja2 and template compilation out of startup for processes that
+    never serve a page.
     """
-    parts = skill_id.split(".")
-    author = parts[-1] if len(parts) > 1 else "unknown"
-    name_with_prefix = ".".join(parts[:-1]) or skill_id
-    stripped = re.sub(r"^(skill-|ovos-skill-|ovos-)", "", name_with_prefix, count=1)
-    words = re.split(r"[-_]", stripped)
-    name = " ".join(word[:1].upper() + word[1:] for word in words)
-    if name_with_prefix.startswith("skill"):
-        name += " Skill"
-    return {"name": name, "author": author}
+    from fastapi.templating import Jinja2Templates
+
+    class TimedTemplates(Jinja2Templates):
+        def TemplateResponse(self, *args, **kwargs):
+            name = kwargs.get("name", args[1] if len(args) > 1 else None)
+            with timing.phase("render"), tracing.span("render", template=name):
+                return super().TemplateResponse(*args, **kwargs)
+
+    templates = TimedTemplates(directory=str(_package_dir / "templates"))
+    templates.env.globals["page_children"] = page_children
+    return templates
+
+
+def _template_stats() -> Dict[str, Any]:
+    stats = memstats.cache_stats(get_templates)
+    # Only look at compiled templates once a page has built the environment
+    if stats["entries"]:
+        stats["compiled"] = len(get_templates().env.cache or ())
+    return stats
+
+
+memstats.register(
+    "undo_snapshots",
+    lambda: {
+        **memstats.container_stats(UNDO_SNAPSHOTS),
+        "max_entries": MAX_UNDO_SNAPSHOTS,
+    },
+)
+memstats.register("templates", _template_stats)
 
 
 def sign_session(username: str, expires_at: int) -> str:
@@ -93,22 +146,27 @@ def get_web_username(request: Request) -> Optional[str]:
     routes can redirect to /login instead of triggering the browser's native
     Basic auth prompt.
     """
-    auth_header = request.headers.get("Authorization")
-    if auth_header and auth_header.startswith("Basic "):
-        try:
-            decoded = base64.b64decode(auth_header.split(" ", 1)[1]).decode("utf-8")
-            username, password = decoded.split(":", 1)
-        except Exception:
+    with timing.phase("auth"), tracing.span("auth.web"):
+        auth_header = request.headers.get("Authorization")
+        if auth_header and auth_header.startswith("Basic "):
+            try:
+                decoded = base64.b64decode(auth_header.split(" ", 1)[1]).decode("utf-8")
+                username, password = decoded.split(":", 1)
+            except Exception:
+                return None
+            correct_username = secrets.compare_digest(username, core.DEFAULT_USERNAME)
+            correct_password = secrets.compare_digest(password, core.DEFAULT_PASSWORD)
+            if correct_username and correct_password:
+                logs.set_user(username)
+                return username
             return None
-        correct_username = secrets.compare_digest(username, core.DEFAULT_USERNAME)
-        correct_password = secrets.compare_digest(password, core.DEFAULT_PASSWORD)
-        if correct_username and correct_password:
-            return username
-        return None
-    token = request.cookies.get(AUTH_COOKIE_NAME)
-    if not token:
-        return None
-    return verify_session(token)
+        token = request.cookies.get(AUTH_COOKIE_NAME)
+        if not token:
+            return None
+        username = verify_session(token)
+        if username is not None:
+            logs.set_user(username)
+        return username
 
 
 def _login_redirect() -> RedirectResponse:
@@ -120,23 +178,42 @@ async def _form_data(request: Request) -> Dict[str, str]:
 
     Starlette's request.form() requires python-multipart even for urlencoded
     bodies; HTML forms and htmx only ever send urlencoded here, so parse it
-    directly and avoid the extra dependency.
+    directly and avoid the extra dependency. BodyLimitMiddleware caps the
+    body at OVOS_CONFIG_MAX_BODY_BYTES before it is read here.
     """
     body = (await request.body()).decode("utf-8", errors="replace")
     return dict(parse_qsl(body, keep_blank_values=True))
 
 
+DEFAULT_LOGO = {"type": "text", "text": "OVOS"}
+
+# (config.json path, mtime_ns, size) -> logo; re-read only when the file changes
+_logo_cache: Dict[tuple, Dict[str, Any]] = {}
+
+
 def get_logo_config() -> Dict[str, Any]:
     """Read the logo config from the active static dir's config.json."""
     static_dir = Path(os.getenv("OVOS_CONFIG_STATIC_DIR", str(_package_dir / "static")))
+    config_path = static_dir / "config.json"
     try:
-        data = json.loads((static_dir / "config.json").read_text())
-        logo = data.get("logo")
-        if isinstance(logo, dict) and logo.get("type") in ("image", "text"):
-            return logo
-    except Exception:
-        pass
-    return {"type": "text", "text": "OVOS"}
+        st = iostats.stat(config_path)
+    except OSError:
+        return DEFAULT_LOGO
+    key = (str(config_path), st.st_mtime_ns, st.st_size)
+    if key not in _logo_cache:
+        logo = DEFAULT_LOGO
+        try:
+            data = json.loads(iostats.read_bytes(config_path))
+            if isinstance(data.get("logo"), dict) and data["logo"].get("type") in (
+                "image",
+                "text",
+            ):
+                logo = data["logo"]
+        except Exception:
+            pass
+        _logo_cache.clear()
+        _logo_cache[key] = logo
+    return _logo_cache[key]
 
 
 def _prepare_skill(skill_id: str, settings: Dict) -> Dict[str, Any]:
@@ -154,22 +231,95 @@ def _prepare_skill(skill_id: str, settings: Dict) -> Dict[str, Any]:
     }
 
 
-def _prepare_skills() -> List[Dict[str, Any]]:
-    skills = [
-        _prepare_skill(skill["id"], skill["settings"])
-        for skill in core.load_all_skills()
-    ]
-    # Non-empty skills first, each group sorted by display name
-    skills.sort(key=lambda s: (s["count"] == 0, s["name"].casefold()))
-    return skills
+def _index_order(skill_id: str) -> tuple:
+    return get_skill_info(skill_id)["name"].casefold(), skill_id
+
+
+def _iter_prepared_skills() -> Iterator[Dict[str, Any]]:
+    """Skills in index order, each loaded only when it is about to render.
+
+    Non-empty skills come first, sorted by display name (known from the id
+    alone); empty skills are small, so they are held back and follow. With
+    the SQLite mirror enabled, every skill comes from it in one query
+    instead, and no settings file is parsed.
+    """
+    skills: Iterable[Dict]
+    if core.get_mirror() is not None:
+        skills = sorted(core.load_all_skills(), key=lambda s: _index_order(s["id"]))
+    else:
+        skills = core.iter_skills(sorted(core.list_skill_ids(), key=_index_order))
+    empty = []
+    for skill in skills:
+        prepared = _prepare_skill(skill["id"], skill["settings"])
+        if prepared["count"] == 0:
+            empty.append(prepared)
+        else:
+            yield prepared
+    yield from empty
+
+
+# Emitted by templates as {{ flush }} where a streamed page should be sent
+# on to the client; rendered outside _stream_template it is undefined (empty).
+STREAM_FLUSH = Markup("<!--flush-->")
+
+# After the first {{ flush }}, output is sent on at a flush point only once
+# this much is buffered or this long has passed, so a page of many small
+# cards goes out in a few chunks (each one a trip through the worker pool)
+STREAM_BATCH_CHARS = 32 * 1024
+STREAM_BATCH_SECONDS = 0.1
+
 
+def _stream_template(name: str, context: Dict[str, Any]) -> Iterator[str]:
+    """Render a template with generate(), in chunks ending at {{ flush }} points.
 
-def _render_skill_card(request: Request, skill_id: str) -> Response:
-    skill = core.SkillSettings(skill_id)
-    return templates.TemplateResponse(
+    The first flush point always sends (the page header, before any skill is
+    read); later ones batch per STREAM_BATCH_CHARS/STREAM_BATCH_SECONDS.
+    Only the time spent inside generate() counts as rendering, not the time
+    the stream is paused between chunks.
+    """
+    buffer: List[str] = []
+    buffered = 0
+    first = True
+    with tracing.span("render", template=name, streamed=True):
+        with timing.phase("render"):
+            template = get_templates().get_template(name)
+            chunks = template.generate({**context, "flush": STREAM_FLUSH})
+        try:
+            sent_at = time.monotonic()
+            while True:
+                with timing.phase("render"):
+                    chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                if chunk != STREAM_FLUSH:
+                    buffer.append(chunk)
+                    buffered += len(chunk)
+                    continue
+                if buffer and (
+                    first
+                    or buffered >= STREAM_BATCH_CHARS
+                    or time.monotonic() - sent_at >= STREAM_BATCH_SECONDS
+                ):
+                    yield "".join(buffer)
+                    buffer, buffered, first = [], 0, False
+                    sent_at = time.monotonic()
+            if buffer:
+                yield "".join(buffer)
+        finally:
+            # Also on a client disconnect, when the stream is closed early
+            chunks.close()
+
+
+def _render_skill_card(
+    request: Request, skill_id: str, settings: Optional[Dict] = None
+) -> Response:
+    """Render one skill card, from the just-written document when given."""
+    if settings is None:
+        settings = core.SkillSettings(skill_id).settings
+    return get_templates().TemplateResponse(
         request=request,
         name="partials/skill_card.html",
-        context={"skill": _prepare_skill(skill_id, skill.settings), "open": True},
+        context={"skill": _prepare_skill(skill_id, settings), "open": True},
     )
 
 
@@ -225,58 +375,103 @@ def _parse_scalar(value_type: str, raw: str) -> Any:
     return raw
 
 
-def _mutate_and_persist(skill_id: str, mutate) -> None:
-    """Snapshot current settings, apply a mutation, and persist the result."""
-    skill = core.SkillSettings(skill_id)
-    current = skill.settings
-    working = copy.deepcopy(current)
-    mutate(working)
-    UNDO_SNAPSHOTS[skill_id] = copy.deepcopy(current)
-    skill.replace_settings(working)
+def _mutate_and_persist(skill_id: str, mutate) -> Dict:
+    """Apply a mutation, persist the result and keep the old document for undo.
+
+    mutate() returns a new document that shares every untouched subtree with
+    the current one (see _update_in), so an edit copies only the containers
+    along its path and the previous document becomes the undo snapshot as is.
+    Neither document is modified in place afterwards.
+    """
+    with tracing.span("web.mutate", skill_id=skill_id):
+        skill = core.SkillSettings(skill_id)
+        with skill.locked() as current:
+            with timing.phase("mutate"):
+                updated = mutate(current)
+            skill.replace_settings(updated)
+        # A no-op edit (same value re-saved) must not replace the undo snapshot
+        if not skill.last_write_skipped:
+            _remember_undo(skill_id, current)
+        return updated
+
+
+def _remember_undo(skill_id: str, document: Dict) -> None:
+    """Keep a skill's undo snapshot, dropping the least recently edited skill's
+    beyond MAX_UNDO_SNAPSHOTS so memory stays bounded however many skills are
+    edited."""
+    UNDO_SNAPSHOTS.pop(skill_id, None)
+    UNDO_SNAPSHOTS[skill_id] = document
+    while len(UNDO_SNAPSHOTS) > MAX_UNDO_SNAPSHOTS:
+        del UNDO_SNAPSHOTS[next(iter(UNDO_SNAPSHOTS))]
+
+
+def _update_in(node: Any, path: List[PathSegment], update) -> Any:
+    """Copy the containers along path and apply update() to the last one.
+
+    Returns the new root; siblings of the path are shared, not copied.
+    """
+    if not isinstance(node, (dict, list)):
+        raise HTTPException(status_code=400, detail="Invalid setting path")
+    copied = dict(node) if isinstance(node, dict) else list(node)
+    if path:
+        child = _walk(node, path[:1])
+        copied[path[0]] = _update_in(child, path[1:], update)
+    else:
+        update(copied)
+    return copied
 
 
-def _set_at_path(document: Dict, path: List[PathSegment], value: Any) -> None:
+def _set_at_path(document: Dict, path: List[PathSegment], value: Any) -> Dict:
     if not path:
         raise HTTPException(status_code=400, detail="Invalid setting path")
-    parent = _walk(document, path[:-1])
     final = path[-1]
-    if isinstance(parent, dict) and isinstance(final, str):
-        parent[final] = value
-    elif (
-        isinstance(parent, list) and isinstance(final, int) and 0 <= final < len(parent)
-    ):
-        parent[final] = value
-    else:
-        raise HTTPException(status_code=400, detail="Invalid setting path")
 
+    def update(parent):
+        if isinstance(parent, dict) and isinstance(final, str):
+            parent[final] = value
+        elif (
+            isinstance(parent, list)
+            and isinstance(final, int)
+            and 0 <= final < len(parent)
+        ):
+            parent[final] = value
+        else:
+            raise HTTPException(status_code=400, detail="Invalid setting path")
+
+    return _update_in(document, path[:-1], update)
 
-def _delete_at_path(document: Dict, path: List[PathSegment]) -> None:
+
+def _delete_at_path(document: Dict, path: List[PathSegment]) -> Dict:
     if not path:
         raise HTTPException(status_code=400, detail="Invalid setting path")
-    parent = _walk(document, path[:-1])
     final = path[-1]
-    if isinstance(parent, dict) and isinstance(final, str) and final in parent:
-        del parent[final]
-    elif (
-        isinstance(parent, list) and isinstance(final, int) and 0 <= final < len(parent)
-    ):
-        parent.pop(final)
-    else:
-        raise HTTPException(status_code=400, detail="Invalid setting path")
+
+    def update(parent):
+        if isinstance(parent, dict) and isinstance(final, str) and final in parent:
+            del parent[final]
+        elif (
+            isinstance(parent, list)
+            and isinstance(final, int)
+            and 0 <= final < len(parent)
+        ):
+            parent.pop(final)
+        else:
+            raise HTTPException(status_code=400, detail="Invalid setting path")
+
+    return _update_in(document, path[:-1], update)
 
 
 def _add_entry(
     document: Dict, container_path: List[PathSegment], key: str, value: Any
-) -> None:
+) -> Dict:
     container = _walk(document, container_path)
     if isinstance(container, dict):
         if not key:
             raise HTTPException(status_code=400, detail="Field key cannot be empty")
-        container[key] = value
-    elif isinstance(container, list):
-        container.append(value)
-    else:
-        raise HTTPException(status_code=400, detail="Cannot add entry to target")
+        return _update_in(document, container_path, lambda c: c.update({key: value}))
+    if isinstance(container, list):
+        return _update_in(document, container_path, lambda c: c.append(value))
+    raise HTTPException(status_code=400, detail="Cannot add entry to target")
 
 
 # --- Auth pages ---
@@ -286,7 +481,7 @@ def _add_entry(
 async def login_page(request: Request):
     if get_web_username(request):
         return RedirectResponse(url="/", status_code=303)
-    return templates.TemplateResponse(
+    return get_templates().TemplateResponse(
         request=request,
         name="login.html",
         context={"logo": get_logo_config(), "error": None},
@@ -301,7 +496,7 @@ async def login_submit(request: Request):
     correct_username = secrets.compare_digest(username, core.DEFAULT_USERNAME)
     correct_password = secrets.compare_digest(password, core.DEFAULT_PASSWORD)
     if not (correct_username and correct_password):
-        return templates.TemplateResponse(
+        return get_templates().TemplateResponse(
             request=request,
             name="login.html",
             context={
@@ -337,15 +532,20 @@ async def index(request: Request):
     username = get_web_username(request)
     if username is None:
         return _login_redirect()
-    return templates.TemplateResponse(
-        request=request,
-        name="index.html",
-        context={
+    # Streamed: the header goes out before any skill is read, then one card
+    # per skill as it loads, so nothing holds every skill's settings at once
+    chunks = _stream_template(
+        "index.html",
+        {
+            "request": request,
             "logo": get_logo_config(),
             "username": username,
-            "skills": _prepare_skills(),
+            "skills": _iter_prepared_skills(),
         },
     )
+    return StreamingResponse(
+        core.get_governor().stream(chunks), media_type="text/html; charset=utf-8"
+    )
 
 
 @router.get("/export")
@@ -359,11 +559,13 @@ async def export_settings(request: Request):
                 {k: v for k, v in skill["settings"].items() if k != FIRSTRUN_KEY}
             ),
         }
-        for skill in core.load_all_skills()
+        for skill in await core.governed(core.load_all_skills)
     ]
     skills.sort(key=lambda s: get_skill_info(s["id"])["name"].casefold())
+    with timing.phase("render"):
+        content = json.dumps(skills, indent=2)
     return Response(
-        content=json.dumps(skills, indent=2),
+        content=content,
         media_type="application/json",
         headers={"Content-Disposition": 'attachment; filename="skill-settings.json"'},
     )
@@ -372,6 +574,28 @@ async def export_settings(request: Request):
 # --- htmx mutation endpoints ---
 
 
+@router.get("/web/skills/{skill_id}/node")
+async def web_node_page(skill_id: str, request: Request, path: str, offset: int = 0):
+    """Render the next page of children of a large object/array."""
+    if get_web_username(request) is None:
+        return _login_redirect()
+    node_path = _parse_path(path)
+    skill = _prepare_skill(skill_id, core.SkillSettings(skill_id).settings)
+    value = _walk(skill["settings"], node_path)
+    if not isinstance(value, (dict, list)) or offset < 0:
+        raise HTTPException(status_code=400, detail="Invalid setting path")
+    return get_templates().TemplateResponse(
+        request=request,
+        name="partials/node_page.html",
+        context={
+            "skill_id": skill_id,
+            "value": value,
+            "path": node_path,
+            "offset": offset,
+        },
+    )
+
+
 @router.post("/web/skills/{skill_id}/set")
 async def web_set_setting(skill_id: str, request: Request):
     if get_web_username(request) is None:
@@ -379,8 +603,8 @@ async def web_set_setting(skill_id: str, request: Request):
     form = await _form_data(request)
     path = _parse_path(str(form.get("path", "")))
     value = _parse_scalar(str(form.get("type", "string")), str(form.get("value", "")))
-    _mutate_and_persist(skill_id, lambda doc: _set_at_path(doc, path, value))
-    return _render_skill_card(request, skill_id)
+    updated = _mutate_and_persist(skill_id, lambda doc: _set_at_path(doc, path, value))
+    return _render_skill_card(request, skill_id, updated)
 
 
 @router.post("/web/skills/{skill_id}/add")
@@ -391,10 +615,10 @@ async def web_add_entry(skill_id: str, request: Request):
     container_path = _parse_path(str(form.get("container_path", "")))
     key = str(form.get("key", "")).strip()
     value = _parse_scalar(str(form.get("type", "string")), str(form.get("value", "")))
-    _mutate_and_persist(
+    updated = _mutate_and_persist(
         skill_id, lambda doc: _add_entry(doc, container_path, key, value)
     )
-    return _render_skill_card(request, skill_id)
+    return _render_skill_card(request, skill_id, updated)
 
 
 @router.post("/web/skills/{skill_id}/delete")
@@ -403,8 +627,8 @@ async def web_delete_setting(skill_id: str, request: Request):
         return _login_redirect()
     form = await _form_data(request)
     path = _parse_path(str(form.get("path", "")))
-    _mutate_and_persist(skill_id, lambda doc: _delete_at_path(doc, path))
-    return _render_skill_card(request, skill_id)
+    updated = _mutate_and_persist(skill_id, lambda doc: _delete_at_path(doc, path))
+    return _render_skill_card(request, skill_id, updated)
 
 
 @router.post("/web/skills/{skill_id}/undo")
@@ -415,4 +639,4 @@ async def web_undo(skill_id: str, request: Request):
     if snapshot is None:
         raise HTTPException(status_code=400, detail="Nothing to undo")
     core.SkillSettings(skill_id).replace_settings(snapshot)
-    return _render_skill_card(request, skill_id)
+    return _render_skill_card(request, skill_id, snapshot)
@@ -0,0 +1,109 @@
+"""Write-behind buffer that coalesces bursts of settings writes into one."""
+
+import logging
+import threading
+from typing import Callable, Dict, Optional
+
+LOG = logging.getLogger(__name__)
+
+Writer = Callable[[Dict], None]
+
+# A failed write is retried after 1s, then 2s, 4s... up to a minute
+RETRY_DELAY = 1.0
+MAX_RETRY_DELAY = 60.0
+
+
+class WriteBehindBuffer:
+    """Pending settings documents, flushed to disk after a debounce window.
+
+    Each staged document replaces any pending one for the same path and
+    restarts that path's timer, so a burst of edits costs a single write.
+    A document stays visible through get() until it is on disk, and writes
+    for one path are serialized so an older document never lands last. A
+    write that fails is logged and retried with exponential backoff.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Dict] = {}
+        self._writers: Dict[str, Writer] = {}
+        self._timers: Dict[str, threading.Timer] = {}
+        self._path_locks: Dict[str, threading.Lock] = {}
+        self._failures: Dict[str, int] = {}
+
+    def get(self, path: str) -> Optional[Dict]:
+        """The pending (not yet flushed) document for a path, if any."""
+        with self._lock:
+            return self._pending.get(path)
+
+    def stage(self, path: str, document: Dict, writer: Writer, delay: float) -> None:
+        """Hold a document for a path and (re)start its flush timer."""
+        with self._lock:
+            self._pending[path] = document
+            self._writers[path] = writer
+            self._path_locks.setdefault(path, threading.Lock())
+            self._arm(path, delay)
+
+    def _arm(self, path: str, delay: float) -> None:
+        timer = self._timers.pop(path, None)
+        if timer is not None:
+            timer.cancel()
+        timer = threading.Timer(delay, self.flush, args=(path,))
+        timer.daemon = True
+        self._timers[path] = timer
+        timer.start()
+
+    def flush(self, path: Optional[str] = None) -> None:
+        """Write one pending path (or all of them) to disk now."""
+        with self._lock:
+            paths = [path] if path is not None else list(self._pending)
+        for pending_path in paths:
+            self._flush_one(pending_path)
+
+    def _flush_one(self, path: str) -> None:
+        with self._lock:
+            path_lock = self._path_locks.get(path)
+        if path_lock is None:
+            return
+        with path_lock:
+            with self._lock:
+                document = self._pending.get(path)
+                writer = self._writers.get(path)
+                timer = self._timers.get(path)
+                if timer is not None and timer is not threading.current_thread():
+                    timer.cancel()
+                    del self._timers[path]
+            if document is None or writer is None:
+                return
+            try:
+                writer(document)
+            except Exception:
+                with self._lock:
+                    failures = self._failures.get(path, 0) + 1
+                    self._failures[path] = failures
+                    delay = min(RETRY_DELAY * 2 ** (failures - 1), MAX_RETRY_DELAY)
+                    # A newer document staged meanwhile has its own timer
+                    if self._pending.get(path) is document:
+                        self._arm(path, delay)
+                LOG.exception("Write-behind of %s failed, retrying in %gs", path, delay)
+                return
+            with self._lock:
+                self._failures.pop(path, None)
+                # A newer document staged during the write stays pending
+                if self._pending.get(path) is document:
+                    del self._pending[path]
+                    del self._writers[path]
+                    self._timers.pop(path, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Pending documents, armed timers and per-path locks held."""
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "timers": len(self._timers),
+                "path_locks": len(self._path_locks),
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
@@ -0,0 +1,31 @@
+"""Fixtures shared by the test modules."""
+
+from unittest.mock import patch
+
+import pytest
+
+from ovos_skill_config.main import app, verify_credentials
+
+
+@pytest.fixture
+def mock_config_dir(tmp_path):
+    """Create a temporary config directory for testing."""
+    with patch("ovos_skill_config.main.get_config_dir", return_value=tmp_path):
+        yield tmp_path
+
+
+@pytest.fixture
+def sample_skill(mock_config_dir):
+    """A single skill, ``a.b``, with settings ``{"x": 1}``."""
+    (mock_config_dir / "a.b").mkdir()
+    (mock_config_dir / "a.b" / "settings.json").write_text('{"x": 1}')
+    return "a.b"
+
+
+@pytest.fixture
+def real_auth():
+    """Use real Basic auth even if another test module overrides it."""
+    override = app.dependency_overrides.pop(verify_credentials, None)
+    yield
+    if override is not None:
+        app.dependency_overrides[verify_credentials] = override
@@ -0,0 +1,296 @@
+"""Tests for messagebus notifications, against a stand-in websocket server."""
+
+import base64
+import hashlib
+import json
+import socket
+import struct
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ovos_skill_config import bus
+from ovos_skill_config.main import (
+    DEFAULT_PASSWORD,
+    DEFAULT_USERNAME,
+    WRITE_BEHIND,
+    app,
+)
+
+AUTH = (DEFAULT_USERNAME, DEFAULT_PASSWORD)
+pytestmark = pytest.mark.usefixtures("sample_skill")
+
+# RFC 6455 handshake GUID and the opcodes the stand-in bus handles
+GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+OP_TEXT, OP_CLOSE, OP_PING, OP_PONG = 0x1, 0x8, 0x9, 0xA
+
+
+def recv_exact(conn, size):
+    data = b""
+    while len(data) < size:
+        chunk = conn.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("client went away")
+        data += chunk
+    return data
+
+
+def recv_frame(conn):
+    """Opcode and unmasked payload of the next (client, so masked) frame."""
+    first, second = recv_exact(conn, 2)
+    length = second & 0x7F
+    if length == 126:
+        (length,) = struct.unpack("!H", recv_exact(conn, 2))
+    elif length == 127:
+        (length,) = struct.unpack("!Q", recv_exact(conn, 8))
+    mask = recv_exact(conn, 4)
+    payload = recv_exact(conn, length)
+    return first & 0x0F, bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+
+
+class StandInBus:
+    """A tiny websocket server recording the messages clients send."""
+
+    def __init__(self, port: int = 0):
+        self.server = socket.create_server(("127.0.0.1", port))
+        self.port = self.server.getsockname()[1]
+        self.url = f"ws://127.0.0.1:{self.port}/core"
+        self.messages = []
+        self.paths = []
+        self.pongs = []
+        self.connections = []
+        self._received = threading.Condition()
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                return
+            self.connections.append(conn)
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        try:
+            request = b""
+            while b"\r\n\r\n" not in request:
+                request += conn.recv(4096)
+            lines = request.decode().split("\r\n")
+            self.paths.append(lines[0].split()[1])
+            key = next(
+                line.split(":", 1)[1].strip()
+                for line in lines
+                if line.lower().startswith("sec-websocket-key")
+            )
+            accept = base64.b64encode(
+                hashlib.sha1((key + GUID).encode()).digest()
+            ).decode()
+            conn.sendall(
+                (
+                    "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+                    f"Connection: Upgrade\r\nSec-WebSocket-Accept: {accept}\r\n\r\n"
+                ).encode()
+            )
+            while True:
+                opcode, payload = recv_frame(conn)
+                with self._received:
+                    if opcode == OP_TEXT:
+                        self.messages.append(json.loads(payload))
+                    elif opcode == OP_PONG:
+                        self.pongs.append(payload)
+                    elif opcode == OP_CLOSE:
+                        return
+                    self._received.notify_all()
+        except (OSError, StopIteration):
+            pass
+        finally:
+            conn.close()
+
+    def broadcast(self, opcode: int, payload: bytes):
+        """Send an unmasked frame, as servers do, to every client."""
+        frame = struct.pack("!BB", 0x80 | opcode, len(payload)) + payload
+        for conn in list(self.connections):
+            try:
+                conn.sendall(frame)
+            except OSError:
+                pass
+
+    def drop_clients(self):
+        for conn in self.connections:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            conn.close()
+        self.connections.clear()
+
+    def wait_for(self, predicate, timeout: float = 5.0):
+        with self._received:
+            assert self._received.wait_for(predicate, timeout), self.messages
+
+    def close(self):
+        self.server.close()
+        self.drop_clients()
+
+
+@pytest.fixture
+def stand_in():
+    server = StandInBus()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def notifier(stand_in):
+    notifier = bus.BusNotifier(stand_in.url, coalesce=0.05)
+    yield notifier
+    notifier.close()
+
+
+@pytest.fixture
+def bus_env(stand_in, monkeypatch):
+    monkeypatch.setenv("OVOS_CONFIG_BUS_URL", stand_in.url)
+    monkeypatch.setenv("OVOS_CONFIG_BUS_COALESCE_MS", "50")
+    yield stand_in
+    bus.close()
+
+
+class TestBusNotifier:
+    def test_burst_coalesced_per_file(self, stand_in, notifier):
+        for n in range(5):
+            notifier.notify("/s/a.b/settings.json", {"skill_id": "a.b", "n": n})
+        notifier.notify("/s/c.d/settings.json", {"skill_id": "c.d", "n": 0})
+        stand_in.wait_for(lambda: len(stand_in.messages) == 2)
+        time.sleep(0.1)
+        assert [(m["data"]["skill_id"], m["data"]["n"]) for m in stand_in.messages] == [
+            ("a.b", 4),
+            ("c.d", 0),
+        ]
+        message = stand_in.messages[0]
+        assert message["type"] == bus.DEFAULT_MESSAGE_TYPE
+        assert message["context"]["source"] == bus.MESSAGE_SOURCE
+
+    def test_connection_is_reused(self, stand_in, notifier):
+        notifier.notify("a", {"n": 1})
+        stand_in.wait_for(lambda: len(stand_in.messages) == 1)
+        notifier.notify("a", {"n": 2})
+        stand_in.wait_for(lambda: len(stand_in.messages) == 2)
+        assert notifier.connections == 1
+        # Counted once send returns, which may be after the server has it
+        deadline = time.monotonic() + 5
+        while notifier.stats()["sent"] < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert notifier.stats()["sent"] == 2
+
+    def test_incoming_traffic_discarded_and_pings_answered(self, stand_in, notifier):
+        notifier.notify("a", {"n": 1})
+        stand_in.wait_for(lambda: len(stand_in.messages) == 1)
+        stand_in.broadcast(OP_TEXT, b'{"type": "speak"}')
+        stand_in.broadcast(OP_PING, b"hi")
+        stand_in.wait_for(lambda: stand_in.pongs == [b"hi"])
+        assert notifier.connected
+
+    def test_reconnects_after_drop(self, stand_in, notifier):
+        notifier.notify("a", {"n": 1})
+        stand_in.wait_for(lambda: len(stand_in.messages) == 1)
+        stand_in.drop_clients()
+        # The reader notices the drop; the next change reconnects
+        deadline = time.monotonic() + 5
+        while notifier.connected and time.monotonic() < deadline:
+            time.sleep(0.01)
+        notifier.notify("a", {"n": 2})
+        stand_in.wait_for(lambda: len(stand_in.messages) == 2)
+        assert notifier.connections == 2
+
+    def test_backoff_until_bus_starts(self, monkeypatch):
+        probe = socket.create_server(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+        probe.close()
+        monkeypatch.setattr(bus.BusNotifier, "RECONNECT_MIN", 0.05)
+        notifier = bus.BusNotifier(f"ws://127.0.0.1:{port}/core", coalesce=0.01)
+        try:
+            notifier.notify("a", {"n": 1})
+            time.sleep(0.3)
+            assert (notifier.sent, notifier.connections) == (0, 0)
+            notifier.notify("a", {"n": 2})
+            server = StandInBus(port)
+            try:
+                server.wait_for(lambda: server.messages)
+                time.sleep(0.1)
+                assert [m["data"] for m in server.messages] == [{"n": 2}]
+            finally:
+                server.close()
+        finally:
+            notifier.close()
+
+    def test_close_sends_pending(self, stand_in):
+        notifier = bus.BusNotifier(stand_in.url, coalesce=10.0)
+        notifier.notify("a", {"n": 1})
+        notifier.close()
+        stand_in.wait_for(lambda: len(stand_in.messages) == 1)
+
+    def test_pending_bounded(self, monkeypatch):
+        monkeypatch.setattr(bus.BusNotifier, "MAX_PENDING", 2)
+        notifier = bus.BusNotifier("ws://127.0.0.1:9/core", coalesce=60.0)
+        try:
+            for key in "abc":
+                notifier.notify(key, {})
+            assert (notifier.stats()["pending"], notifier.dropped) == (2, 1)
+        finally:
+            notifier.close(timeout=0)
+
+
+class TestWriteNotifications:
+    def test_off_without_url(self, monkeypatch):
+        monkeypatch.delenv("OVOS_CONFIG_BUS_URL", raising=False)
+        assert bus.get_notifier() is None
+
+    def test_off_without_websocket_client(self, bus_env, monkeypatch, caplog):
+        def missing():
+            raise RuntimeError("websocket-client is not installed")
+
+        monkeypatch.setattr(bus, "_require_websocket", missing)
+        monkeypatch.setattr(bus, "_warned_unavailable", False)
+        assert bus.get_notifier() is None
+        assert bus.get_notifier() is None
+        assert caplog.text.count("websocket-client is not installed") == 1
+
+    def test_api_write_announced(self, mock_config_dir, bus_env):
+        client = TestClient(app)
+        response = client.post("/api/v1/skills/a.b/merge", json={"y": 2}, auth=AUTH)
+        assert response.status_code == 200
+        bus_env.wait_for(lambda: bus_env.messages)
+        (message,) = bus_env.messages
+        assert message["type"] == "mycroft.skills.settings.changed"
+        assert message["data"] == {"a.b": {"x": 1, "y": 2}}
+        # An unchanged document is not rewritten, so not announced either
+        client.post("/api/v1/skills/a.b/merge", json={"y": 2}, auth=AUTH)
+        time.sleep(0.2)
+        assert len(bus_env.messages) == 1
+
+    def test_write_behind_announced_when_written(
+        self, mock_config_dir, bus_env, monkeypatch
+    ):
+        monkeypatch.setenv("OVOS_CONFIG_WRITE_BEHIND_MS", "5000")
+        client = TestClient(app)
+        for n in range(3):
+            client.post("/api/v1/skills/a.b", json={"n": n}, auth=AUTH)
+        time.sleep(0.2)
+        assert bus_env.messages == []
+        WRITE_BEHIND.flush()
+        bus_env.wait_for(lambda: bus_env.messages)
+        assert [m["data"] for m in bus_env.messages] == [{"a.b": {"n": 2}}]
+
+    def test_web_edit_and_undo_announced(self, mock_config_dir, bus_env):
+        client = TestClient(app)
+        client.post(
+            "/web/skills/a.b/set",
+            data={"path": '["x"]', "type": "number", "value": "3"},
+            auth=AUTH,
+        )
+        bus_env.wait_for(lambda: len(bus_env.messages) == 1)
+        client.post("/web/skills/a.b/undo", auth=AUTH)
+        bus_env.wait_for(lambda: len(bus_env.messages) == 2)
@@ -0,0 +1,120 @@
+"""Tests for the change sequence and GET /api/v1/changes."""
+
+import json
+import os
+import shutil
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ovos_skill_config import changes
+from ovos_skill_config.main import (
+    CHANGES,
+    DEFAULT_PASSWORD,
+    DEFAULT_USERNAME,
+    app,
+)
+
+AUTH = (DEFAULT_USERNAME, DEFAULT_PASSWORD)
+client = TestClient(app)
+
+
+@pytest.fixture
+def mock_config_dir(mock_config_dir):
+    for skill_id in ("a.b", "c.d"):
+        (mock_config_dir / skill_id).mkdir()
+        (mock_config_dir / skill_id / "settings.json").write_text('{"x": 1}')
+    return mock_config_dir
+
+
+def get_changes(**params):
+    response = client.get("/api/v1/changes", params=params, auth=AUTH)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def edit_on_disk(path, document):
+    """Rewrite a file as another program would, with a later mtime."""
+    before = os.stat(path).st_mtime_ns
+    path.write_text(json.dumps(document))
+    os.utime(path, ns=(before + 10**9, before + 10**9))
+
+
+class TestChangeLog:
+    def test_latest_change_per_skill(self, tmp_path):
+        log = changes.ChangeLog()
+        for skill_id in ("a", "b", "a"):
+            (tmp_path / skill_id).mkdir(exist_ok=True)
+            (tmp_path / skill_id / "settings.json").write_text("{}")
+            log.record_write(tmp_path / skill_id / "settings.json")
+        assert log.since(str(tmp_path), 0) == {"b": 2, "a": 3}
+        assert log.since(str(tmp_path), 2) == {"a": 3}
+        assert log.since("/elsewhere", 0) == {}
+        assert len(log) == 2
+
+    def test_forgotten_changes_need_full_sync(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(changes.ChangeLog, "MAX_ENTRIES", 2)
+        log = changes.ChangeLog()
+        for skill_id in ("a", "b", "c"):
+            (tmp_path / skill_id).mkdir()
+            (tmp_path / skill_id / "settings.json").write_text("{}")
+            log.record_write(tmp_path / skill_id / "settings.json")
+        assert log.since(str(tmp_path), 0) is None
+        assert log.since(str(tmp_path), 1) == {"b": 2, "c": 3}
+        assert log.since(str(tmp_path), 4) is None
+
+
+class TestChangesEndpoint:
+    def test_first_sync_lists_everything(self, mock_config_dir):
+        data = get_changes()
+        assert data["reset"] is True
+        assert data["epoch"] == CHANGES.epoch
+        assert [s["id"] for s in data["skills"]] == ["a.b", "c.d"]
+        assert data["skills"][0]["settings"] == {"x": 1}
+        assert data["deleted"] == []
+
+    def test_only_changed_skills_returned(self, mock_config_dir):
+        first = get_changes()
+        assert get_changes(since=first["seq"], epoch=first["epoch"])["skills"] == []
+
+        client.post("/api/v1/skills/c.d/merge", json={"y": 2}, auth=AUTH)
+        data = get_changes(since=first["seq"], epoch=first["epoch"])
+        assert data["reset"] is False
+        assert [(s["id"], s["settings"]) for s in data["skills"]] == [
+            ("c.d", {"x": 1, "y": 2})
+        ]
+        assert data["skills"][0]["seq"] == data["seq"] > first["seq"]
+        assert get_changes(since=data["seq"])["skills"] == []
+
+    def test_disk_changes_detected(self, mock_config_dir):
+        first = get_changes()
+        edit_on_disk(mock_config_dir / "a.b" / "settings.json", {"x": 5})
+        shutil.rmtree(mock_config_dir / "c.d")
+        (mock_config_dir / "e.f").mkdir()
+        (mock_config_dir / "e.f" / "settings.json").write_text("{}")
+        data = get_changes(since=first["seq"], epoch=first["epoch"])
+        assert [(s["id"], s["settings"]) for s in data["skills"]] == [
+            ("a.b", {"x": 5}),
+            ("e.f", {}),
+        ]
+        assert [d["id"] for d in data["deleted"]] == ["c.d"]
+        # Each change is reported once
+        assert get_changes(since=data["seq"])["skills"] == []
+
+    def test_own_writes_not_counted_twice(self, mock_config_dir):
+        first = get_changes()
+        client.post("/api/v1/skills/a.b", json={"x": 2}, auth=AUTH)
+        data = get_changes(since=first["seq"])
+        assert data["seq"] == first["seq"] + 1
+
+    @pytest.mark.parametrize("params", [{"epoch": "other"}, {"since_offset": 100}])
+    def test_unknown_position_resets(self, mock_config_dir, params):
+        first = get_changes()
+        since = first["seq"] + params.pop("since_offset", 0)
+        data = get_changes(since=since, **params)
+        assert data["reset"] is True
+        assert [s["id"] for s in data["skills"]] == ["a.b", "c.d"]
+
+    def test_negative_since(self, mock_config_dir):
+        response = client.get("/api/v1/changes?since=-1", auth=AUTH)
+        assert response.status_code == 400
@@ -0,0 +1,262 @@
+"""Tests for the ovos-skill-config-tool launcher."""
+
+import io
+import json
+import subprocess
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from ovos_skill_config import cli
+
+
+class TestLauncher:
+    def test_defaults_match_previous_behaviour(self, monkeypatch):
+        monkeypatch.delenv("CONFIG_PORT", raising=False)
+        options = cli.uvicorn_options(cli.build_parser().parse_args([]))
+        assert options["host"] == "0.0.0.0"
+        assert options["port"] == 8000
+        assert options["workers"] == 1
+        assert options["access_log"] is True
+        assert "uds" not in options
+
+    def test_config_port_env(self, monkeypatch):
+        monkeypatch.setenv("CONFIG_PORT", "9100")
+        options = cli.uvicorn_options(cli.build_parser().parse_args([]))
+        assert options["port"] == 9100
+        options = cli.uvicorn_options(cli.build_parser().parse_args(["--port", "1"]))
+        assert options["port"] == 1
+
+    def test_bad_config_port_only_stops_the_server(self, monkeypatch, tmp_path, capsys):
+        monkeypatch.setenv("CONFIG_PORT", "eighty")
+        assert cli.main(["get", "--config-dir", str(tmp_path)]) == 0
+        with patch("uvicorn.run") as run, pytest.raises(SystemExit):
+            cli.main([])
+        run.assert_not_called()
+        assert "CONFIG_PORT must be a port number" in capsys.readouterr().err
+
+    def test_running_main_as_script_loads_it_once(self, monkeypatch):
+        monkeypatch.setenv("OVOS_CONFIG_API_ONLY", "1")
+        script = (
+            "import importlib, runpy, sys\n"
+            "import uvicorn\n"
+            "def run(app, **kwargs):\n"
+            "    module = importlib.import_module(app.split(':')[0])\n"
+            "    print(module is sys.modules['__main__'])\n"
+            "uvicorn.run = run\n"
+            "sys.argv = ['main']\n"
+            "runpy.run_module('ovos_skill_config.main', run_name='__main__')\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True
+        )
+        assert result.stdout.strip() == "True", result.stderr
+
+    def test_uds_replaces_host_and_port(self, tmp_path):
+        socket_path = str(tmp_path / "config.sock")
+        options = cli.uvicorn_options(
+            cli.build_parser().parse_args(["--uds", socket_path])
+        )
+        assert options["uds"] == socket_path
+        assert "host" not in options and "port" not in options
+
+    def test_tuning_options(self):
+        args = cli.build_parser().parse_args(
+            [
+                "--backlog",
+                "64",
+                "--limit-concurrency",
+                "20",
+                "--timeout-keep-alive",
+                "30",
+                "--no-access-log",
+                "--workers",
+                "2",
+            ]
+        )
+        options = cli.uvicorn_options(args)
+        assert options["backlog"] == 64
+        assert options["limit_concurrency"] == 20
+        assert options["timeout_keep_alive"] == 30
+        assert options["access_log"] is False
+        assert options["workers"] == 2
+
+    def test_main_runs_uvicorn_with_import_string(self):
+        with patch("uvicorn.run") as run:
+            assert cli.main(["--port", "9000", "--loop", "asyncio"]) == 0
+        app, options = run.call_args.args[0], run.call_args.kwargs
+        assert app == "ovos_skill_config.main:app"
+        assert options["port"] == 9000
+        assert options["loop"] == "asyncio"
+
+    def test_missing_accelerator_is_a_usage_error(self, capsys):
+        with patch("importlib.util.find_spec", return_value=None):
+            with pytest.raises(SystemExit):
+                cli.main(["--http", "httptools"])
+        assert "ovos-skill-config-tool[fast]" in capsys.readouterr().err
+
+    def test_workers_must_be_positive(self):
+        with pytest.raises(SystemExit):
+            cli.main(["--workers", "0"])
+
+
+def write_skill(config_dir, skill_id, settings):
+    (config_dir / skill_id).mkdir()
+    (config_dir / skill_id / "settings.json").write_text(json.dumps(settings))
+
+
+def read_skill(config_dir, skill_id):
+    return json.loads((config_dir / skill_id / "settings.json").read_text())
+
+
+def ndjson(text):
+    return [json.loads(line) for line in text.splitlines()]
+
+
+class TestOfflineCommands:
+    @pytest.fixture
+    def config_dir(self, tmp_path):
+        write_skill(tmp_path, "a.b", {"x": 1, "__mycroft_skill_firstrun": False})
+        write_skill(tmp_path, "c.d", {"y": [1, 2]})
+        return tmp_path
+
+    def run(self, capsys, config_dir, *argv, stdin=None, monkeypatch=None):
+        if stdin is not None:
+            monkeypatch.setattr("sys.stdin", io.StringIO(stdin))
+        code = cli.main([argv[0], "--config-dir", str(config_dir), *argv[1:]])
+        return code, ndjson(capsys.readouterr().out)
+
+    def test_get_all_and_pointer(self, capsys, config_dir):
+        code, records = self.run(capsys, config_dir, "get")
+        assert code == 0
+        assert [r["id"] for r in records] == ["a.b", "c.d"]
+        code, records = self.run(capsys, config_dir, "get", "--pointer", "/y", "c.d")
+        assert records == [{"id": "c.d", "value": [1, 2]}]
+
+    def test_get_unknown_skill_does_not_create_it(self, capsys, config_dir):
+        code, records = self.run(capsys, config_dir, "get", "missing.skill")
+        assert code == 1
+        assert "error" in records[0]
+        assert not (config_dir / "missing.skill").exists()
+
+    def test_set_parses_json_values(self, capsys, config_dir):
+        code, records = self.run(
+            capsys, config_dir, "set", "a.b", "x=2", "name=hi", "on=true"
+        )
+        assert code == 0
+        assert records == [{"id": "a.b", "ok": True}]
+        assert read_skill(config_dir, "a.b") == {
+            "x": 2,
+            "__mycroft_skill_firstrun": False,
+            "name": "hi",
+            "on": True,
+        }
+
+    def test_patch_many_skills(self, capsys, config_dir, monkeypatch):
+        write_skill(config_dir, "e.f", {"y": []})
+        code, records = self.run(
+            capsys,
+            config_dir,
+            "patch",
+            "-",
+            "c.d",
+            "e.f",
+            "a.b",
+            stdin='[{"op": "add", "path": "/y/-", "value": 3}]',
+            monkeypatch=monkeypatch,
+        )
+        assert code == 1  # a.b has no /y
+        assert records[:2] == [{"id": "c.d", "ok": True}, {"id": "e.f", "ok": True}]
+        assert records[2]["id"] == "a.b"
+        assert "error" in records[2]
+        assert read_skill(config_dir, "c.d") == {"y": [1, 2, 3]}
+        assert read_skill(config_dir, "e.f") == {"y": [3]}
+
+    def test_export_import_round_trip(self, capsys, config_dir, tmp_path_factory):
+        out = tmp_path_factory.mktemp("export") / "skills.ndjson"
+        assert self.run(capsys, config_dir, "export", "-o", str(out))[0] == 0
+        exported = ndjson(out.read_text())
+        assert exported[0] == {"id": "a.b", "settings": {"x": 1}}
+
+        self.run(capsys, config_dir, "set", "a.b", "x=5", "extra=1")
+        code, records = self.run(capsys, config_dir, "import", str(out))
+        assert code == 0
+        assert records == [{"id": "a.b", "ok": True}, {"id": "c.d", "ok": True}]
+        # The firstrun marker is not part of exports and survives a replace
+        assert read_skill(config_dir, "a.b") == {
+            "__mycroft_skill_firstrun": False,
+            "x": 1,
+        }
+
+    def test_import_json_array_and_merge(self, capsys, config_dir, monkeypatch):
+        code, _ = self.run(
+            capsys,
+            config_dir,
+            "import",
+            "--mode",
+            "merge",
+            stdin='[{"id": "c.d", "settings": {"z": true}}]',
+            monkeypatch=monkeypatch,
+        )
+        assert code == 0
+        assert read_skill(config_dir, "c.d") == {"y": [1, 2], "z": True}
+
+    def test_import_reports_bad_records_and_continues(
+        self, capsys, config_dir, monkeypatch
+    ):
+        code, records = self.run(
+            capsys,
+            config_dir,
+            "import",
+            stdin='not json\n\n{"id": "g.h", "settings": {"k": 1}}\n',
+            monkeypatch=monkeypatch,
+        )
+        assert code == 1
+        assert records[0]["error"].startswith("record 1:")
+        assert records[1] == {"id": "g.h", "ok": True}
+        assert read_skill(config_dir, "g.h") == {"k": 1}
+
+    def test_import_deeply_nested_record(self, capsys, config_dir, monkeypatch):
+        deep = '{"id": "g.h", "settings": {"v": ' + "[" * 100000 + "]" * 100000 + "}}"
+        code, records = self.run(
+            capsys,
+            config_dir,
+            "import",
+            stdin=deep + '\n{"id": "i.j", "settings": {}}\n',
+            monkeypatch=monkeypatch,
+        )
+        assert code == 1
+        assert records[0] == {"error": "record 1: nested too deeply to parse"}
+        assert records[1] == {"id": "i.j", "ok": True}
+        monkeypatch.setattr("sys.stdin", io.StringIO(f"[{deep}]"))
+        assert cli.main(["import", "--config-dir", str(config_dir)]) == 2
+        assert "record 1: nested too deeply" in capsys.readouterr().err
+
+    def test_diff(self, capsys, config_dir, monkeypatch):
+        stdin = (
+            '{"id": "a.b", "settings": {"x": 1}}\n'
+            '{"id": "c.d", "settings": {"y": [1, 2], "z": 0}}\n'
+            '{"id": "new.skill", "settings": {"k": 1}}\n'
+        )
+        code, records = self.run(
+            capsys, config_dir, "diff", stdin=stdin, monkeypatch=monkeypatch
+        )
+        assert code == 1
+        assert records == [
+            {"id": "c.d", "patch": [{"op": "add", "path": "/z", "value": 0}]},
+            {"id": "new.skill", "patch": [{"op": "add", "path": "/k", "value": 1}]},
+        ]
+        assert not (config_dir / "new.skill").exists()
+
+    def test_no_differences_exit_zero(self, capsys, config_dir, monkeypatch):
+        self.run(capsys, config_dir, "export")
+        stdin = '{"id": "c.d", "settings": {"y": [1, 2]}}\n'
+        code, records = self.run(
+            capsys, config_dir, "diff", stdin=stdin, monkeypatch=monkeypatch
+        )
+        assert (code, records) == (0, [])
+
+    def test_bounded_map_keeps_order(self):
+        results = list(cli.bounded_map(lambda n: {"n": n}, range(50), jobs=3))
+        assert [r["n"] for r in results] == list(range(50))
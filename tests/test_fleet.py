@@ -0,0 +1,380 @@
+"""Tests for the fleet fan-out client, run against in-process app instances."""
+
+import asyncio
+import base64
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from ovos_skill_config.fleet import load_inventory, main, push
+from ovos_skill_config.main import (
+    DEFAULT_PASSWORD,
+    DEFAULT_USERNAME,
+    SkillSettings,
+    app,
+)
+
+client = TestClient(app)
+pytestmark = pytest.mark.usefixtures("real_auth")
+
+
+def _devices(*hosts):
+    return load_inventory(
+        {
+            "defaults": {"username": DEFAULT_USERNAME, "password": DEFAULT_PASSWORD},
+            "devices": [f"http://{host}" for host in hosts],
+        }
+    )
+
+
+class FlakyTransport(httpx.AsyncBaseTransport):
+    """Fails the first N requests with a transport error, then hits the app."""
+
+    def __init__(self, failures, error=httpx.ConnectError):
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+        self.app_transport = httpx.ASGITransport(app=app)
+
+    async def handle_async_request(self, request):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error("connection failed", request=request)
+        return await self.app_transport.handle_async_request(request)
+
+
+class CountingTransport(httpx.AsyncBaseTransport):
+    """Tracks the peak number of in-flight requests per host, and their order."""
+
+    def __init__(self):
+        self.app_transport = httpx.ASGITransport(app=app)
+        self.in_flight = {}
+        self.peak = {}
+        self.started = []
+
+    async def handle_async_request(self, request):
+        host = request.url.host
+        self.in_flight[host] = self.in_flight.get(host, 0) + 1
+        self.peak[host] = max(self.peak.get(host, 0), self.in_flight[host])
+        self.started.append(host)
+        try:
+            await asyncio.sleep(0.01)
+            return await self.app_transport.handle_async_request(request)
+        finally:
+            self.in_flight[host] -= 1
+
+
+class TestInventory:
+    def test_urls_and_defaults(self):
+        devices = load_inventory(
+            {
+                "defaults": {"username": "u", "password": "p"},
+                "devices": [
+                    "http://kitchen:8000/",
+                    {"url": "http://office:8000", "name": "office", "password": "x"},
+                ],
+            }
+        )
+        assert devices == [
+            {
+                "name": "kitchen:8000",
+                "url": "http://kitchen:8000",
+                "username": "u",
+                "password": "p",
+            },
+            {
+                "name": "office",
+                "url": "http://office:8000",
+                "username": "u",
+                "password": "x",
+            },
+        ]
+
+    def test_inventory_file(self, tmp_path):
+        inventory = tmp_path / "devices.json"
+        inventory.write_text(json.dumps(["http://a"]))
+        assert load_inventory(inventory)[0]["username"] == "ovos"
+
+    @pytest.mark.parametrize("bad", [{"devices": None}, [{"name": "no-url"}], [3]])
+    def test_invalid_inventory(self, bad):
+        with pytest.raises(ValueError):
+            load_inventory(bad)
+
+
+class TestPush:
+    def test_merge_to_many_devices(self, mock_config_dir):
+        SkillSettings("test-skill").replace_settings({"keep": True})
+
+        report = asyncio.run(
+            push(
+                _devices("device-a", "device-b", "device-c"),
+                "test-skill",
+                "merge",
+                {"lang": "en-us"},
+                transport=httpx.ASGITransport(app=app),
+            )
+        )
+        assert report["total"] == 3
+        assert report["succeeded"] == 3
+        assert report["failed"] == 0
+        assert {r["status"] for r in report["results"]} == {200}
+        assert SkillSettings("test-skill").settings == {"keep": True, "lang": "en-us"}
+
+    def test_replace_and_patch(self, mock_config_dir):
+        transport = httpx.ASGITransport(app=app)
+        devices = _devices("device-a")
+        asyncio.run(
+            push(devices, "test-skill", "replace", {"a": 1}, transport=transport)
+        )
+        report = asyncio.run(
+            push(
+                devices,
+                "test-skill",
+                "patch",
+                [{"op": "add", "path": "/b", "value": 2}],
+                transport=transport,
+            )
+        )
+        assert report["succeeded"] == 1
+        assert SkillSettings("test-skill").settings == {"a": 1, "b": 2}
+
+    def test_skill_id_is_escaped(self, mock_config_dir):
+        paths = []
+
+        def handler(request):
+            paths.append(request.url.raw_path)
+            return httpx.Response(200, json={})
+
+        asyncio.run(
+            push(
+                _devices("device-a"),
+                "odd/id?x#y%",
+                "merge",
+                {"a": 1},
+                transport=httpx.MockTransport(handler),
+            )
+        )
+        assert paths == [b"/api/v1/skills/odd%2Fid%3Fx%23y%25/merge"]
+
+    def test_transient_failures_are_retried(self, mock_config_dir):
+        transport = FlakyTransport(failures=2)
+        report = asyncio.run(
+            push(
+                _devices("device-a"),
+                "test-skill",
+                "merge",
+                {"a": 1},
+                retries=2,
+                backoff=0,
+                transport=transport,
+            )
+        )
+        result = report["results"][0]
+        assert result["ok"] is True
+        assert result["attempts"] == 3
+
+    def test_retries_exhausted_reported(self, mock_config_dir):
+        report = asyncio.run(
+            push(
+                _devices("device-a"),
+                "test-skill",
+                "merge",
+                {"a": 1},
+                retries=1,
+                backoff=0,
+                transport=FlakyTransport(failures=5),
+            )
+        )
+        assert report["failed"] == 1
+        result = report["results"][0]
+        assert result["attempts"] == 2
+        assert "ConnectError" in result["error"]
+
+    @pytest.mark.parametrize(
+        "operation,settings,attempts",
+        [
+            ("merge", {"a": 1}, 1),
+            ("patch", [{"op": "add", "path": "/a", "value": 1}], 1),
+            ("replace", {"a": 1}, 2),
+        ],
+    )
+    def test_read_timeout_retried_only_if_idempotent(
+        self, mock_config_dir, operation, settings, attempts
+    ):
+        report = asyncio.run(
+            push(
+                _devices("device-a"),
+                "test-skill",
+                operation,
+                settings,
+                retries=2,
+                backoff=0,
+                transport=FlakyTransport(failures=1, error=httpx.ReadTimeout),
+            )
+        )
+        result = report["results"][0]
+        assert result["attempts"] == attempts
+        assert result["ok"] is (attempts > 1)
+
+    def test_http_errors_not_retried(self, mock_config_dir):
+        devices = _devices("device-a")
+        devices[0]["password"] = "wrong"
+        report = asyncio.run(
+            push(
+                devices,
+                "test-skill",
+                "merge",
+                {"a": 1},
+                transport=httpx.ASGITransport(app=app),
+            )
+        )
+        result = report["results"][0]
+        assert result["status"] == 401
+        assert result["attempts"] == 1
+        assert result["ok"] is False
+
+    def test_per_host_concurrency_limit(self, mock_config_dir):
+        transport = CountingTransport()
+        devices = [
+            {**device, "name": f"{device['name']}-{i}"}
+            for i in range(6)
+            for device in _devices("device-a", "device-b")
+        ]
+        report = asyncio.run(
+            push(
+                devices,
+                "test-skill",
+                "merge",
+                {"a": 1},
+                per_host=2,
+                transport=transport,
+            )
+        )
+        assert report["succeeded"] == 12
+        assert transport.peak == {"device-a": 2, "device-b": 2}
+
+    def test_busy_host_does_not_starve_others(self, mock_config_dir):
+        transport = CountingTransport()
+        # Three devices behind one host, then one on another host
+        devices = [
+            {**device, "name": f"a-{i}"}
+            for i, device in enumerate(_devices("device-a", "device-a", "device-a"))
+        ] + _devices("device-b")
+        report = asyncio.run(
+            push(
+                devices,
+                "test-skill",
+                "merge",
+                {"a": 1},
+                concurrency=2,
+                per_host=1,
+                transport=transport,
+            )
+        )
+        assert report["succeeded"] == 4
+        # device-b went ahead of the devices queued behind device-a
+        assert transport.started == ["device-a", "device-b", "device-a", "device-a"]
+
+
+class TestFleetEndpoint:
+    def test_requires_auth(self, mock_config_dir):
+        response = client.post("/api/v1/fleet/push", json={})
+        assert response.status_code == 401
+
+    @pytest.mark.parametrize(
+        "extra",
+        [
+            {"operation": "explode"},
+            {"settings": None},
+            {"operation": "patch", "settings": {"a": 1}},
+            {"operation": "replace", "settings": [{"op": "remove", "path": "/a"}]},
+            {"retries": -1},
+            {"concurrency": 0},
+            {"per_host": -2},
+            {"timeout": 0},
+        ],
+    )
+    def test_invalid_request(self, mock_config_dir, extra):
+        token = base64.b64encode(
+            f"{DEFAULT_USERNAME}:{DEFAULT_PASSWORD}".encode()
+        ).decode()
+        body = {"skill_id": "x", "operation": "merge", "settings": {}, "devices": []}
+        response = client.post(
+            "/api/v1/fleet/push",
+            json={**body, **extra},
+            headers={"Authorization": f"Basic {token}"},
+        )
+        assert response.status_code == 400
+
+    def test_unreachable_device_reported(self, mock_config_dir):
+        token = base64.b64encode(
+            f"{DEFAULT_USERNAME}:{DEFAULT_PASSWORD}".encode()
+        ).decode()
+        response = client.post(
+            "/api/v1/fleet/push",
+            json={
+                "skill_id": "test-skill",
+                "operation": "merge",
+                "settings": {"a": 1},
+                "devices": ["http://127.0.0.1:9"],
+                "retries": 0,
+                "timeout": 2,
+            },
+            headers={"Authorization": f"Basic {token}"},
+        )
+        assert response.status_code == 200
+        report = response.json()
+        assert report["failed"] == 1
+        assert report["results"][0]["ok"] is False
+
+
+class TestFleetCli:
+    def test_cli_reports_failure_exit_code(self, tmp_path, capsys):
+        inventory = tmp_path / "devices.json"
+        inventory.write_text(json.dumps(["http://127.0.0.1:9"]))
+        data = tmp_path / "settings.json"
+        data.write_text(json.dumps({"a": 1}))
+
+        code = main(
+            [str(inventory), "test-skill", "merge", str(data), "--retries", "0"]
+        )
+        assert code == 1
+        report = json.loads(capsys.readouterr().out)
+        assert report["total"] == 1
+        assert report["failed"] == 1
+
+    def test_cli_rejects_invalid_push(self, tmp_path, capsys):
+        inventory = tmp_path / "devices.json"
+        inventory.write_text(json.dumps(["http://127.0.0.1:9"]))
+        data = tmp_path / "ops.json"
+        data.write_text(json.dumps({"a": 1}))
+
+        code = main([str(inventory), "test-skill", "patch", str(data)])
+        assert code == 2
+        assert "list of operations" in capsys.readouterr().err
+
+    @pytest.mark.parametrize(
+        "inventory_text,data_text,message",
+        [
+            ('["http://a"]', "{not json", "settings.json: Expecting"),
+            ("{not json", "{}", "devices.json: Expecting"),
+            ('{"devices": 3}', "{}", "devices.json: Inventory must be a list"),
+            (None, "{}", "No such file"),
+        ],
+    )
+    def test_cli_reports_bad_files(
+        self, tmp_path, capsys, inventory_text, data_text, message
+    ):
+        inventory = tmp_path / "devices.json"
+        if inventory_text is not None:
+            inventory.write_text(inventory_text)
+        data = tmp_path / "settings.json"
+        data.write_text(data_text)
+
+        code = main([str(inventory), "test-skill", "merge", str(data)])
+        assert code == 2
+        err = capsys.readouterr().err
+        assert err.startswith("error: ") and message in err
+        assert len(err.strip().splitlines()) == 1
@@ -0,0 +1,171 @@
+"""Tests for the resource governor and load shedding of expensive requests."""
+
+import asyncio
+import os
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ovos_skill_config.governor import (
+    IOPRIO_CLASS_IDLE,
+    DeadlineExceeded,
+    Overloaded,
+    ResourceGovernor,
+    check_deadline,
+    io_priority_class,
+)
+from ovos_skill_config.main import (
+    DEFAULT_PASSWORD,
+    DEFAULT_USERNAME,
+    app,
+    get_governor,
+)
+
+client = TestClient(app)
+AUTH = (DEFAULT_USERNAME, DEFAULT_PASSWORD)
+
+
+class TestResourceGovernor:
+    def test_sheds_when_queue_is_full(self):
+        governor = ResourceGovernor(max_concurrent=1, max_queue=1)
+        release = threading.Event()
+
+        async def scenario():
+            running = asyncio.ensure_future(governor.run(release.wait))
+            queued = asyncio.ensure_future(governor.run(lambda: "queued"))
+            await asyncio.sleep(0.05)
+            with pytest.raises(Overloaded):
+                await governor.run(lambda: "shed")
+            release.set()
+            return await running, await queued
+
+        assert asyncio.run(scenario()) == (True, "queued")
+        assert governor.in_flight == 0
+
+    def test_deadline_stops_cooperative_work(self):
+        governor = ResourceGovernor(deadline=0.05)
+        progress = []
+
+        def slow_scan():
+            for step in range(100):
+                check_deadline()
+                progress.append(step)
+                time.sleep(0.01)
+
+        with pytest.raises(DeadlineExceeded):
+            asyncio.run(governor.run(slow_scan))
+        time.sleep(0.05)
+        stopped_at = len(progress)
+        time.sleep(0.05)
+        assert len(progress) == stopped_at < 100
+
+    def test_work_without_deadline_completes(self):
+        governor = ResourceGovernor(deadline=0.01)
+
+        def slow():
+            time.sleep(0.05)
+            check_deadline()
+            return "done"
+
+        assert asyncio.run(governor.run(slow, use_deadline=False)) == "done"
+
+    def test_stream_holds_one_slot_until_exhausted(self):
+        governor = ResourceGovernor(max_concurrent=1, max_queue=0)
+
+        async def scenario():
+            stream = governor.stream(iter(["a", "b"]))
+            with pytest.raises(Overloaded):
+                governor.stream(iter([]))
+            return [chunk async for chunk in stream]
+
+        assert asyncio.run(scenario()) == ["a", "b"]
+        assert governor.in_flight == 0
+
+    def test_low_priority_workers_are_niced(self):
+        governor = ResourceGovernor(low_priority=True)
+
+        def niceness():
+            return os.getpriority(os.PRIO_PROCESS, threading.get_native_id())
+
+        assert asyncio.run(governor.run(niceness)) >= 10
+
+    def test_close_waits_for_admitted_work(self):
+        governor = ResourceGovernor(max_concurrent=1)
+        release = threading.Event()
+
+        async def scenario():
+            running = asyncio.ensure_future(governor.run(release.wait))
+            await asyncio.sleep(0.05)
+            governor.close()
+            assert not governor._executor._shutdown
+            release.set()
+            await running
+
+        asyncio.run(scenario())
+        assert governor._executor._shutdown
+
+    def test_replaced_governor_is_closed(self, monkeypatch):
+        monkeypatch.setenv("OVOS_CONFIG_MAX_EXPENSIVE", "3")
+        old = get_governor()
+        assert get_governor() is old
+        monkeypatch.setenv("OVOS_CONFIG_MAX_EXPENSIVE", "4")
+        assert get_governor() is not old
+        assert old._executor._shutdown
+
+    def test_low_priority_workers_get_idle_io_class(self):
+        if io_priority_class(threading.get_native_id()) is None:
+            pytest.skip("ioprio_get is not available here")
+        governor = ResourceGovernor(low_priority=True)
+
+        def io_class():
+            return io_priority_class(threading.get_native_id())
+
+        assert asyncio.run(governor.run(io_class)) == IOPRIO_CLASS_IDLE
+        assert io_priority_class(threading.get_native_id()) != IOPRIO_CLASS_IDLE
+
+
+class TestLoadShedding:
+    def test_overloaded_returns_503_and_status_stays_up(
+        self, mock_config_dir, monkeypatch
+    ):
+        monkeypatch.setenv("OVOS_CONFIG_MAX_EXPENSIVE", "1")
+        monkeypatch.setenv("OVOS_CONFIG_MAX_QUEUE", "0")
+        started, release = threading.Event(), threading.Event()
+
+        def blocking_scan(config_dir=None):
+            started.set()
+            release.wait(5)
+            return []
+
+        with patch("ovos_skill_config.main.load_all_skills", blocking_scan):
+            slow = threading.Thread(
+                target=client.get, args=("/api/v1/skills",), kwargs={"auth": AUTH}
+            )
+            slow.start()
+            try:
+                assert started.wait(5)
+                response = client.get("/api/v1/skills", auth=AUTH)
+                assert response.status_code == 503
+                assert response.headers["Retry-After"] == "2"
+                assert client.get("/status").status_code == 200
+            finally:
+                release.set()
+                slow.join()
+
+    def test_deadline_returns_503(self, mock_config_dir, monkeypatch):
+        monkeypatch.setenv("OVOS_CONFIG_REQUEST_DEADLINE", "0.05")
+        for skill_id in ("a", "b", "c", "d"):
+            (mock_config_dir / skill_id).mkdir()
+            (mock_config_dir / skill_id / "settings.json").write_text("{}")
+
+        def slow_settings(*args, **kwargs):
+            time.sleep(0.03)
+            raise RuntimeError("unreadable")
+
+        with patch("ovos_skill_config.main.SkillSettings", slow_settings):
+            response = client.get("/api/v1/skills", auth=AUTH)
+        assert response.status_code == 503
+        assert "deadline" in response.json()["detail"]
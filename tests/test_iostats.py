@@ -0,0 +1,144 @@
+"""Tests for per-request I/O accounting and the I/O budgets of endpoints."""
+
+import contextvars
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ovos_skill_config import iostats
+from ovos_skill_config.main import (
+    DEFAULT_PASSWORD,
+    DEFAULT_USERNAME,
+    SkillSettings,
+    app,
+)
+from ovos_skill_config.web import get_logo_config
+
+client = TestClient(app)
+AUTH = (DEFAULT_USERNAME, DEFAULT_PASSWORD)
+
+
+@pytest.fixture
+def mock_config_dir(mock_config_dir, monkeypatch):
+    """Temporary config directory, with X-IO-* debug headers enabled."""
+    monkeypatch.setenv("OVOS_CONFIG_IO_DEBUG", "1")
+    return mock_config_dir
+
+
+def assert_io_budget(response, **limits):
+    """Fail if a response's X-IO-* headers exceed the given limits."""
+    assert response.status_code == 200, response.text
+    iostats.over_budget(iostats.from_headers(response.headers), limits)
+
+
+class TestIOStats:
+    def test_helpers_count(self, tmp_path):
+        path = tmp_path / "file.json"
+        with iostats.budget() as stats:
+            iostats.write_bytes(path, b"12345")
+            iostats.read_bytes(path)
+            iostats.stat(path)
+            assert not iostats.exists(tmp_path / "missing")
+        assert stats.as_dict() == {
+            "opens": 2,
+            "stats": 2,
+            "bytes_read": 5,
+            "bytes_written": 5,
+            "fsyncs": 0,
+        }
+
+    def test_budget_failure_lists_counters(self, tmp_path):
+        with pytest.raises(AssertionError, match="bytes_written"):
+            with iostats.budget(bytes_written=0):
+                iostats.write_bytes(tmp_path / "f", b"x")
+
+    def test_nothing_counted_outside_track(self, tmp_path):
+        iostats.write_bytes(tmp_path / "f", b"x")
+        assert iostats.current() is None
+
+    def test_counts_from_many_threads(self):
+        def work():
+            for _ in range(10000):
+                iostats.record(stats=1, bytes_read=3)
+
+        with iostats.track() as stats:
+            # As the governor hands work to its pool: one context per thread
+            threads = [
+                threading.Thread(target=contextvars.copy_context().run, args=(work,))
+                for _ in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        assert (stats.stats, stats.bytes_read) == (80000, 240000)
+
+
+class TestEndpointBudgets:
+    def test_get_skill(self, mock_config_dir):
+        SkillSettings("a.b").replace_settings({"x": 1})
+        response = client.get("/api/v1/skills/a.b", auth=AUTH)
+        assert_io_budget(response, stats=1, bytes_written=0, opens=3)
+
+    def test_get_setting(self, mock_config_dir):
+        SkillSettings("a.b").replace_settings({"x": 1})
+        response = client.get("/api/v1/skills/a.b/settings/x", auth=AUTH)
+        assert_io_budget(response, stats=1, bytes_written=0, opens=3)
+
+    def test_merge_writes_once(self, mock_config_dir):
+        SkillSettings("a.b").replace_settings({"x": 1})
+        response = client.post("/api/v1/skills/a.b/merge", json={"y": 2}, auth=AUTH)
+        counts = iostats.from_headers(response.headers)
+        assert counts["bytes_written"] == len(
+            (mock_config_dir / "a.b" / "settings.json").read_bytes()
+        )
+        # The document is read again under the settings lock before merging
+        assert_io_budget(response, stats=1, opens=5)
+
+    def test_batch_get_reads_each_skill_once(self, mock_config_dir):
+        SkillSettings("a.b").replace_settings({"k": 1, "j": 2})
+        SkillSettings("c.d").replace_settings({"k": 3})
+        items = [
+            {"id": skill_id, "path": path}
+            for skill_id in ("a.b", "c.d")
+            for path in ("/k", "/j", "")
+        ]
+        response = client.post(
+            "/api/v1/settings:batchGet", json={"items": items}, auth=AUTH
+        )
+        assert_io_budget(response, stats=2, bytes_written=0)
+
+    def test_list_skills_one_stat_per_skill(self, mock_config_dir):
+        for skill_id in ("a.x", "b.x", "c.x"):
+            SkillSettings(skill_id).replace_settings({"k": 1})
+        response = client.get("/api/v1/skills", auth=AUTH)
+        # One existence check while listing, one when loading
+        assert_io_budget(response, stats=6, bytes_written=0)
+
+    def test_logo_config_read_once(self, tmp_path, monkeypatch):
+        (tmp_path / "config.json").write_text('{"logo": {"type": "text", "text": "X"}}')
+        monkeypatch.setenv("OVOS_CONFIG_STATIC_DIR", str(tmp_path))
+        assert get_logo_config()["text"] == "X"
+        with iostats.budget(opens=0, stats=1, bytes_read=0):
+            assert get_logo_config()["text"] == "X"
+        (tmp_path / "config.json").write_text(
+            '{"logo": {"type": "text", "text": "YY"}}'
+        )
+        assert get_logo_config()["text"] == "YY"
+
+
+class TestDiagnostics:
+    def test_totals_per_route(self, mock_config_dir):
+        SkillSettings("a.b").replace_settings({"x": 1})
+        client.get("/api/v1/skills/a.b", auth=AUTH)
+        data = client.get("/api/v1/diagnostics/io", auth=AUTH).json()
+        route = data["routes"]["/api/v1/skills/{skill_id}"]
+        assert route["requests"] >= 1
+        assert route["totals"]["bytes_read"] > 0
+        assert data["totals"]["opens"] >= route["totals"]["opens"]
+
+    def test_headers_only_in_debug_mode(self, mock_config_dir, monkeypatch):
+        monkeypatch.delenv("OVOS_CONFIG_IO_DEBUG")
+        response = client.get("/status")
+        assert "X-IO-Opens" not in response.headers
@@ -0,0 +1,136 @@
+"""Tests for the load-generation harness, run against the in-process app."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from ovos_skill_config import cli
+from ovos_skill_config.loadtest import (
+    format_report,
+    parse_mix,
+    run_load,
+    seed_config_dir,
+    summarize,
+)
+from ovos_skill_config.main import (
+    DEFAULT_PASSWORD,
+    DEFAULT_USERNAME,
+    SkillSettings,
+    app,
+)
+
+pytestmark = pytest.mark.usefixtures("real_auth")
+
+
+@pytest.fixture
+def config_home(tmp_path):
+    """A synthetic config dir the app reads skills from."""
+    skill_ids = seed_config_dir(tmp_path, skills=3)
+    with patch(
+        "ovos_skill_config.main.get_config_dir",
+        return_value=tmp_path / "mycroft" / "skills",
+    ):
+        yield skill_ids
+
+
+def load(skill_ids, mix, **kwargs):
+    kwargs.setdefault("username", DEFAULT_USERNAME)
+    kwargs.setdefault("password", DEFAULT_PASSWORD)
+    return asyncio.run(
+        run_load(
+            "http://testserver",
+            parse_mix(mix),
+            skill_ids,
+            duration=0.3,
+            warmup=0,
+            connections=2,
+            seed=1,
+            transport=httpx.ASGITransport(app=app),
+            **kwargs,
+        )
+    )
+
+
+class TestMix:
+    def test_weights(self):
+        assert parse_mix("index=1, skills=4,set") == {
+            "index": 1,
+            "skills": 4,
+            "set": 1,
+        }
+
+    def test_zero_weight_dropped(self):
+        assert parse_mix("index=0,export=2") == {"export": 2}
+
+    @pytest.mark.parametrize("mix", ["nope=1", "index=x", "index=-1", "index=0"])
+    def test_invalid(self, mix):
+        with pytest.raises(ValueError):
+            parse_mix(mix)
+
+
+class TestSummary:
+    def test_percentiles_and_error_rate(self):
+        summary = summarize(
+            {"skills": [i / 1000 for i in range(1, 101)]},
+            {"skills": {"503": 25}},
+            elapsed=2.0,
+        )
+        stats = summary["routes"]["skills"]
+        assert stats["requests"] == 125
+        assert stats["rps"] == 62.5
+        assert (stats["p50"], stats["p95"], stats["p99"]) == (51.0, 96.0, 100.0)
+        assert stats["error_rate"] == 0.2
+        assert summary["total"]["error_kinds"] == {"503": 25}
+        assert "skills errors: 503: 25" in format_report(summary)
+
+    def test_route_with_only_errors(self):
+        summary = summarize({"index": []}, {"index": {"ConnectError": 2}}, 1.0)
+        assert summary["routes"]["index"]["p50"] is None
+        assert "-" in format_report(summary)
+
+
+class TestRunLoad:
+    def test_basic_auth_mix(self, config_home):
+        summary = load(config_home, "index=1,skills=1,export=1,set=1")
+        assert set(summary["routes"]) == {"index", "skills", "export", "set"}
+        assert summary["total"]["requests"] > 0
+        assert summary["total"]["errors"] == 0
+        written = [SkillSettings(skill_id).settings for skill_id in config_home]
+        assert any("loadtest" in settings for settings in written)
+
+    def test_login_auth(self, config_home):
+        summary = load(config_home, "index=1,skills=1", auth="login")
+        assert summary["total"]["errors"] == 0
+        assert summary["routes"]["index"]["requests"] > 0
+
+    def test_bad_credentials_are_errors(self, config_home):
+        summary = load(config_home, "skills=1,index=1", password="wrong")
+        assert summary["routes"]["skills"]["error_kinds"].keys() == {"401"}
+        # The web UI redirects to /login rather than answering 401
+        assert summary["routes"]["index"]["error_kinds"].keys() == {"303"}
+        assert summary["total"]["error_rate"] == 1.0
+
+    def test_failed_login(self, config_home):
+        with pytest.raises(RuntimeError):
+            load(config_home, "index=1", auth="login", password="wrong")
+
+
+class TestLoadtestCli:
+    def test_writes_against_url_need_opt_in(self, capsys):
+        code = cli.main(["loadtest", "--url", "http://127.0.0.1:9", "--mix", "set=1"])
+        assert code == 2
+        assert "--allow-writes" in capsys.readouterr().err
+
+    def test_local_instance_json_report(self, capsys):
+        code = cli.main(
+            ["loadtest", "--duration", "0.5", "--warmup", "0", "--skills", "2"]
+            + ["--mix", "skills=1,set=1", "--json"]
+        )
+        assert code == 0
+        report = json.loads(capsys.readouterr().out)
+        assert report["config"]["skills"] == 2
+        assert report["total"]["requests"] > 0
+        assert report["total"]["errors"] == 0
@@ -0,0 +1,162 @@
+"""Tests for structured logging, the access log and rate-limited errors."""
+
+import io
+import json
+import logging
+import queue
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ovos_skill_config import logs, main
+from ovos_skill_config.main import (
+    DEFAULT_PASSWORD,
+    DEFAULT_USERNAME,
+    app,
+    iter_skills,
+)
+
+AUTH = (DEFAULT_USERNAME, DEFAULT_PASSWORD)
+pytestmark = pytest.mark.usefixtures("real_auth", "sample_skill")
+ACCESS_LOGGER = "ovos_skill_config.main.access"
+
+
+def access_records(caplog):
+    return [r for r in caplog.records if r.name == ACCESS_LOGGER]
+
+
+class TestJsonLogging:
+    def test_formatter_includes_extras_and_exception(self):
+        logger = logging.getLogger("test.json")
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = logger.makeRecord(
+                "test.json",
+                logging.ERROR,
+                __file__,
+                1,
+                "failed %s",
+                ("x",),
+                exc_info=__import__("sys").exc_info(),
+                extra={"skill_id": "a.b"},
+            )
+        entry = json.loads(logs.JsonFormatter().format(record))
+        assert entry["message"] == "failed x"
+        assert entry["level"] == "ERROR"
+        assert entry["skill_id"] == "a.b"
+        assert "ValueError: boom" in entry["exception"]
+
+    def test_configure_writes_json_lines_off_thread(self, monkeypatch):
+        monkeypatch.delenv("OVOS_CONFIG_LOG_FORMAT", raising=False)
+        stream = io.StringIO()
+        logs.configure(stream)
+        try:
+            logging.getLogger("ovos_skill_config.test").warning(
+                "hello %s", "world", extra={"route": "/x"}
+            )
+        finally:
+            logs.shutdown()
+        entry = json.loads(stream.getvalue())
+        assert entry["message"] == "hello world"
+        assert entry["route"] == "/x"
+        assert entry["logger"] == "ovos_skill_config.test"
+        assert logging.getLogger("ovos_skill_config").propagate is True
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        handler = logs.DroppingQueueHandler(queue.Queue(1))
+        record = logging.makeLogRecord({"msg": "m"})
+        handler.emit(record)
+        handler.emit(record)
+        assert handler.dropped == 1
+
+
+class TestRateLimitedLogger:
+    def test_repeats_suppressed_then_counted(self, caplog):
+        limited = logs.RateLimitedLogger(logging.getLogger("test.rate"), interval=60)
+        clock = [100.0]
+        with patch("time.monotonic", side_effect=lambda: clock[0]):
+            with caplog.at_level(logging.WARNING, logger="test.rate"):
+                assert limited.log(logging.WARNING, "a", "bad %s", "a")
+                assert not limited.log(logging.WARNING, "a", "bad %s", "a")
+                assert not limited.log(logging.WARNING, "a", "bad %s", "a")
+                assert limited.log(logging.WARNING, "b", "bad %s", "b")
+                clock[0] += 61
+                assert limited.log(logging.WARNING, "a", "bad %s", "a")
+        assert [r.getMessage() for r in caplog.records] == ["bad a", "bad b", "bad a"]
+        assert caplog.records[2].suppressed == 2
+
+    def test_keys_are_bounded(self):
+        limited = logs.RateLimitedLogger(logging.getLogger("test.rate"), max_keys=3)
+        for n in range(10):
+            limited.log(logging.DEBUG, str(n), "m")
+        assert list(limited._seen) == ["7", "8", "9"]
+
+    def test_broken_skill_logged_once(self, mock_config_dir, caplog, monkeypatch):
+        real = main.SkillSettings
+
+        def settings(skill_id, config_dir=None):
+            if skill_id == "broken.skill":
+                raise PermissionError("settings.json")
+            return real(skill_id, config_dir)
+
+        monkeypatch.setattr(main, "SKILL_ERRORS", logs.RateLimitedLogger(main.LOG))
+        monkeypatch.setattr(main, "SkillSettings", settings)
+        with caplog.at_level(logging.WARNING, logger="ovos_skill_config.main"):
+            for _ in range(3):
+                loaded = list(iter_skills(["a.b", "broken.skill"]))
+                assert [s["id"] for s in loaded] == ["a.b"]
+        errors = [r for r in caplog.records if getattr(r, "skill_id", None)]
+        assert len(errors) == 1
+        assert errors[0].skill_id == "broken.skill"
+
+
+class TestAccessLog:
+    def test_off_by_default(self, mock_config_dir, caplog, monkeypatch):
+        monkeypatch.delenv("OVOS_CONFIG_ACCESS_LOG", raising=False)
+        with caplog.at_level(logging.INFO, logger=ACCESS_LOGGER):
+            TestClient(app).get("/api/v1/skills", auth=AUTH)
+        assert access_records(caplog) == []
+
+    def test_request_record(self, mock_config_dir, caplog, monkeypatch):
+        monkeypatch.setenv("OVOS_CONFIG_ACCESS_LOG", "1")
+        with caplog.at_level(logging.INFO, logger=ACCESS_LOGGER):
+            response = TestClient(app).get("/api/v1/skills/a.b", auth=AUTH)
+        (record,) = access_records(caplog)
+        assert record.levelno == logging.INFO
+        assert record.route == "/api/v1/skills/{skill_id}"
+        assert record.skill_id == "a.b"
+        assert record.status == 200
+        assert record.user == DEFAULT_USERNAME
+        assert record.bytes == len(response.content)
+        assert record.latency_ms >= 0
+
+    def test_web_session_user(self, mock_config_dir, caplog, monkeypatch):
+        monkeypatch.setenv("OVOS_CONFIG_ACCESS_LOG", "1")
+        client = TestClient(app)
+        client.post(
+            "/login",
+            data={"username": DEFAULT_USERNAME, "password": DEFAULT_PASSWORD},
+            follow_redirects=False,
+        )
+        caplog.clear()
+        with caplog.at_level(logging.INFO, logger=ACCESS_LOGGER):
+            client.get("/")
+        (record,) = access_records(caplog)
+        assert (record.route, record.user, record.status) == ("/", "ovos", 200)
+
+    def test_slow_requests_always_logged(self, mock_config_dir, caplog, monkeypatch):
+        monkeypatch.delenv("OVOS_CONFIG_ACCESS_LOG", raising=False)
+        monkeypatch.setenv("OVOS_CONFIG_SLOW_REQUEST_MS", "0")
+        with caplog.at_level(logging.INFO, logger=ACCESS_LOGGER):
+            TestClient(app).get("/api/v1/skills", auth=AUTH)
+        (record,) = access_records(caplog)
+        assert record.levelno == logging.WARNING
+
+    def test_unauthenticated_has_no_user(self, mock_config_dir, caplog, monkeypatch):
+        monkeypatch.setenv("OVOS_CONFIG_ACCESS_LOG", "1")
+        with caplog.at_level(logging.INFO, logger=ACCESS_LOGGER):
+            TestClient(app).get("/api/v1/skills", auth=("ovos", "wrong"))
+        (record,) = access_records(caplog)
+        assert (record.status, record.user) == (401, None)
@@ -1,10 +1,13 @@
 import base64
 import os
+import subprocess
+import sys
 from unittest.mock import patch
 
 import pytest
 from fastapi.testclient import TestClient
 
+from ovos_skill_config import iostats
 from ovos_skill_config.main import SkillSettings, app, verify_credentials
 
 client = TestClient(app)
@@ -21,13 +24,6 @@ def override_verify_credentials():
 app.dependency_overrides[verify_credentials] = override_verify_credentials
 
 
-@pytest.fixture
-def mock_config_dir(tmp_path):
-    """Create a temporary config directory for testing."""
-    with patch("ovos_skill_config.main.get_config_dir", return_value=tmp_path):
-        yield tmp_path
-
-
 @pytest.fixture
 def test_skill_id():
     return "test-skill"
@@ -98,6 +94,26 @@ class TestSkillSettings:
         assert result == new_settings
         assert "old_key" not in skill_settings.settings
 
+    def test_unchanged_document_is_not_rewritten(self, mock_config_dir, test_skill_id):
+        SkillSettings(test_skill_id).replace_settings({"a": 1, "b": [1, 2]})
+        path = mock_config_dir / test_skill_id / "settings.json"
+        before = path.stat().st_mtime_ns
+
+        skill = SkillSettings(test_skill_id)
+        with iostats.budget(bytes_written=0):
+            skill.replace_settings({"a": 1, "b": [1, 2]})
+            skill.merge_settings({"a": 1})
+            skill.update_setting("b", [1, 2])
+        assert skill.last_write_skipped
+        assert path.stat().st_mtime_ns == before
+
+    def test_changed_value_type_is_written(self, mock_config_dir, test_skill_id):
+        SkillSettings(test_skill_id).replace_settings({"a": 1})
+        skill = SkillSettings(test_skill_id)
+        skill.replace_settings({"a": True})
+        assert not skill.last_write_skipped
+        assert SkillSettings(test_skill_id).settings == {"a": True}
+
 
 class TestAPI:
     def test_list_skills_empty_dir(self, mock_config_dir):
@@ -426,3 +442,380 @@ class TestSkillSettingsErrors:
         # This should not raise
         settings = SkillSettings(skill_id)
         assert settings.settings == {}
+
+
+class TestBatchGet:
+    def test_values_in_request_order(self, mock_config_dir):
+        SkillSettings("a.x").replace_settings({"lang": "en-us", "opts": {"v": 5}})
+        SkillSettings("b.x").replace_settings({"lang": "de-de", "list": [1, 2]})
+        response = client.post(
+            "/api/v1/settings:batchGet",
+            json={
+                "items": [
+                    {"id": "b.x", "path": "/lang"},
+                    {"id": "a.x", "path": "/opts/v"},
+                    {"id": "a.x", "path": "/lang"},
+                    {"id": "b.x", "path": "/list/1"},
+                    {"id": "a.x", "path": "/missing"},
+                ]
+            },
+        )
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert results[:4] == [
+            {"id": "b.x", "path": "/lang", "value": "de-de"},
+            {"id": "a.x", "path": "/opts/v", "value": 5},
+            {"id": "a.x", "path": "/lang", "value": "en-us"},
+            {"id": "b.x", "path": "/list/1", "value": 2},
+        ]
+        assert results[4]["id"] == "a.x" and "error" in results[4]
+        assert "value" not in results[4]
+
+    def test_invalid_skill_id_is_per_item(self, mock_config_dir):
+        response = client.post(
+            "/api/v1/settings:batchGet",
+            json={"items": [{"id": "../x", "path": "/k"}]},
+        )
+        assert response.status_code == 200
+        assert "Invalid skill id" in response.json()["results"][0]["error"]
+
+    @pytest.mark.parametrize(
+        "body",
+        [
+            {},
+            {"items": "x"},
+            {"items": [{"id": "a.x"}]},
+            {"items": [{"id": "a.x", "path": "no-slash"}]},
+            {"items": [{"id": "a.x", "path": "/k"}] * 1001},
+        ],
+    )
+    def test_bad_requests(self, mock_config_dir, body):
+        response = client.post("/api/v1/settings:batchGet", json=body)
+        assert response.status_code == 400
+
+
+class TestBulkMerge:
+    @pytest.fixture
+    def skills(self, mock_config_dir):
+        SkillSettings("ovos-skill-weather.openvoiceos").replace_settings(
+            {"lang": "en-us", "units": "imperial"}
+        )
+        SkillSettings("ovos-skill-date.openvoiceos").replace_settings({"lang": "en-us"})
+        SkillSettings("skill-news.someone").replace_settings({"feeds": [1]})
+        return mock_config_dir
+
+    def bulk(self, **body):
+        return client.post("/api/v1/skills:bulkMerge", json=body)
+
+    def test_merge_by_author(self, skills):
+        response = self.bulk(
+            selector={"author": "openvoiceos"}, merge={"units": "metric"}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["matched"], data["changed"], data["failed"]) == (2, 2, 0)
+        assert [r["id"] for r in data["results"]] == [
+            "ovos-skill-date.openvoiceos",
+            "ovos-skill-weather.openvoiceos",
+        ]
+        assert SkillSettings("ovos-skill-date.openvoiceos").settings == {
+            "lang": "en-us",
+            "units": "metric",
+        }
+        assert SkillSettings("skill-news.someone").settings == {"feeds": [1]}
+
+    def test_unchanged_skills_are_not_written(self, skills):
+        path = skills / "ovos-skill-weather.openvoiceos" / "settings.json"
+        before = path.stat().st_mtime_ns
+        data = self.bulk(selector={"ids": "*"}, merge={"lang": "en-us"}).json()
+        # Only the news skill gains the key
+        assert data["changed"] == 1
+        assert path.stat().st_mtime_ns == before
+
+    def test_has_and_glob_selectors_combine(self, skills):
+        data = self.bulk(
+            selector={"ids": "ovos-skill-*", "has": "/units"},
+            patch=[{"op": "replace", "path": "/units", "value": "metric"}],
+        ).json()
+        assert [r["id"] for r in data["results"]] == ["ovos-skill-weather.openvoiceos"]
+        assert SkillSettings("ovos-skill-weather.openvoiceos").settings["units"] == (
+            "metric"
+        )
+
+    def test_dry_run_reports_patches_without_writing(self, skills):
+        data = self.bulk(
+            selector={"has": "/lang"}, merge={"lang": "de-de"}, dry_run=True
+        ).json()
+        assert data["dry_run"] and data["changed"] == 2
+        assert data["results"][0]["patch"] == [
+            {"op": "replace", "path": "/lang", "value": "de-de"}
+        ]
+        assert SkillSettings("ovos-skill-date.openvoiceos").settings == {
+            "lang": "en-us"
+        }
+
+    def test_failing_patch_is_per_skill(self, skills):
+        data = self.bulk(
+            selector={"ids": "*"},
+            patch=[
+                {"op": "test", "path": "/lang", "value": "en-us"},
+                {"op": "add", "path": "/checked", "value": True},
+            ],
+        ).json()
+        assert (data["matched"], data["changed"], data["failed"]) == (3, 2, 1)
+        assert "error" in data["results"][2]
+
+    @pytest.mark.parametrize(
+        "body",
+        [
+            {"merge": {"a": 1}},
+            {"selector": {}, "merge": {"a": 1}},
+            {"selector": {"name": "x"}, "merge": {"a": 1}},
+            {"selector": {"ids": "*"}},
+            {"selector": {"ids": "*"}, "merge": {}, "patch": []},
+            {"selector": {"ids": "*"}, "merge": []},
+            {"selector": {"has": "lang"}, "merge": {}},
+            {"selector": {"ids": "*"}, "merge": {}, "concurrency": 0},
+        ],
+    )
+    def test_bad_requests(self, skills, body):
+        assert client.post("/api/v1/skills:bulkMerge", json=body).status_code == 400
+
+
+class TestMultiRoot:
+    @pytest.fixture
+    def roots(self, tmp_path, monkeypatch):
+        ovos_dir = tmp_path / "ovos" / "skills"
+        neon_dir = tmp_path / "neon" / "skills"
+        ovos_dir.mkdir(parents=True)
+        neon_dir.mkdir(parents=True)
+        monkeypatch.setenv("OVOS_CONFIG_ROOTS", f"ovos={ovos_dir}, neon={neon_dir}")
+        return {"ovos": ovos_dir, "neon": neon_dir}
+
+    def test_default_root_without_env(self, mock_config_dir, monkeypatch):
+        from ovos_skill_config.main import get_config_roots
+
+        monkeypatch.delenv("OVOS_CONFIG_ROOTS", raising=False)
+        assert get_config_roots() == {"default": mock_config_dir}
+
+    def test_invalid_roots_spec_rejected(self, monkeypatch):
+        from ovos_skill_config.main import get_config_roots
+
+        monkeypatch.setenv("OVOS_CONFIG_ROOTS", "no-path-here")
+        with pytest.raises(ValueError, match="OVOS_CONFIG_ROOTS"):
+            get_config_roots()
+
+    def test_roots_are_isolated(self, roots):
+        SkillSettings("shared-skill", roots["ovos"]).replace_settings({"lang": "en"})
+        SkillSettings("shared-skill", roots["neon"]).replace_settings({"lang": "de"})
+
+        response = client.get("/api/v1/roots/ovos/skills/shared-skill")
+        assert response.status_code == 200
+        assert response.json()["settings"] == {"lang": "en"}
+
+        response = client.get("/api/v1/roots/neon/skills/shared-skill")
+        assert response.json()["settings"] == {"lang": "de"}
+
+    def test_list_roots_scans_every_root(self, roots):
+        SkillSettings("a-skill", roots["ovos"]).replace_settings({"k": 1})
+        SkillSettings("b-skill", roots["neon"]).replace_settings({"k": 2})
+        SkillSettings("c-skill", roots["neon"]).replace_settings({})
+
+        response = client.get("/api/v1/roots")
+        assert response.status_code == 200
+        listed = {root["name"]: root for root in response.json()}
+        assert listed["ovos"]["skills"] == ["a-skill"]
+        assert listed["neon"]["skills"] == ["b-skill", "c-skill"]
+        assert listed["neon"]["path"] == str(roots["neon"])
+
+    def test_scoped_list_merge_replace(self, roots):
+        response = client.post("/api/v1/roots/neon/skills/test-skill", json={"a": 1})
+        assert response.status_code == 200
+        response = client.post(
+            "/api/v1/roots/neon/skills/test-skill/merge", json={"b": 2}
+        )
+        assert response.json()["settings"] == {"a": 1, "b": 2}
+
+        response = client.get("/api/v1/roots/neon/skills/test-skill/settings/b")
+        assert response.json()["value"] == 2
+
+        response = client.get("/api/v1/roots/neon/skills")
+        assert response.json() == [{"id": "test-skill", "settings": {"a": 1, "b": 2}}]
+        assert client.get("/api/v1/roots/ovos/skills").json() == []
+
+    def test_unknown_root_is_404(self, roots):
+        response = client.get("/api/v1/roots/missing/skills")
+        assert response.status_code == 404
+        response = client.post("/api/v1/roots/missing/skills/x/merge", json={})
+        assert response.status_code == 404
+        assert not (roots["ovos"] / "x").exists()
+        response = client.get("/api/v1/skills", params={"root": "missing"})
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Unknown config root: missing"
+
+    def test_missing_root_directory_is_404(self, roots, tmp_path, monkeypatch):
+        from ovos_skill_config.main import config_root_problems
+
+        gone = tmp_path / "gone"
+        spec = f"ovos={roots['ovos']},gone={gone}"
+        monkeypatch.setenv("OVOS_CONFIG_ROOTS", spec)
+        response = client.post("/api/v1/roots/gone/skills/x/merge", json={})
+        assert response.status_code == 404
+        assert "'gone'" in response.json()["detail"]
+        assert not gone.exists()
+        listed = {root["name"]: root for root in client.get("/api/v1/roots").json()}
+        assert listed["ovos"]["skills"] == []
+        assert "not a directory" in listed["gone"]["error"]
+        assert config_root_problems() == [listed["gone"]["error"]]
+
+    def test_malformed_roots_spec_is_503(self, monkeypatch):
+        monkeypatch.setenv("OVOS_CONFIG_ROOTS", "=/nowhere")
+        response = client.get("/api/v1/roots/any/skills")
+        assert response.status_code == 503
+        assert "'=/nowhere'" in response.json()["detail"]
+        assert client.get("/api/v1/roots").status_code == 503
+
+
+class TestJsonPatch:
+    def test_parse_json_pointer(self):
+        from ovos_skill_config.main import parse_json_pointer
+
+        assert parse_json_pointer("") == []
+        assert parse_json_pointer("/a/0/b~1c/d~0e") == ["a", "0", "b/c", "d~e"]
+
+    def test_apply_operations(self):
+        from ovos_skill_config.main import apply_json_patch
+
+        document = {"a": {"b": 1}, "items": ["x", "z"]}
+        patched = apply_json_patch(
+            document,
+            [
+                {"op": "replace", "path": "/a/b", "value": 2},
+                {"op": "add", "path": "/items/1", "value": "y"},
+                {"op": "add", "path": "/items/-", "value": "end"},
+                {"op": "copy", "from": "/a", "path": "/c"},
+                {"op": "move", "from": "/c/b", "path": "/moved"},
+                {"op": "remove", "path": "/items/0"},
+                {"op": "test", "path": "/moved", "value": 2},
+            ],
+        )
+        assert patched == {
+            "a": {"b": 2},
+            "items": ["y", "z", "end"],
+            "c": {},
+            "moved": 2,
+        }
+        # The input document is left untouched
+        assert document == {"a": {"b": 1}, "items": ["x", "z"]}
+
+    def test_diff_round_trips(self):
+        from ovos_skill_config.main import apply_json_patch, diff_json_patch
+
+        old = {"a": {"b": 1, "gone": 0}, "list": [1, 2], "flag": 1, "s/l": "x"}
+        new = {"a": {"b": 2}, "list": [1, 2, 3], "flag": True, "s/l": "x", "n": None}
+        operations = diff_json_patch(old, new)
+        assert {"op": "remove", "path": "/a/gone"} in operations
+        assert {"op": "replace", "path": "/flag", "value": True} in operations
+        assert apply_json_patch(old, operations) == new
+        assert diff_json_patch(new, new) == []
+
+    @pytest.mark.parametrize(
+        "operation",
+        [
+            {"op": "remove", "path": "/missing"},
+            {"op": "replace", "path": "/missing", "value": 1},
+            {"op": "add", "path": "/items/9", "value": 1},
+            {"op": "test", "path": "/a", "value": 2},
+            {"op": "add", "path": "no-slash", "value": 1},
+            {"op": "add", "path": "/a"},
+            {"op": "frobnicate", "path": "/a"},
+            {"op": "replace", "path": "", "value": []},
+        ],
+    )
+    def test_invalid_operations_rejected(self, operation):
+        from ovos_skill_config.main import PatchError, apply_json_patch
+
+        with pytest.raises(PatchError):
+            apply_json_patch({"a": 1, "items": []}, [operation])
+
+    def test_patch_endpoint(self, mock_config_dir, test_skill_id):
+        SkillSettings(test_skill_id).replace_settings({"a": 1, "nested": {"b": 2}})
+
+        response = client.patch(
+            f"/api/v1/skills/{test_skill_id}",
+            json=[
+                {"op": "replace", "path": "/nested/b", "value": 3},
+                {"op": "remove", "path": "/a"},
+            ],
+        )
+        assert response.status_code == 200
+        assert response.json()["settings"] == {"nested": {"b": 3}}
+        assert SkillSettings(test_skill_id).settings == {"nested": {"b": 3}}
+
+    def test_patch_endpoint_rejects_bad_patch(self, mock_config_dir, test_skill_id):
+        SkillSettings(test_skill_id).replace_settings({"a": 1})
+
+        response = client.patch(
+            f"/api/v1/skills/{test_skill_id}",
+            json=[
+                {"op": "replace", "path": "/a", "value": 2},
+                {"op": "remove", "path": "/missing"},
+            ],
+        )
+        assert response.status_code == 400
+        # Nothing is written when any operation fails
+        assert SkillSettings(test_skill_id).settings == {"a": 1}
+
+
+class TestApiOnlyMode:
+    """The mode is fixed at import, so each case runs in a fresh interpreter."""
+
+    def run_app(self, code, api_only):
+        env = dict(os.environ, OVOS_CONFIG_API_ONLY="1" if api_only else "")
+        return subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", code],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+
+    PROBE = (
+        "import sys\n"
+        "from fastapi.testclient import TestClient\n"
+        "from ovos_skill_config.main import app\n"
+        "client = TestClient(app)\n"
+        "print(client.get('/status').status_code)\n"
+        "print(client.get('/login').status_code)\n"
+        "print(client.get('/config.json').status_code)\n"
+        "body = {'selector': {'author': 'x'}, 'merge': {}, 'dry_run': True}\n"
+        "print(client.post('/api/v1/skills:bulkMerge', json=body,"
+        " auth=('ovos', 'ovos')).status_code)\n"
+        "print('ovos_skill_config.web' in sys.modules, 'jinja2' in sys.modules)\n"
+    )
+
+    def test_api_only_skips_web_ui(self):
+        assert self.run_app(self.PROBE, api_only=True) == [
+            "200",
+            "404",
+            "404",
+            "200",
+            "False",
+            "False",
+        ]
+
+    def test_full_mode_builds_templates_on_first_render(self):
+        assert self.run_app(self.PROBE, api_only=False) == [
+            "200",
+            "200",
+            "200",
+            "200",
+            "True",
+            "True",
+        ]
+        lazy = self.run_app(
+            "import sys\nimport ovos_skill_config.main\n"
+            "print('jinja2' in sys.modules)\n",
+            api_only=False,
+        )
+        assert lazy == ["False"]
@@ -0,0 +1,108 @@
+"""Tests for memory diagnostics."""
+
+import tracemalloc
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ovos_skill_config import memstats
+from ovos_skill_config.main import (
+    DEFAULT_PASSWORD,
+    DEFAULT_USERNAME,
+    MEMORY_SAMPLER,
+    app,
+)
+from ovos_skill_config.web import MAX_UNDO_SNAPSHOTS
+
+AUTH = (DEFAULT_USERNAME, DEFAULT_PASSWORD)
+pytestmark = pytest.mark.usefixtures("real_auth")
+
+# Allocations that survive between snapshots, for the diff test
+_retained = []
+
+
+@pytest.fixture
+def sampler():
+    yield MEMORY_SAMPLER
+    MEMORY_SAMPLER.stop()
+    _retained.clear()
+
+
+class TestSizes:
+    def test_deep_sizeof_counts_contents_once(self):
+        shared = "x" * 10000
+        size, truncated = memstats.deep_sizeof({"a": shared, "b": [shared]})
+        assert not truncated
+        assert 10000 < size < 20000
+
+    def test_deep_sizeof_truncates(self):
+        size, truncated = memstats.deep_sizeof(list(range(1000)), max_objects=10)
+        assert truncated
+        assert size > 0
+
+    def test_failing_source_reports_error(self, monkeypatch):
+        monkeypatch.setitem(memstats._sources, "broken", lambda: 1 / 0)
+        assert memstats.structures()["broken"] == {
+            "error": "ZeroDivisionError: division by zero"
+        }
+
+
+class TestMemoryEndpoint:
+    def test_requires_auth(self):
+        client = TestClient(app)
+        assert client.get("/api/v1/diagnostics/memory").status_code == 401
+
+    def test_reports_structures(self, monkeypatch):
+        monkeypatch.setattr(
+            "ovos_skill_config.web.UNDO_SNAPSHOTS", {"a.b": {"x": "y" * 5000}}
+        )
+        data = TestClient(app).get("/api/v1/diagnostics/memory", auth=AUTH).json()
+        if memstats.rss_bytes() is not None:
+            assert data["rss_bytes"] > 0
+        undo = data["structures"]["undo_snapshots"]
+        assert undo["entries"] == 1
+        assert undo["bytes"] > 5000
+        assert undo["max_entries"] == MAX_UNDO_SNAPSHOTS
+        assert set(data["structures"]["write_behind"]) == {
+            "pending",
+            "timers",
+            "path_locks",
+        }
+        assert "get_config_dir" in data["structures"]["caches"]
+        assert data["tracemalloc"]["tracing"] is False
+
+
+class TestTracemalloc:
+    def test_snapshot_diff_and_stop(self, sampler):
+        client = TestClient(app)
+        url = "/api/v1/diagnostics/memory/tracemalloc"
+        first = client.post(url, auth=AUTH).json()
+        assert first["started"] is True
+        assert first["tracing"] is True
+
+        _retained.extend(bytearray(1000) for _ in range(500))
+        second = client.post(f"{url}?diff=true&top=5", auth=AUTH).json()
+        assert second["started"] is False and second["diff"] is True
+        assert len(second["top"]) <= 5
+        grown = second["top"][0]
+        assert grown["site"].startswith(__file__)
+        assert grown["size_diff"] >= 500 * 1000
+
+        stopped = client.delete(url, auth=AUTH).json()
+        assert stopped == {"tracing": False, "has_baseline": False}
+        assert not tracemalloc.is_tracing()
+
+    def test_traceback_frames(self, sampler):
+        data = sampler.snapshot(top=3, frames=5)
+        _retained.append(bytearray(10000))
+        data = sampler.snapshot(top=1)
+        assert data["frames"] == 5
+        assert len(data["top"][0]["traceback"]) > 1
+
+    @pytest.mark.parametrize("query", ["top=0", "top=100000", "frames=0"])
+    def test_invalid_parameters(self, query, sampler):
+        response = TestClient(app).post(
+            f"/api/v1/diagnostics/memory/tracemalloc?{query}", auth=AUTH
+        )
+        assert response.status_code == 400
+        assert not tracemalloc.is_tracing()
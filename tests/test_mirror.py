@@ -0,0 +1,229 @@
+"""Tests for the SQLite settings mirror and the endpoints it serves."""
+
+import json
+import os
+from contextlib import contextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ovos_skill_config import iostats
+from ovos_skill_config.main import (
+    DEFAULT_PASSWORD,
+    DEFAULT_USERNAME,
+    SkillSettings,
+    app,
+)
+from ovos_skill_config.mirror import SettingsMirror, flatten
+
+client = TestClient(app)
+AUTH = (DEFAULT_USERNAME, DEFAULT_PASSWORD)
+
+
+@pytest.fixture(params=[False, True], ids=["scan", "mirror"])
+def mirror_mode(request, tmp_path, monkeypatch):
+    """Run API tests both with and without OVOS_CONFIG_MIRROR_DB."""
+    if request.param:
+        monkeypatch.setenv("OVOS_CONFIG_MIRROR_DB", str(tmp_path / "mirror.db"))
+    return request.param
+
+
+def _write(config_dir, skill_id, settings):
+    skill_dir = config_dir / skill_id
+    skill_dir.mkdir(exist_ok=True)
+    (skill_dir / "settings.json").write_text(json.dumps(settings))
+
+
+class TestFlatten:
+    def test_paths_types_and_values(self):
+        rows = list(flatten({"a": {"b/c": [1, None]}, "t": True}))
+        assert rows == [
+            ("/a", "object", None),
+            ("/a/b~1c", "array", None),
+            ("/a/b~1c/0", "number", "1"),
+            ("/a/b~1c/1", "null", "null"),
+            ("/t", "boolean", "true"),
+        ]
+
+
+class TestSettingsMirror:
+    def test_sync_is_incremental(self, tmp_path):
+        config_dir = tmp_path / "skills"
+        config_dir.mkdir()
+        _write(config_dir, "a", {"lang": "en-us"})
+        _write(config_dir, "b", {"lang": "pt-pt"})
+        mirror = SettingsMirror(str(tmp_path / "mirror.db"))
+
+        first = mirror.sync("r", config_dir, ["a", "b"])
+        assert first == {"scanned": 2, "updated": 2, "removed": 0}
+        # Nothing changed on disk: one stat per file, nothing re-read
+        with iostats.budget(stats=2, bytes_read=0):
+            assert mirror.sync("r", config_dir, ["a", "b"])["updated"] == 0
+
+        _write(config_dir, "b", {"lang": "de-de"})
+        os.utime(config_dir / "b" / "settings.json", ns=(1, 1))
+        assert mirror.sync("r", config_dir, ["a", "b"])["updated"] == 1
+        assert [m["id"] for m in mirror.query("r", "/lang", "de-de")] == ["b"]
+
+    def test_touch_without_content_change_skips_reindex(self, tmp_path):
+        config_dir = tmp_path / "skills"
+        config_dir.mkdir()
+        _write(config_dir, "a", {"x": 1})
+        mirror = SettingsMirror(str(tmp_path / "mirror.db"))
+        mirror.sync("r", config_dir, ["a"])
+        os.utime(config_dir / "a" / "settings.json", ns=(5, 5))
+        assert mirror.sync("r", config_dir, ["a"])["updated"] == 0
+
+    def test_removed_skills_are_dropped(self, tmp_path):
+        config_dir = tmp_path / "skills"
+        config_dir.mkdir()
+        _write(config_dir, "a", {"x": 1})
+        mirror = SettingsMirror(str(tmp_path / "mirror.db"))
+        mirror.sync("r", config_dir, ["a"])
+        assert mirror.sync("r", config_dir, [])["removed"] == 1
+        assert mirror.count("r") == 0
+        assert mirror.query("r", "/x") == []
+
+    def test_unparsable_file_mirrored_as_empty(self, tmp_path):
+        config_dir = tmp_path / "skills"
+        config_dir.mkdir()
+        _write(config_dir, "a", {"x": 1})
+        mirror = SettingsMirror(str(tmp_path / "mirror.db"))
+        mirror.sync("r", config_dir, ["a"])
+        (config_dir / "a" / "settings.json").write_text('{"x": ')
+        (config_dir / "b").mkdir()
+        (config_dir / "b" / "settings.json").write_text("[1, 2]")
+        assert mirror.sync("r", config_dir, ["a", "b"])["updated"] == 2
+        assert mirror.list_skills("r") == [
+            {"id": "a", "settings": {}},
+            {"id": "b", "settings": {}},
+        ]
+        assert mirror.query("r", "/x") == []
+        _write(config_dir, "a", {"x": 2})
+        mirror.sync("r", config_dir, ["a", "b"])
+        assert mirror.list_skills("r")[0] == {"id": "a", "settings": {"x": 2}}
+
+    def test_reads_under_lock(self, tmp_path):
+        config_dir = tmp_path / "skills"
+        config_dir.mkdir()
+        _write(config_dir, "a", {"x": 1})
+        locked = []
+
+        @contextmanager
+        def lock(path):
+            locked.append(path)
+            yield
+
+        mirror = SettingsMirror(str(tmp_path / "mirror.db"))
+        mirror.sync("r", config_dir, ["a"], lock=lock)
+        assert locked == [config_dir / "a" / "settings.json"]
+        # Unchanged files are not read again
+        mirror.sync("r", config_dir, ["a"], lock=lock)
+        assert len(locked) == 1
+
+    def test_roots_are_separate(self, tmp_path):
+        config_dir = tmp_path / "skills"
+        config_dir.mkdir()
+        _write(config_dir, "a", {"x": 1})
+        mirror = SettingsMirror(str(tmp_path / "mirror.db"))
+        mirror.sync("one", config_dir, ["a"])
+        assert mirror.count("one") == 1
+        assert mirror.count("two") == 0
+
+
+class TestMirrorAPI:
+    def test_list_skills(self, mock_config_dir, mirror_mode):
+        _write(mock_config_dir, "b", {"y": [1, 2]})
+        _write(mock_config_dir, "a", {"x": {"nested": True}})
+        response = client.get("/api/v1/skills", auth=AUTH)
+        assert response.status_code == 200
+        assert sorted(response.json(), key=lambda skill: skill["id"]) == [
+            {"id": "a", "settings": {"x": {"nested": True}}},
+            {"id": "b", "settings": {"y": [1, 2]}},
+        ]
+
+    def test_list_skills_unparsable_file(self, mock_config_dir, mirror_mode):
+        _write(mock_config_dir, "a", {"x": 1})
+        _write(mock_config_dir, "b", {"y": 2})
+        assert len(client.get("/api/v1/skills", auth=AUTH).json()) == 2
+        (mock_config_dir / "a" / "settings.json").write_text("{not json")
+        response = client.get("/api/v1/skills", auth=AUTH)
+        assert sorted(response.json(), key=lambda skill: skill["id"]) == [
+            {"id": "a", "settings": {}},
+            {"id": "b", "settings": {"y": 2}},
+        ]
+
+    def test_list_skills_sorted_keys(self, mock_config_dir, mirror_mode, monkeypatch):
+        monkeypatch.setenv("OVOS_CONFIG_SORT_KEYS", "true")
+        (mock_config_dir / "a").mkdir()
+        (mock_config_dir / "a" / "settings.json").write_text('{"b": 1, "a": 2}')
+        response = client.get("/api/v1/skills", auth=AUTH)
+        assert list(response.json()[0]["settings"]) == ["a", "b"]
+
+    def test_count(self, mock_config_dir, mirror_mode):
+        for skill_id in ("a", "b", "c"):
+            _write(mock_config_dir, skill_id, {})
+        response = client.get("/api/v1/skills:count", auth=AUTH)
+        assert response.json() == {"count": 3}
+
+    def test_query_by_value(self, mock_config_dir, mirror_mode):
+        _write(mock_config_dir, "a", {"lang": "en-us"})
+        _write(mock_config_dir, "b", {"lang": "pt-pt"})
+        _write(mock_config_dir, "c", {"lang": "en-us", "enabled": True})
+        response = client.get(
+            "/api/v1/skills:query",
+            params={"path": "/lang", "value": "en-us"},
+            auth=AUTH,
+        )
+        assert response.json() == [
+            {"id": "a", "value": "en-us"},
+            {"id": "c", "value": "en-us"},
+        ]
+        response = client.get(
+            "/api/v1/skills:query",
+            params={"path": "/enabled", "value": "true"},
+            auth=AUTH,
+        )
+        assert response.json() == [{"id": "c", "value": True}]
+
+    def test_query_by_presence(self, mock_config_dir, mirror_mode):
+        _write(mock_config_dir, "a", {"radio": {"stations": [1]}})
+        _write(mock_config_dir, "b", {"other": 1})
+        response = client.get(
+            "/api/v1/skills:query", params={"path": "/radio/stations"}, auth=AUTH
+        )
+        assert response.json() == [{"id": "a", "value": None}]
+
+    def test_query_sees_api_writes(self, mock_config_dir, mirror_mode):
+        _write(mock_config_dir, "a", {"lang": "en-us"})
+        assert client.get("/api/v1/skills:count", auth=AUTH).json()["count"] == 1
+        SkillSettings("a").update_setting("lang", "fr-fr")
+        response = client.get(
+            "/api/v1/skills:query",
+            params={"path": "/lang", "value": "fr-fr"},
+            auth=AUTH,
+        )
+        assert response.json() == [{"id": "a", "value": "fr-fr"}]
+
+    def test_query_rejects_bad_pointer(self, mock_config_dir, mirror_mode):
+        for path in ("lang", ""):
+            response = client.get(
+                "/api/v1/skills:query", params={"path": path}, auth=AUTH
+            )
+            assert response.status_code == 400
+
+    def test_root_scoped(self, tmp_path, monkeypatch, mirror_mode):
+        ovos_dir, neon_dir = tmp_path / "ovos", tmp_path / "neon"
+        ovos_dir.mkdir()
+        neon_dir.mkdir()
+        _write(ovos_dir, "a", {"lang": "en-us"})
+        _write(neon_dir, "b", {"lang": "en-us"})
+        monkeypatch.setenv("OVOS_CONFIG_ROOTS", f"ovos={ovos_dir},neon={neon_dir}")
+        response = client.get(
+            "/api/v1/roots/neon/skills:query",
+            params={"path": "/lang", "value": "en-us"},
+            auth=AUTH,
+        )
+        assert response.json() == [{"id": "b", "value": "en-us"}]
+        response = client.get("/api/v1/roots/ovos/skills:count", auth=AUTH)
+        assert response.json() == {"count": 1}
@@ -0,0 +1,254 @@
+"""Tests for streamed export parsing, request size limits and skills:import."""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ovos_skill_config.main import (
+    DEFAULT_PASSWORD,
+    DEFAULT_USERNAME,
+    FIRSTRUN_KEY,
+    app,
+    body_limit,
+    settings_too_deep,
+)
+from ovos_skill_config.records import (
+    RecordParser,
+    RecordSyntaxError,
+    RecordTooLarge,
+    syntax_error,
+)
+
+AUTH = (DEFAULT_USERNAME, DEFAULT_PASSWORD)
+client = TestClient(app)
+
+RECORDS = [
+    {"id": "a.b", "settings": {"x": 1, "nested": {"y": [1, 2]}}},
+    {"id": "c.d", "settings": {}},
+    {"id": "e.f", "settings": {"n": -1.5e3}},
+]
+
+
+@pytest.fixture
+def mock_config_dir(mock_config_dir):
+    (mock_config_dir / "a.b").mkdir()
+    (mock_config_dir / "a.b" / "settings.json").write_text(
+        json.dumps({"old": True, FIRSTRUN_KEY: False})
+    )
+    return mock_config_dir
+
+
+def read_skill(config_dir, skill_id):
+    return json.loads((config_dir / skill_id / "settings.json").read_text())
+
+
+def parse(text, size, **kwargs):
+    parser = RecordParser(**kwargs)
+    records = []
+    for start in range(0, len(text), size):
+        records += parser.feed(text[start : start + size])
+    return records + parser.close()
+
+
+def chunks(data: bytes, size: int = 7):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+class TestRecordParser:
+    @pytest.mark.parametrize("size", [1, 3, 1000])
+    def test_ndjson_and_array(self, size):
+        ndjson = "\n".join(json.dumps(r) for r in RECORDS) + "\n"
+        assert parse(ndjson, size) == RECORDS
+        assert parse(json.dumps(RECORDS, indent=2), size) == RECORDS
+
+    @pytest.mark.parametrize("size", [1, 1000])
+    def test_bad_records_reported(self, size):
+        text = 'not json\n\n{"id": 1, "settings": {}}\n' + json.dumps(RECORDS[0])
+        records = parse(text, size)
+        assert [r.get("error", "")[:9] for r in records] == [
+            "record 1:",
+            "record 2:",
+            "",
+        ]
+        assert records[2] == RECORDS[0]
+
+    @pytest.mark.parametrize(
+        "text,error",
+        [
+            ('[{"id": "a", "settings": {}} {"id": "b"}]', "expected , or ]"),
+            ('[{"id": "a", "settings": {}},', "unterminated array"),
+            ('[{"id": "a", "settings": {}}] trailing', "unexpected data"),
+        ],
+    )
+    def test_malformed_array(self, text, error):
+        records = parse(text, 4)
+        assert records[0] == {"id": "a", "settings": {}}
+        assert error in records[-1]["error"]
+
+    def test_record_size_limit(self):
+        small = json.dumps(RECORDS[1])
+        big = json.dumps({"id": "big", "settings": {"v": "x" * 500}})
+        parser = RecordParser(max_record=100)
+        assert parser.feed(small + "\n") == [RECORDS[1]]
+        # Refused before the end of the record arrives
+        with pytest.raises(RecordTooLarge, match="record 2"):
+            parser.feed(big[:200])
+        # Records before the large one are returned first
+        parser = RecordParser(max_record=100)
+        assert parser.feed(small + "\n" + big) == [RECORDS[1]]
+        with pytest.raises(RecordTooLarge, match="record 2"):
+            parser.close()
+        with pytest.raises(RecordTooLarge):
+            parse(json.dumps([RECORDS[1], json.loads(big)]), 50, max_record=100)
+
+    @pytest.mark.parametrize(
+        "text",
+        ['{"a": "x\\', '{"a": tr', '{"a": -', '{"a": [1.', '{"a": 1.5e-', '{"a" '],
+    )
+    def test_unfinished_json_is_not_an_error(self, text):
+        assert syntax_error(text) is None
+
+    def test_malformed_record_over_limit(self):
+        broken = '{"id": "big" "settings": {"v": "' + "x" * 500
+        with pytest.raises(RecordSyntaxError, match="record 2: Expecting ','"):
+            parse(json.dumps([RECORDS[1]])[:-1] + ", " + broken, 50, max_record=100)
+        with pytest.raises(RecordSyntaxError, match="record 2"):
+            parse(json.dumps(RECORDS[1]) + "\n" + broken, 50, max_record=100)
+        # A line that arrives complete is reported like any other bad record
+        text = broken + '"}}\n' + json.dumps(RECORDS[1])
+        records = parse(text, 1000, max_record=100)
+        assert records[0]["error"].startswith("record 1: Expecting ','")
+        assert records[1] == RECORDS[1]
+
+
+class TestBodyLimits:
+    def test_defaults(self, monkeypatch):
+        monkeypatch.delenv("OVOS_CONFIG_BODY_LIMITS", raising=False)
+        assert body_limit("/api/v1/skills/a.b") == 1024 * 1024
+        assert body_limit("/api/v1/roots/r/skills:import") == 64 * 1024 * 1024
+        monkeypatch.setenv("OVOS_CONFIG_BODY_LIMITS", "/login=512,bad,/web/*=0")
+        assert body_limit("/login") == 512
+        assert body_limit("/web/skills/a.b/set") == 0
+
+    def test_content_length_over_limit(self, mock_config_dir, monkeypatch):
+        monkeypatch.setenv("OVOS_CONFIG_MAX_BODY_BYTES", "100")
+        response = client.post("/api/v1/skills/a.b", json={"v": "x" * 200}, auth=AUTH)
+        assert response.status_code == 413
+        assert read_skill(mock_config_dir, "a.b")["old"] is True
+
+    def test_streamed_body_over_limit(self, mock_config_dir, monkeypatch):
+        monkeypatch.setenv("OVOS_CONFIG_MAX_BODY_BYTES", "100")
+        body = json.dumps({"v": "x" * 200}).encode()
+        response = client.post(
+            "/api/v1/skills/a.b",
+            content=chunks(body),
+            headers={"Content-Type": "application/json"},
+            auth=AUTH,
+        )
+        assert response.status_code == 413
+        assert read_skill(mock_config_dir, "a.b")["old"] is True
+
+    def test_per_route_override(self, mock_config_dir, monkeypatch):
+        monkeypatch.setenv("OVOS_CONFIG_MAX_BODY_BYTES", "100")
+        monkeypatch.setenv("OVOS_CONFIG_BODY_LIMITS", "/api/v1/skills/a.*=1000")
+        response = client.post("/api/v1/skills/a.b", json={"v": "x" * 200}, auth=AUTH)
+        assert response.status_code == 200
+
+    def test_depth_limit(self, mock_config_dir, monkeypatch):
+        monkeypatch.setenv("OVOS_CONFIG_MAX_DEPTH", "3")
+        assert settings_too_deep({"a": [{"b": 1}]}) is False
+        assert settings_too_deep({"a": [{"b": {}}]}) is True
+        deep = {"a": {"b": {"c": {"d": 1}}}}
+        for method, url, body in [
+            ("post", "/api/v1/skills/a.b", deep),
+            ("post", "/api/v1/skills/a.b/merge", deep),
+            (
+                "patch",
+                "/api/v1/skills/a.b",
+                [{"op": "add", "path": "/a", "value": deep}],
+            ),
+        ]:
+            response = client.request(method, url, json=body, auth=AUTH)
+            assert response.status_code == 400, url
+            assert "levels deep" in response.json()["detail"]
+
+
+class TestImportEndpoint:
+    def test_ndjson_streamed(self, mock_config_dir):
+        body = "".join(json.dumps(r) + "\n" for r in RECORDS).encode()
+        response = client.post("/api/v1/skills:import", content=chunks(body), auth=AUTH)
+        assert response.status_code == 200, response.text
+        assert response.json() == {"imported": 3, "errors": []}
+        # Replacing keeps the firstrun marker the export left out
+        assert read_skill(mock_config_dir, "a.b") == {
+            FIRSTRUN_KEY: False,
+            **RECORDS[0]["settings"],
+        }
+        assert read_skill(mock_config_dir, "e.f") == {"n": -1500.0}
+
+    def test_array_merge_with_bad_record(self, mock_config_dir):
+        body = json.dumps([RECORDS[0], {"id": "x"}]).encode()
+        response = client.post(
+            "/api/v1/skills:import?mode=merge", content=chunks(body, 5), auth=AUTH
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["imported"] == 1
+        assert data["errors"] == [{"error": "record 2: settings must be an object"}]
+        assert read_skill(mock_config_dir, "a.b")["old"] is True
+        assert read_skill(mock_config_dir, "a.b")["x"] == 1
+
+    def test_too_deep_record_reported(self, mock_config_dir, monkeypatch):
+        monkeypatch.setenv("OVOS_CONFIG_MAX_DEPTH", "2")
+        body = json.dumps({"id": "g.h", "settings": {"a": {"b": {}}}})
+        response = client.post("/api/v1/skills:import", content=body, auth=AUTH)
+        assert response.json()["errors"][0]["id"] == "g.h"
+        assert not (mock_config_dir / "g.h").exists()
+
+    def test_record_over_limit_stops_import(self, mock_config_dir, monkeypatch):
+        monkeypatch.setenv("OVOS_CONFIG_MAX_BODY_BYTES", "200")
+        big = {"id": "big", "settings": {"v": "x" * 500}}
+        body = "".join(json.dumps(r) + "\n" for r in [RECORDS[1], big, RECORDS[2]])
+        response = client.post(
+            "/api/v1/skills:import", content=chunks(body.encode(), 64), auth=AUTH
+        )
+        assert response.status_code == 413
+        assert response.json()["imported"] == 1
+        assert not (mock_config_dir / "big").exists()
+        assert not (mock_config_dir / "e.f").exists()
+
+    def test_malformed_record_over_limit(self, mock_config_dir, monkeypatch):
+        monkeypatch.setenv("OVOS_CONFIG_MAX_BODY_BYTES", "200")
+        broken = '{"id": "big" "settings": {"v": "' + "x" * 500 + '"}}'
+        body = json.dumps([RECORDS[1]])[:-1] + ", " + broken + "]"
+        response = client.post(
+            "/api/v1/skills:import", content=chunks(body.encode(), 64), auth=AUTH
+        )
+        assert response.status_code == 400
+        assert response.json()["detail"].startswith("record 2: Expecting ','")
+        assert response.json()["imported"] == 1
+
+    @pytest.mark.parametrize("array", [False, True], ids=["ndjson", "array"])
+    def test_deeply_nested_record(self, mock_config_dir, array):
+        deep = '{"id": "g.h", "settings": {"v": ' + "[" * 100000 + "]" * 100000 + "}}"
+        if array:
+            body = "[" + json.dumps(RECORDS[1]) + ", " + deep + "]"
+        else:
+            body = json.dumps(RECORDS[1]) + "\n" + deep + "\n"
+        response = client.post(
+            "/api/v1/skills:import", content=chunks(body.encode(), 4096), auth=AUTH
+        )
+        data = response.json()
+        assert response.status_code == (400 if array else 200)
+        assert data["imported"] == 1
+        error = data["detail"] if array else data["errors"][0]["error"]
+        assert error == "record 2: nested too deeply to parse"
+        assert not (mock_config_dir / "g.h").exists()
+
+    def test_bad_mode(self, mock_config_dir):
+        response = client.post(
+            "/api/v1/skills:import?mode=append", content="", auth=AUTH
+        )
+        assert response.status_code == 400
@@ -0,0 +1,164 @@
+"""Tests for the content-addressed snapshot store and its endpoints."""
+
+import json
+import os
+from contextlib import contextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ovos_skill_config import iostats
+from ovos_skill_config.main import DEFAULT_PASSWORD, DEFAULT_USERNAME, app
+from ovos_skill_config.snapshots import SnapshotNotFound, SnapshotStore
+
+client = TestClient(app)
+AUTH = (DEFAULT_USERNAME, DEFAULT_PASSWORD)
+
+
+@pytest.fixture
+def mock_config_dir(mock_config_dir, tmp_path_factory, monkeypatch):
+    """Temporary config directory, with snapshots kept outside it."""
+    snapshot_dir = tmp_path_factory.mktemp("snapshots")
+    monkeypatch.setenv("OVOS_CONFIG_SNAPSHOT_DIR", str(snapshot_dir))
+    return mock_config_dir
+
+
+def _write(config_dir, skill_id, settings):
+    skill_dir = config_dir / skill_id
+    skill_dir.mkdir(exist_ok=True)
+    (skill_dir / "settings.json").write_text(json.dumps(settings))
+
+
+def _read(config_dir, skill_id):
+    return json.loads((config_dir / skill_id / "settings.json").read_text())
+
+
+def _objects(store_dir):
+    return sorted(p.name for p in (store_dir / "objects").rglob("*") if p.is_file())
+
+
+class TestSnapshotStore:
+    def test_unchanged_files_are_shared(self, tmp_path):
+        config_dir = tmp_path / "skills"
+        config_dir.mkdir()
+        _write(config_dir, "a", {"x": 1})
+        _write(config_dir, "b", {"x": 1})
+        store = SnapshotStore(tmp_path / "store", trust_mtime=True)
+
+        first = store.create(str(config_dir), ["a", "b"])
+        # Identical contents are stored once
+        assert first["new_objects"] == 1
+        with iostats.budget(stats=2, bytes_read=0):
+            second = store.create(str(config_dir), ["a", "b"])
+        assert second["new_objects"] == 0
+        assert len(_objects(tmp_path / "store")) == 1
+
+        _write(config_dir, "b", {"x": 2})
+        os.utime(config_dir / "b" / "settings.json", ns=(1, 1))
+        assert store.create(str(config_dir), ["a", "b"])["new_objects"] == 1
+        assert [s["id"] for s in store.list(str(config_dir))][-1] == first["id"]
+
+    def test_same_size_edit_with_kept_mtime_is_captured(self, tmp_path):
+        config_dir = tmp_path / "skills"
+        config_dir.mkdir()
+        path = config_dir / "a" / "settings.json"
+        _write(config_dir, "a", {"x": 1})
+        store = SnapshotStore(tmp_path / "store")
+        first = store.create(str(config_dir), ["a"])
+        st = path.stat()
+        _write(config_dir, "a", {"x": 2})
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+        second = store.create(str(config_dir), ["a"])
+        assert second["new_objects"] == 1
+        documents = [store.documents(str(config_dir), s["id"]) for s in (first, second)]
+        assert [d["a"] for d in documents] == [{"x": 1}, {"x": 2}]
+
+    def test_unparsable_file_left_out(self, tmp_path):
+        config_dir = tmp_path / "skills"
+        config_dir.mkdir()
+        _write(config_dir, "a", {"x": 1})
+        (config_dir / "b").mkdir()
+        # As a reader could see a file mid-write
+        (config_dir / "b" / "settings.json").write_text('{"x": ')
+        locked = []
+
+        @contextmanager
+        def lock(path):
+            locked.append(path.parent.name)
+            yield
+
+        store = SnapshotStore(tmp_path / "store")
+        summary = store.create(str(config_dir), ["a", "b"], lock=lock)
+        assert summary["skills"] == 1
+        assert locked == ["a", "b"]
+        assert store.documents(str(config_dir), summary["id"]) == {"a": {"x": 1}}
+
+    def test_retention_prunes_manifests_and_objects(self, tmp_path):
+        config_dir = tmp_path / "skills"
+        config_dir.mkdir()
+        store = SnapshotStore(tmp_path / "store", retention=2)
+        ids = []
+        for value in range(4):
+            _write(config_dir, "a", {"x": value})
+            os.utime(config_dir / "a" / "settings.json", ns=(value, value))
+            ids.append(store.create(str(config_dir), ["a"])["id"])
+        assert [s["id"] for s in store.list(str(config_dir))] == ids[:1:-1]
+        assert len(_objects(tmp_path / "store")) == 2
+        with pytest.raises(SnapshotNotFound):
+            store.get(str(config_dir), ids[0])
+
+    def test_documents_and_unknown_ids(self, tmp_path):
+        config_dir = tmp_path / "skills"
+        config_dir.mkdir()
+        _write(config_dir, "a", {"x": 1})
+        store = SnapshotStore(tmp_path / "store")
+        snapshot_id = store.create(str(config_dir), ["a"])["id"]
+        assert store.documents(str(config_dir), snapshot_id) == {"a": {"x": 1}}
+        for bad in ("../../etc/passwd", "nope"):
+            with pytest.raises(SnapshotNotFound):
+                store.get(str(config_dir), bad)
+        # Snapshots are scoped to the directory they were taken from
+        with pytest.raises(SnapshotNotFound):
+            store.get(str(tmp_path / "other"), snapshot_id)
+
+
+class TestSnapshotAPI:
+    def test_create_list_restore(self, mock_config_dir):
+        _write(mock_config_dir, "a", {"lang": "en-us"})
+        _write(mock_config_dir, "b", {"volume": 5})
+        created = client.post("/api/v1/snapshots", auth=AUTH).json()
+        assert created["skills"] == 2
+
+        _write(mock_config_dir, "a", {"lang": "de-de"})
+        _write(mock_config_dir, "b", {"volume": 9})
+        _write(mock_config_dir, "c", {"new": True})
+        listed = client.get("/api/v1/snapshots", auth=AUTH).json()
+        assert [s["id"] for s in listed] == [created["id"]]
+        manifest = client.get(f"/api/v1/snapshots/{created['id']}", auth=AUTH).json()
+        assert sorted(manifest["skills"]) == ["a", "b"]
+
+        response = client.post(f"/api/v1/snapshots/{created['id']}/restore", auth=AUTH)
+        assert response.json() == {"id": created["id"], "restored": ["a", "b"]}
+        assert _read(mock_config_dir, "a") == {"lang": "en-us"}
+        assert _read(mock_config_dir, "b") == {"volume": 5}
+        assert _read(mock_config_dir, "c") == {"new": True}
+
+    def test_restore_subset(self, mock_config_dir):
+        _write(mock_config_dir, "a", {"x": 1})
+        _write(mock_config_dir, "b", {"x": 1})
+        snapshot_id = client.post("/api/v1/snapshots", auth=AUTH).json()["id"]
+        _write(mock_config_dir, "a", {"x": 2})
+        _write(mock_config_dir, "b", {"x": 2})
+        response = client.post(
+            f"/api/v1/snapshots/{snapshot_id}/restore",
+            json={"skills": ["b"]},
+            auth=AUTH,
+        )
+        assert response.json()["restored"] == ["b"]
+        assert _read(mock_config_dir, "a") == {"x": 2}
+
+    def test_unknown_snapshot(self, mock_config_dir):
+        assert client.get("/api/v1/snapshots/missing", auth=AUTH).status_code == 404
+        response = client.post("/api/v1/snapshots/missing/restore", auth=AUTH)
+        assert response.status_code == 404
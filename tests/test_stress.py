@@ -0,0 +1,257 @@
+"""Concurrency stress and soak tests for the settings storage layer.
+
+Writers and readers hit the same skill at once through the REST API, the
+htmx endpoints, SkillSettings directly and a separate process, each for
+OVOS_CONFIG_STRESS_SECONDS (default 2). Set it to e.g. 300 for a soak run;
+run with -s to see throughput and latency per operation.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import pytest
+from fastapi.testclient import TestClient
+from json_database import JsonStorage
+
+from ovos_skill_config.main import (
+    DEFAULT_PASSWORD,
+    DEFAULT_USERNAME,
+    WRITE_BEHIND,
+    SkillSettings,
+    app,
+)
+from ovos_skill_config.web import AUTH_COOKIE_NAME, MAX_UNDO_SNAPSHOTS, UNDO_SNAPSHOTS
+
+pytestmark = pytest.mark.stress
+
+DURATION = float(os.getenv("OVOS_CONFIG_STRESS_SECONDS", "2"))
+AUTH = (DEFAULT_USERNAME, DEFAULT_PASSWORD)
+SKILL_ID = "stress-test.author"
+
+# A well-behaved external writer (an OVOS skill, a provisioning script):
+# read-modify-write of its own key under json_database's lock for the file.
+EXTERNAL_WRITER = textwrap.dedent(
+    """
+    import json, sys, time
+    from json_database import JsonStorage
+
+    path, duration = sys.argv[1], float(sys.argv[2])
+    lock = JsonStorage(path).lock
+    n, deadline = 0, time.monotonic() + duration
+    while time.monotonic() < deadline:
+        n += 1
+        with lock:
+            with open(path, encoding="utf-8") as f:
+                document = json.load(f)
+            document["external"] = n
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(document, f, indent=4)
+        time.sleep(0.005)
+    print(n)
+    """
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_undo_snapshots():
+    UNDO_SNAPSHOTS.clear()
+    yield
+    UNDO_SNAPSHOTS.clear()
+
+
+def web_client() -> TestClient:
+    client = TestClient(app)
+    client.post(
+        "/login",
+        data={"username": DEFAULT_USERNAME, "password": DEFAULT_PASSWORD},
+        follow_redirects=False,
+    )
+    assert client.cookies.get(AUTH_COOKIE_NAME)
+    return client
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def report(scenario: str, latencies: Dict[str, List[float]], elapsed: float):
+    print(f"\n{scenario} ({elapsed:.1f}s)")
+    print(f"  {'operation':<12} {'ops':>7} {'ops/s':>8} {'p50':>8} {'p99':>8} ms")
+    for name, samples in sorted(latencies.items()):
+        if not samples:
+            continue
+        print(
+            f"  {name:<12} {len(samples):>7} {len(samples) / elapsed:>8.0f}"
+            f" {statistics.median(samples) * 1000:>8.1f}"
+            f" {percentile(samples, 0.99) * 1000:>8.1f}"
+        )
+
+
+def run_for(
+    duration: float, workers: Dict[str, Callable[[int], None]]
+) -> Dict[str, List[float]]:
+    """Call each worker(n) with n = 1, 2, ... in its own thread until time's up.
+
+    Returns the latency of every call per worker; the first exception in
+    any worker stops all of them and is re-raised.
+    """
+    latencies: Dict[str, List[float]] = {name: [] for name in workers}
+    errors: List[BaseException] = []
+    deadline = time.monotonic() + duration
+
+    def loop(name, worker):
+        n = 0
+        try:
+            while time.monotonic() < deadline and not errors:
+                n += 1
+                start = time.perf_counter()
+                worker(n)
+                latencies[name].append(time.perf_counter() - start)
+        except BaseException as exc:
+            errors.append(exc)
+
+    threads = [
+        threading.Thread(target=loop, args=item, daemon=True)
+        for item in workers.items()
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return latencies
+
+
+class TestConcurrentWriters:
+    WRITERS = ("rest0", "rest1", "web0", "web1", "direct0", "direct1")
+
+    def make_workers(self, last: Dict[str, int]) -> Dict[str, Callable]:
+        """Writers that each own one key, and readers checking every key."""
+        api, web = TestClient(app), [web_client(), web_client()]
+        workers = {}
+
+        def rest(key):
+            def write(n):
+                response = api.post(
+                    f"/api/v1/skills/{SKILL_ID}/merge", json={key: n}, auth=AUTH
+                )
+                assert response.status_code == 200, response.text
+                last[key] = n
+
+            return write
+
+        def htmx(key, client):
+            def write(n):
+                response = client.post(
+                    f"/web/skills/{SKILL_ID}/set",
+                    data={"path": json.dumps([key]), "type": "number", "value": n},
+                )
+                assert response.status_code == 200, response.text
+                last[key] = n
+
+            return write
+
+        def direct(key):
+            def write(n):
+                SkillSettings(SKILL_ID).update_setting(key, n)
+                last[key] = n
+
+            return write
+
+        def api_reader(n):
+            response = api.get(f"/api/v1/skills/{SKILL_ID}", auth=AUTH)
+            assert response.status_code == 200
+            assert set(self.WRITERS) <= response.json()["settings"].keys()
+
+        def file_reader(n):
+            # How a running skill reads its settings (under the same lock)
+            document = JsonStorage(str(self.path))
+            assert set(self.WRITERS) <= document.keys(), dict(document)
+
+        workers.update({key: rest(key) for key in self.WRITERS[:2]})
+        workers.update(
+            {key: htmx(key, client) for key, client in zip(self.WRITERS[2:4], web)}
+        )
+        workers.update({key: direct(key) for key in self.WRITERS[4:]})
+        workers.update({"api-read": api_reader, "file-read": file_reader})
+        return workers
+
+    def seed(self, config_dir):
+        self.path = config_dir / SKILL_ID / "settings.json"
+        SkillSettings(SKILL_ID).replace_settings(
+            {key: 0 for key in self.WRITERS} | {"external": 0}
+        )
+
+    def test_no_lost_updates_with_external_process(self, mock_config_dir):
+        self.seed(mock_config_dir)
+        last: Dict[str, int] = {}
+        external = subprocess.Popen(
+            [sys.executable, "-c", EXTERNAL_WRITER, str(self.path), str(DURATION)],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        start = time.monotonic()
+        latencies = run_for(DURATION, self.make_workers(last))
+        last["external"] = int(external.communicate(timeout=60)[0])
+        report("mixed writers + external process", latencies, time.monotonic() - start)
+
+        final = json.loads(self.path.read_text())
+        assert {key: final[key] for key in last} == last
+        assert all(last[key] > 0 for key in self.WRITERS)
+
+    def test_no_lost_updates_in_write_behind_mode(self, mock_config_dir, monkeypatch):
+        self.seed(mock_config_dir)
+        monkeypatch.setenv("OVOS_CONFIG_WRITE_BEHIND_MS", "20")
+        last: Dict[str, int] = {}
+        start = time.monotonic()
+        latencies = run_for(DURATION, self.make_workers(last))
+        WRITE_BEHIND.flush()
+        report("mixed writers, write-behind", latencies, time.monotonic() - start)
+
+        final = json.loads(self.path.read_text())
+        assert {key: final[key] for key in last} == last
+
+
+class TestSoak:
+    def test_memory_stays_bounded(self, mock_config_dir):
+        """Edits spread over many skills: undo history and memory level off."""
+        client = web_client()
+        skill_count = MAX_UNDO_SNAPSHOTS * 2
+
+        def edit(n):
+            response = client.post(
+                f"/web/skills/skill-{n % skill_count}.author/set",
+                data={"path": '["n"]', "type": "number", "value": n},
+            )
+            assert response.status_code == 200
+
+        # Warm up: every skill exists and the undo history is full
+        for n in range(skill_count):
+            edit(n)
+        tracemalloc.start()
+        try:
+            start = time.monotonic()
+            latencies = run_for(DURATION / 2, {"edit": edit})
+            baseline = tracemalloc.take_snapshot()
+            latencies["edit"] += run_for(DURATION / 2, {"edit": edit})["edit"]
+            growth = sum(
+                stat.size_diff
+                for stat in tracemalloc.take_snapshot().compare_to(baseline, "filename")
+            )
+        finally:
+            tracemalloc.stop()
+        report("soak: edits over many skills", latencies, time.monotonic() - start)
+        print(f"  memory growth over second half: {growth / 1024:.0f} KiB")
+
+        assert len(UNDO_SNAPSHOTS) <= MAX_UNDO_SNAPSHOTS
+        assert growth < 2 * 1024 * 1024
@@ -0,0 +1,128 @@
+"""Tests for per-request phase timing and the Server-Timing header."""
+
+import contextvars
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ovos_skill_config import timing
+from ovos_skill_config.main import (
+    DEFAULT_PASSWORD,
+    DEFAULT_USERNAME,
+    app,
+)
+
+AUTH = (DEFAULT_USERNAME, DEFAULT_PASSWORD)
+pytestmark = pytest.mark.usefixtures("real_auth")
+
+
+class TestPhases:
+    def test_noop_outside_track(self):
+        with timing.phase("read"):
+            pass
+        assert timing.current() is None
+
+    def test_nested_phases_are_exclusive(self):
+        with timing.track() as timings:
+            with timing.phase("render"):
+                time.sleep(0.01)
+                with timing.phase("read"):
+                    time.sleep(0.1)
+                time.sleep(0.01)
+        assert timings.durations["read"] >= 0.1
+        # Without the read, which would take it past 0.12
+        assert 0.02 <= timings.durations["render"] < 0.08
+
+    def test_reentering_the_same_phase_counts_once(self):
+        with timing.track() as timings:
+            with timing.phase("read"):
+                with timing.phase("read"):
+                    time.sleep(0.05)
+        assert 0.05 <= timings.durations["read"] < 0.1
+
+    def test_work_handed_to_threads_is_included(self):
+        def work():
+            with timing.phase("read"):
+                time.sleep(0.02)
+
+        with timing.track() as timings:
+            with timing.phase("render"):
+                threads = [
+                    threading.Thread(
+                        target=contextvars.copy_context().run, args=(work,)
+                    )
+                    for _ in range(3)
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+        assert timings.durations["read"] >= 0.06
+        # The handing-off thread's phase keeps running meanwhile
+        assert timings.durations["render"] >= 0.02
+
+    def test_header_round_trip(self):
+        timings = timing.Timings()
+        timings.add("render", 0.0125)
+        timings.add("auth", 0.001)
+        timings.add("custom", 0.002)
+        value = timing.header_value(timings, 0.02)
+        assert value.startswith('auth;desc="Credential/session check";dur=1.00, ')
+        assert timing.from_header(value) == {
+            "auth": 1.0,
+            "render": 12.5,
+            "custom": 2.0,
+            "total": 20.0,
+        }
+
+
+class TestServerTimingHeader:
+    @pytest.fixture(autouse=True)
+    def enabled(self, monkeypatch):
+        monkeypatch.setenv("OVOS_CONFIG_SERVER_TIMING", "1")
+
+    def durations(self, response):
+        return timing.from_header(response.headers["Server-Timing"])
+
+    def test_disabled_by_default(self, mock_config_dir, monkeypatch):
+        monkeypatch.delenv("OVOS_CONFIG_SERVER_TIMING")
+        response = TestClient(app).get("/api/v1/skills", auth=AUTH)
+        assert "Server-Timing" not in response.headers
+
+    def test_api_read(self, mock_config_dir):
+        (mock_config_dir / "a.b").mkdir()
+        (mock_config_dir / "a.b" / "settings.json").write_text('{"x": 1}')
+        response = TestClient(app).get("/api/v1/skills", auth=AUTH)
+        assert response.status_code == 200
+        assert {"auth", "scan", "read", "total"} <= self.durations(response).keys()
+
+    def test_api_merge(self, mock_config_dir):
+        response = TestClient(app).post(
+            "/api/v1/skills/a.b/merge", json={"x": 1}, auth=AUTH
+        )
+        assert response.status_code == 200
+        assert {"lock", "read", "mutate", "write"} <= self.durations(response).keys()
+
+    def test_web_edit(self, mock_config_dir):
+        response = TestClient(app).post(
+            "/web/skills/a.b/set",
+            data={"path": '["x"]', "type": "number", "value": "2"},
+            auth=AUTH,
+        )
+        assert response.status_code == 200
+        assert {"auth", "mutate", "write", "render"} <= self.durations(response).keys()
+
+    def test_streamed_index_is_timed_in_full(self, mock_config_dir):
+        for n in range(3):
+            (mock_config_dir / f"skill-{n}.author").mkdir()
+            (mock_config_dir / f"skill-{n}.author" / "settings.json").write_text(
+                '{"x": 1}'
+            )
+        response = TestClient(app).get("/", auth=AUTH)
+        assert response.status_code == 200
+        assert response.text.count('class="skill-card') == 3
+        durations = self.durations(response)
+        assert {"scan", "read", "render"} <= durations.keys()
+        assert durations["total"] >= durations["read"] + durations["render"]
@@ -0,0 +1,206 @@
+"""Tests for request tracing and its exporters."""
+
+import json
+import logging
+from contextlib import contextmanager
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ovos_skill_config import tracing
+from ovos_skill_config.main import (
+    DEFAULT_PASSWORD,
+    DEFAULT_USERNAME,
+    app,
+)
+
+AUTH = (DEFAULT_USERNAME, DEFAULT_PASSWORD)
+pytestmark = pytest.mark.usefixtures("real_auth", "sample_skill")
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+@pytest.fixture
+def trace_file(tmp_path, monkeypatch):
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setenv("OVOS_CONFIG_TRACE", f"file:{path}")
+    return path
+
+
+def read_spans(path):
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestSpans:
+    def test_disabled_span_is_shared_noop(self):
+        assert tracing.span("a") is tracing.span("b", x=1) is tracing.NO_SPAN
+        with tracing.span("a") as span:
+            span.set(y=2)
+
+    def test_parents_and_errors(self):
+        trace = tracing.Trace("0" * 31 + "1")
+        token = tracing.activate(trace)
+        try:
+            with tracing.span("outer") as outer:
+                with pytest.raises(KeyError):
+                    with tracing.span("inner", n=1):
+                        raise KeyError("k")
+        finally:
+            tracing.deactivate(token)
+        inner, recorded_outer = trace.spans
+        assert recorded_outer is outer
+        assert inner.parent_id == outer.span_id
+        assert inner.as_dict()["status"] == "ERROR"
+        assert outer.as_dict()["status"] == "OK"
+        assert "inner" in tracing.format_tree(trace.spans)
+
+    def test_span_limit(self):
+        trace = tracing.Trace("1" * 32)
+        token = tracing.activate(trace)
+        try:
+            with patch.object(tracing, "MAX_SPANS", 3):
+                for _ in range(5):
+                    with tracing.span("s"):
+                        pass
+        finally:
+            tracing.deactivate(token)
+        assert (len(trace.spans), trace.dropped) == (3, 2)
+
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            (f"00-{TRACE_ID}-{PARENT_ID}-01", (TRACE_ID, PARENT_ID, True)),
+            (f"00-{TRACE_ID}-{PARENT_ID}-00", (TRACE_ID, PARENT_ID, False)),
+            (f"00-{'0' * 32}-{PARENT_ID}-01", None),
+            ("00-xyz-123-01", None),
+            ("", None),
+        ],
+    )
+    def test_parse_traceparent(self, value, expected):
+        assert tracing.parse_traceparent(value) == expected
+
+
+class TestTracingMiddleware:
+    def test_off_by_default(self, mock_config_dir, monkeypatch):
+        monkeypatch.delenv("OVOS_CONFIG_TRACE", raising=False)
+        response = TestClient(app).get("/api/v1/skills", auth=AUTH)
+        assert "X-Trace-Id" not in response.headers
+
+    def test_file_exporter(self, mock_config_dir, trace_file):
+        response = TestClient(app).post(
+            "/api/v1/skills/a.b/merge", json={"y": 2}, auth=AUTH
+        )
+        assert response.status_code == 200
+        spans = read_spans(trace_file)
+        root = next(s for s in spans if s["parent_span_id"] is None)
+        assert root["name"] == "POST /api/v1/skills/{skill_id}/merge"
+        assert root["attributes"]["http.status_code"] == 200
+        assert response.headers["X-Trace-Id"] == root["trace_id"]
+        names = {s["name"] for s in spans}
+        assert {
+            "auth.basic",
+            "settings.read",
+            "settings.merge",
+            "settings.write",
+        } <= names
+        assert all(s["trace_id"] == root["trace_id"] for s in spans)
+
+    def test_web_spans_and_traceparent(self, mock_config_dir, trace_file):
+        response = TestClient(app).post(
+            "/web/skills/a.b/set",
+            data={"path": '["x"]', "type": "number", "value": "3"},
+            auth=AUTH,
+            headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"},
+        )
+        assert response.status_code == 200
+        spans = {s["name"]: s for s in read_spans(trace_file)}
+        root = spans["POST /web/skills/{skill_id}/set"]
+        assert root["trace_id"] == TRACE_ID
+        assert root["parent_span_id"] == PARENT_ID
+        assert spans["web.mutate"]["parent_span_id"] == root["span_id"]
+        assert (
+            spans["settings.write"]["parent_span_id"] == spans["web.mutate"]["span_id"]
+        )
+        assert spans["render"]["attributes"]["template"] == "partials/skill_card.html"
+
+    def test_streamed_page_reads_are_children_of_render(
+        self, mock_config_dir, trace_file
+    ):
+        assert TestClient(app).get("/", auth=AUTH).status_code == 200
+        spans = read_spans(trace_file)
+        render = next(s for s in spans if s["name"] == "render")
+        reads = [s for s in spans if s["name"] == "settings.read"]
+        assert reads and all(s["parent_span_id"] == render["span_id"] for s in reads)
+
+    def test_sampling(self, mock_config_dir, trace_file, monkeypatch):
+        monkeypatch.setenv("OVOS_CONFIG_TRACE_SAMPLE", "0")
+        client = TestClient(app)
+        client.get("/api/v1/skills", auth=AUTH)
+        assert read_spans(trace_file) == []
+        # An upstream sampling decision wins
+        client.get(
+            "/api/v1/skills",
+            auth=AUTH,
+            headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"},
+        )
+        assert {s["trace_id"] for s in read_spans(trace_file)} == {TRACE_ID}
+
+    def test_slow_requests_kept_when_not_sampled(
+        self, mock_config_dir, trace_file, monkeypatch
+    ):
+        monkeypatch.setenv("OVOS_CONFIG_TRACE_SAMPLE", "0")
+        monkeypatch.setenv("OVOS_CONFIG_TRACE_SLOW_MS", "100000")
+        client = TestClient(app)
+        response = client.get("/api/v1/skills", auth=AUTH)
+        assert "X-Trace-Id" not in response.headers
+        assert read_spans(trace_file) == []
+        monkeypatch.setenv("OVOS_CONFIG_TRACE_SLOW_MS", "0")
+        client.get("/api/v1/skills", auth=AUTH)
+        assert read_spans(trace_file)
+
+    def test_console_exporter(self, mock_config_dir, monkeypatch, capsys):
+        monkeypatch.setenv("OVOS_CONFIG_TRACE", "console")
+        TestClient(app).get("/api/v1/skills/a.b", auth=AUTH)
+        err = capsys.readouterr().err
+        assert "GET /api/v1/skills/{skill_id}" in err
+        assert "\n    settings.read" in err
+
+    def test_otel_mode(self, mock_config_dir, monkeypatch):
+        if not tracing.otel_installed():
+            pytest.skip("opentelemetry-api is not installed")
+        monkeypatch.setenv("OVOS_CONFIG_TRACE", "otel")
+        started = []
+
+        class FakeSpan:
+            def set_attribute(self, key, value):
+                pass
+
+            def set_attributes(self, attributes):
+                pass
+
+        class FakeTracer:
+            @contextmanager
+            def start_as_current_span(self, name, **kwargs):
+                started.append((name, kwargs.get("kind")))
+                yield FakeSpan()
+
+        with patch.object(tracing, "_otel_tracer", return_value=FakeTracer()):
+            response = TestClient(app).get("/api/v1/skills/a.b", auth=AUTH)
+        assert response.status_code == 200
+        names = [name for name, _ in started]
+        assert names[0] == "GET /api/v1/skills/a.b"
+        assert str(started[0][1]) == "SpanKind.SERVER"
+        assert {"auth.basic", "settings.read"} <= set(names)
+
+    def test_otel_missing_warns_and_serves(self, mock_config_dir, monkeypatch, caplog):
+        monkeypatch.setenv("OVOS_CONFIG_TRACE", "otel")
+        monkeypatch.setattr("ovos_skill_config.main._otel_missing_warned", False)
+        with patch.object(tracing, "otel_installed", return_value=False):
+            with caplog.at_level(logging.WARNING):
+                client = TestClient(app)
+                assert client.get("/api/v1/skills", auth=AUTH).status_code == 200
+                assert client.get("/api/v1/skills", auth=AUTH).status_code == 200
+        assert caplog.text.count("opentelemetry-api") == 1
@@ -2,11 +2,12 @@
 
 import base64
 import json
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
+from ovos_skill_config import web
 from ovos_skill_config.main import (
     DEFAULT_PASSWORD,
     DEFAULT_USERNAME,
@@ -26,13 +27,6 @@ def _basic_headers() -> dict:
     return {"Authorization": f"Basic {_basic_token()}"}
 
 
-@pytest.fixture
-def mock_config_dir(tmp_path):
-    """Create a temporary config directory for testing."""
-    with patch("ovos_skill_config.main.get_config_dir", return_value=tmp_path):
-        yield tmp_path
-
-
 @pytest.fixture(autouse=True)
 def clear_undo_snapshots():
     UNDO_SNAPSHOTS.clear()
@@ -270,6 +264,96 @@ class TestIndexRendering:
         assert "<img src=x onerror=alert(1)>" not in response.text
 
 
+class TestPagedRendering:
+    @pytest.fixture(autouse=True)
+    def small_pages(self, monkeypatch):
+        monkeypatch.setenv("OVOS_CONFIG_RENDER_PAGE_SIZE", "10")
+
+    def test_large_array_renders_first_page(self, mock_config_dir, auth_client):
+        items = [f"station-{i:04d}" for i in range(25)]
+        SkillSettings("test-skill").replace_settings({"stations": items})
+
+        response = auth_client.get("/")
+        assert response.status_code == 200
+        assert "station-0009" in response.text
+        assert "station-0010" not in response.text
+        assert "Load more (15 remaining)" in response.text
+        assert "offset=10" in response.text
+
+    def test_node_endpoint_returns_next_page(self, mock_config_dir, auth_client):
+        items = [f"station-{i:04d}" for i in range(25)]
+        SkillSettings("test-skill").replace_settings({"stations": items})
+
+        response = auth_client.get(
+            "/web/skills/test-skill/node",
+            params={"path": '["stations"]', "offset": 20},
+        )
+        assert response.status_code == 200
+        assert "station-0019" not in response.text
+        assert "station-0020" in response.text
+        assert "station-0024" in response.text
+        assert "Load more" not in response.text
+        # Array items keep their absolute index for edit/delete paths
+        assert "[24]" in response.text
+        assert '["stations", 24]' in response.text
+
+    def test_large_object_paged(self, mock_config_dir, auth_client):
+        vocab = {f"word{i:03d}": i for i in range(15)}
+        SkillSettings("test-skill").replace_settings({"vocab": vocab})
+
+        response = auth_client.get(
+            "/web/skills/test-skill/node",
+            params={"path": '["vocab"]', "offset": 10},
+        )
+        assert response.status_code == 200
+        assert "word009" not in response.text
+        assert "word010" in response.text
+
+    def test_top_level_keys_paged(self, mock_config_dir, auth_client):
+        settings = {f"key{i:03d}": i for i in range(12)}
+        SkillSettings("test-skill").replace_settings(settings)
+
+        response = auth_client.get("/")
+        assert "key009" in response.text
+        assert "key010" not in response.text
+        assert "12 settings" in response.text
+
+        response = auth_client.get(
+            "/web/skills/test-skill/node", params={"path": "[]", "offset": 10}
+        )
+        assert response.status_code == 200
+        assert "key011" in response.text
+        assert "settings-entry" in response.text
+
+    def test_small_containers_have_no_load_more(self, mock_config_dir, auth_client):
+        SkillSettings("test-skill").replace_settings({"items": ["a", "b"]})
+
+        response = auth_client.get("/")
+        assert "Load more" not in response.text
+
+    def test_node_endpoint_rejects_scalar_and_bad_path(
+        self, mock_config_dir, auth_client
+    ):
+        SkillSettings("test-skill").replace_settings({"a": 1})
+
+        response = auth_client.get(
+            "/web/skills/test-skill/node", params={"path": '["a"]'}
+        )
+        assert response.status_code == 400
+        response = auth_client.get(
+            "/web/skills/test-skill/node", params={"path": '["missing"]'}
+        )
+        assert response.status_code == 400
+
+    def test_node_endpoint_requires_auth(self, mock_config_dir):
+        response = client.get(
+            "/web/skills/test-skill/node",
+            params={"path": "[]"},
+            follow_redirects=False,
+        )
+        assert response.status_code in (302, 303, 401)
+
+
 class TestMutationEndpoints:
     def test_set_string(self, mock_config_dir, auth_client):
         settings = SkillSettings("test-skill")
@@ -494,6 +578,61 @@ class TestMutationEndpoints:
         assert SkillSettings("test-skill").settings == {"a": 1}
 
 
+class TestStructuralSharing:
+    def test_set_copies_only_the_path(self):
+        from ovos_skill_config.web import _set_at_path
+
+        document = {"a": {"x": 1, "y": [1, 2]}, "b": {"big": list(range(100))}}
+        updated = _set_at_path(document, ["a", "x"], 2)
+
+        assert updated == {"a": {"x": 2, "y": [1, 2]}, "b": document["b"]}
+        assert document["a"]["x"] == 1
+        assert updated["b"] is document["b"]
+        assert updated["a"]["y"] is document["a"]["y"]
+        assert updated["a"] is not document["a"]
+
+    def test_delete_and_add_leave_original_intact(self):
+        from ovos_skill_config.web import _add_entry, _delete_at_path
+
+        document = {"items": ["a", "b"], "other": {"k": "v"}}
+        removed = _delete_at_path(document, ["items", 0])
+        added = _add_entry(document, ["items"], "", "c")
+
+        assert removed["items"] == ["b"]
+        assert added["items"] == ["a", "b", "c"]
+        assert document == {"items": ["a", "b"], "other": {"k": "v"}}
+        assert removed["other"] is document["other"]
+
+    def test_edit_reads_settings_file_once(self, mock_config_dir, auth_client):
+        from json_database import JsonStorage
+
+        SkillSettings("test-skill").replace_settings({"a": {"b": 1}})
+        with patch.object(
+            JsonStorage, "load_local", autospec=True, side_effect=JsonStorage.load_local
+        ) as load:
+            response = auth_client.post(
+                "/web/skills/test-skill/set",
+                data={"path": '["a", "b"]', "type": "number", "value": "2"},
+            )
+        assert response.status_code == 200
+        assert load.call_count == 1
+        assert SkillSettings("test-skill").settings == {"a": {"b": 2}}
+
+    def test_undo_snapshot_unaffected_by_later_edit(self, mock_config_dir, auth_client):
+        SkillSettings("test-skill").replace_settings({"a": {"b": 1}, "c": [1]})
+
+        auth_client.post(
+            "/web/skills/test-skill/set",
+            data={"path": '["a", "b"]', "type": "number", "value": "2"},
+        )
+        auth_client.post(
+            "/web/skills/test-skill/add",
+            data={"container_path": '["c"]', "type": "number", "value": "2"},
+        )
+        auth_client.post("/web/skills/test-skill/undo")
+        assert SkillSettings("test-skill").settings == {"a": {"b": 2}, "c": [1]}
+
+
 class TestUndo:
     def test_undo_restores_previous_settings(self, mock_config_dir, auth_client):
         SkillSettings("test-skill").replace_settings({"a": 1})
@@ -522,6 +661,25 @@ class TestUndo:
         assert response.status_code == 400
         assert SkillSettings("test-skill").settings == {"a": 1}
 
+    def test_noop_edit_keeps_undo_snapshot(self, mock_config_dir, auth_client):
+        SkillSettings("test-skill").replace_settings({"a": 1})
+        settings_file = mock_config_dir / "test-skill" / "settings.json"
+
+        auth_client.post(
+            "/web/skills/test-skill/set",
+            data={"path": '["a"]', "type": "number", "value": "2"},
+        )
+        mtime = settings_file.stat().st_mtime_ns
+        # Saving the same value again writes nothing and keeps the undo slot
+        auth_client.post(
+            "/web/skills/test-skill/set",
+            data={"path": '["a"]', "type": "number", "value": "2"},
+        )
+        assert settings_file.stat().st_mtime_ns == mtime
+
+        auth_client.post("/web/skills/test-skill/undo")
+        assert SkillSettings("test-skill").settings == {"a": 1}
+
     def test_undo_after_delete(self, mock_config_dir, auth_client):
         SkillSettings("test-skill").replace_settings({"a": 1, "b": 2})
 
@@ -561,6 +719,79 @@ class TestExport:
         assert response.status_code in (302, 303, 401)
 
 
+class TestStreamingIndex:
+    def _context(self):
+        return {
+            "logo": {"type": "text", "text": "OVOS"},
+            "username": "ovos",
+            "skills": web._iter_prepared_skills(),
+        }
+
+    def test_header_streams_before_any_skill_is_read(self, mock_config_dir):
+        for skill_id in ("a.x", "b.x"):
+            SkillSettings(skill_id).replace_settings({"k": skill_id})
+        with patch(
+            "ovos_skill_config.main.SkillSettings", wraps=SkillSettings
+        ) as loaded:
+            chunks = web._stream_template("index.html", self._context())
+            header = next(chunks)
+            assert "site-header" in header
+            assert loaded.call_count == 0
+            rest = "".join(chunks)
+        assert 'data-skill-id="a.x"' in rest and 'data-skill-id="b.x"' in rest
+        assert "<!--flush-->" not in header + rest
+
+    def test_cards_sent_in_batches(self, mock_config_dir, monkeypatch):
+        for n in range(20):
+            SkillSettings(f"skill-{n:02}.x").replace_settings({"k": n})
+        monkeypatch.setattr(web, "STREAM_BATCH_SECONDS", 60)
+        chunks = list(web._stream_template("index.html", self._context()))
+        # The header, then far fewer chunks than cards
+        assert 2 <= len(chunks) <= 10
+        monkeypatch.setattr(web, "STREAM_BATCH_CHARS", 1)
+        chunks = list(web._stream_template("index.html", self._context()))
+        assert len(chunks) >= 21
+
+    def test_closing_stream_closes_template(self, mock_config_dir, monkeypatch):
+        closed = []
+
+        def generate(context):
+            try:
+                yield "<header>"
+                yield context["flush"]
+                yield "<card>"
+                yield context["flush"]
+            finally:
+                closed.append(True)
+
+        template = MagicMock()
+        template.get_template.return_value.generate = generate
+        monkeypatch.setattr(web, "get_templates", lambda: template)
+        chunks = web._stream_template("index.html", {})
+        assert next(chunks) == "<header>"
+        chunks.close()
+        assert closed == [True]
+
+    def test_index_served_from_mirror(self, mock_config_dir, auth_client, monkeypatch):
+        monkeypatch.setenv("OVOS_CONFIG_MIRROR_DB", str(mock_config_dir / "m.db"))
+        SkillSettings("a.x").replace_settings({"k": "from-mirror"})
+        with patch("ovos_skill_config.main.iter_skills") as iter_skills:
+            text = auth_client.get("/").text
+        iter_skills.assert_not_called()
+        assert 'data-skill-id="a.x"' in text and "from-mirror" in text
+
+    def test_non_empty_first_then_by_name(self, mock_config_dir, auth_client):
+        SkillSettings("zeta.x").replace_settings({"k": 1})
+        SkillSettings("alpha.x").replace_settings({})
+        SkillSettings("beta.x").replace_settings({"k": 1})
+        text = auth_client.get("/").text
+        positions = [
+            text.index(f'data-skill-id="{skill_id}"')
+            for skill_id in ("beta.x", "zeta.x", "alpha.x")
+        ]
+        assert positions == sorted(positions)
+
+
 class TestStaticPassthrough:
     def test_status_endpoint_still_works(self):
         response = client.get("/status")
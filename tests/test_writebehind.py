@@ -0,0 +1,148 @@
+"""Tests for the write-behind buffer and its use by SkillSettings."""
+
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+import ovos_skill_config.main as core
+from ovos_skill_config.main import WRITE_BEHIND, SkillSettings, app
+from ovos_skill_config.writebehind import WriteBehindBuffer
+
+
+@pytest.fixture
+def write_behind(monkeypatch):
+    """Enable write-behind with a window long enough to never fire in tests."""
+    monkeypatch.setenv("OVOS_CONFIG_WRITE_BEHIND_MS", "60000")
+    yield
+    WRITE_BEHIND.flush()
+
+
+def _on_disk(config_dir, skill_id="test-skill"):
+    return json.loads((config_dir / skill_id / "settings.json").read_text())
+
+
+class TestWriteBehindBuffer:
+    def test_burst_collapses_into_one_write(self):
+        buffer = WriteBehindBuffer()
+        writes = []
+        done = threading.Event()
+
+        def writer(doc):
+            writes.append(doc)
+            done.set()
+
+        for i in range(10):
+            buffer.stage("path", {"i": i}, writer, 0.05)
+        assert buffer.get("path") == {"i": 9}
+        assert done.wait(2)
+        time.sleep(0.05)
+        assert writes == [{"i": 9}]
+        assert buffer.get("path") is None
+        assert len(buffer) == 0
+
+    def test_failed_write_is_retried(self, monkeypatch, caplog):
+        monkeypatch.setattr("ovos_skill_config.writebehind.RETRY_DELAY", 0.01)
+        buffer = WriteBehindBuffer()
+        writes = []
+        done = threading.Event()
+
+        def writer(doc):
+            writes.append(doc)
+            if len(writes) == 1:
+                raise OSError("disk full")
+            done.set()
+
+        buffer.stage("path", {"i": 1}, writer, 0.01)
+        assert done.wait(2)
+        assert writes == [{"i": 1}, {"i": 1}]
+        assert "Write-behind of path failed" in caplog.text
+        time.sleep(0.05)
+        assert buffer.get("path") is None
+        assert buffer.stats()["timers"] == 0
+
+    def test_flush_writes_immediately(self):
+        buffer = WriteBehindBuffer()
+        writes = []
+        buffer.stage("a", {"a": 1}, writes.append, 60)
+        buffer.stage("b", {"b": 1}, writes.append, 60)
+        buffer.flush()
+        assert sorted(writes, key=str) == [{"a": 1}, {"b": 1}]
+        assert len(buffer) == 0
+        # Nothing left for the (cancelled) timers to write
+        buffer.flush()
+        assert len(writes) == 2
+
+    def test_document_restaged_during_write_stays_pending(self):
+        buffer = WriteBehindBuffer()
+        writes = []
+
+        def writer(doc):
+            writes.append(doc)
+            if len(writes) == 1:
+                buffer.stage("p", {"v": 2}, writer, 60)
+
+        buffer.stage("p", {"v": 1}, writer, 60)
+        buffer.flush("p")
+        assert buffer.get("p") == {"v": 2}
+        buffer.flush("p")
+        assert writes == [{"v": 1}, {"v": 2}]
+        assert buffer.get("p") is None
+
+
+class TestSkillSettingsWriteBehind:
+    def test_disabled_by_default(self, mock_config_dir, monkeypatch):
+        monkeypatch.delenv("OVOS_CONFIG_WRITE_BEHIND_MS", raising=False)
+        SkillSettings("test-skill").replace_settings({"a": 1})
+        assert _on_disk(mock_config_dir) == {"a": 1}
+        assert len(WRITE_BEHIND) == 0
+
+    def test_reads_see_pending_edits(self, mock_config_dir, write_behind):
+        SkillSettings("test-skill").replace_settings({"a": 1})
+        SkillSettings("test-skill").merge_settings({"b": 2})
+
+        assert _on_disk(mock_config_dir) == {}
+        assert SkillSettings("test-skill").settings == {"a": 1, "b": 2}
+        assert SkillSettings("test-skill").get_setting("b") == 2
+        assert core.load_all_skills() == [
+            {"id": "test-skill", "settings": {"a": 1, "b": 2}}
+        ]
+
+        WRITE_BEHIND.flush()
+        assert _on_disk(mock_config_dir) == {"a": 1, "b": 2}
+
+    def test_edits_are_coalesced(self, mock_config_dir, write_behind):
+        SkillSettings("test-skill")
+        with patch(
+            "ovos_skill_config.main._write_settings_file",
+            wraps=core._write_settings_file,
+        ) as write:
+            for i in range(10):
+                SkillSettings("test-skill").update_setting("toggle", i % 2 == 0)
+            assert write.call_count == 0
+            WRITE_BEHIND.flush()
+            assert write.call_count == 1
+        assert _on_disk(mock_config_dir) == {"toggle": False}
+
+    def test_debounced_flush_reaches_disk(self, mock_config_dir, monkeypatch):
+        monkeypatch.setenv("OVOS_CONFIG_WRITE_BEHIND_MS", "20")
+        SkillSettings("test-skill").replace_settings({"a": 1})
+        deadline = time.monotonic() + 2
+        while time.monotonic() < deadline and len(WRITE_BEHIND):
+            time.sleep(0.01)
+        assert len(WRITE_BEHIND) == 0
+        assert _on_disk(mock_config_dir) == {"a": 1}
+
+    def test_shutdown_flushes_pending_writes(self, mock_config_dir, write_behind):
+        with TestClient(app) as c:
+            response = c.post(
+                "/api/v1/skills/test-skill/merge",
+                json={"lang": "en-us"},
+                auth=(core.DEFAULT_USERNAME, core.DEFAULT_PASSWORD),
+            )
+            assert response.status_code == 200
+            assert _on_disk(mock_config_dir) == {}
+        assert _on_disk(mock_config_dir) == {"lang": "en-us"}